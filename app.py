@@ -1,154 +1,21 @@
 import streamlit as st
-import ldap3
-import os
-from ldap_config import LDAP_CONFIG
-
-def ldap_authenticate(username, password):
-    """
-    LDAP sunucusunda kullanıcı kimlik doğrulaması yapar (ldap3 ile SSL sertifika desteği)
-    """
-    try:
-        # LDAP sunucu bilgilerini al
-        server_url = LDAP_CONFIG["server"]
-        base_dn = LDAP_CONFIG.get("user_base_dn", LDAP_CONFIG["base_dn"])
-        bind_dn = LDAP_CONFIG["bind_dn"]
-        bind_password = LDAP_CONFIG["bind_password"]
-        
-        # SSL ayarlarını yapılandır
-        use_ssl = server_url.startswith('ldaps://')
-        use_tls = server_url.startswith('ldap://') and LDAP_CONFIG.get("ssl_verify", True)
-        
-        # Server oluştur
-        if use_ssl:
-            # SSL ile bağlantı - basit yaklaşım
-            try:
-                # SSL sertifika varsa kullan, yoksa basit SSL
-                if LDAP_CONFIG.get("ssl_certificate") and os.path.exists(LDAP_CONFIG.get("ssl_certificate")):
-                    server = ldap3.Server(
-                        server_url.replace('ldaps://', '').split(':')[0],
-                        port=int(server_url.split(':')[-1]),
-                        use_ssl=True,
-                        tls=ldap3.Tls(
-                            ca_certs_file=LDAP_CONFIG.get("ssl_certificate")
-                        )
-                    )
-                else:
-                    # Sertifika yoksa basit SSL
-                    server = ldap3.Server(
-                        server_url.replace('ldaps://', '').split(':')[0],
-                        port=int(server_url.split(':')[-1]),
-                        use_ssl=True
-                    )
-            except Exception as e:
-                # Herhangi bir hata durumunda basit SSL kullan
-                server = ldap3.Server(
-                    server_url.replace('ldaps://', '').split(':')[0],
-                    port=int(server_url.split(':')[-1]),
-                    use_ssl=True
-                )
-        else:
-            # Normal bağlantı
-            server = ldap3.Server(
-                server_url.replace('ldap://', '').split(':')[0],
-                port=int(server_url.split(':')[-1]),
-                use_ssl=False
-            )
-        
-        # Admin olarak bağlan
-        admin_conn = ldap3.Connection(
-            server,
-            user=bind_dn,
-            password=bind_password,
-            auto_bind=True
-        )
-        
-        if not admin_conn.bound:
-            return False, f"Admin bağlantısı başarısız: {admin_conn.result}"
-        
-        # Kullanıcıyı ara
-        user_filter = f"({LDAP_CONFIG['user_filter_attribute']}={username})"
-        admin_conn.search(
-            search_base=base_dn,
-            search_filter=user_filter,
-            search_scope=ldap3.SUBTREE,
-            attributes=[ldap3.ALL_ATTRIBUTES]
-        )
-        
-        if not admin_conn.entries:
-            admin_conn.unbind()
-            return False, "Kullanıcı bulunamadı"
-        
-        user_dn = admin_conn.entries[0].entry_dn
-        
-        # Kullanıcı şifresi ile bağlanmayı dene
-        user_conn = ldap3.Connection(
-            server,
-            user=user_dn,
-            password=password,
-            auto_bind=True
-        )
-        
-        if not user_conn.bound:
-            admin_conn.unbind()
-            return False, "Geçersiz kullanıcı adı veya şifre"
-        
-        # Grup kontrolü
-        if LDAP_CONFIG.get("group_auth_pattern"):
-            # Pattern'deki ${USER} placeholder'ını gerçek kullanıcı adı ile değiştir
-            group_filter = LDAP_CONFIG["group_auth_pattern"].replace("${USER}", username)
-            
-            # Kullanıcının base DN'inde grup kontrolü yap
-            user_conn.search(
-                search_base=base_dn,
-                search_filter=group_filter,
-                search_scope=ldap3.SUBTREE,
-                attributes=[ldap3.ALL_ATTRIBUTES]
-            )
-            
-            group_found = len(user_conn.entries) > 0
-        else:
-            # Eski yöntem (fallback) - kullanıcının memberOf attribute'unu kontrol et
-            user_conn.search(
-                search_base=user_dn,
-                search_filter="(objectClass=user)",
-                search_scope=ldap3.BASE,
-                attributes=[LDAP_CONFIG.get("group_member_attribute", "memberOf")]
-            )
-            
-            if user_conn.entries:
-                user_attrs = user_conn.entries[0]
-                group_attr = LDAP_CONFIG.get("group_member_attribute", "memberOf")
-                
-                if hasattr(user_attrs, group_attr):
-                    group_values = getattr(user_attrs, group_attr)
-                    if isinstance(group_values, list):
-                        group_found = any(LDAP_CONFIG["group_dn"] in group_value for group_value in group_values)
-                    else:
-                        group_found = LDAP_CONFIG["group_dn"] in str(group_values)
-                else:
-                    group_found = False
-            else:
-                group_found = False
-        
-        # Bağlantıları kapat
-        admin_conn.unbind()
-        user_conn.unbind()
-        
-        if group_found:
-            return True, "Kullanıcı doğrulandı ve grupta bulundu"
-        else:
-            return False, "Kullanıcı doğrulandı ancak gerekli grupta değil"
-            
-    except ldap3.core.exceptions.LDAPBindError as e:
-        return False, f"LDAP bağlantı hatası: {str(e)}"
-    except ldap3.core.exceptions.LDAPException as e:
-        return False, f"LDAP hatası: {str(e)}"
-    except Exception as e:
-        return False, f"Genel hata: {str(e)}"
+from ldap_auth import AUTH_OK, AUTH_TIMEOUT, AUTH_BUSY, authenticate_with_deadline
+from data_ingest import profile_upload, upload_kind, iter_file_chunks, content_hash
+from data_quality import NO_RULE, RULE_NAMES, DEFAULT_DATE_FORMAT, evaluate_rules, validate_chunks, evaluate_incremental
+from schema_store import MATCH_EXACT, schema_columns, remember_schema, recall_schema, export_csv, export_json, import_metadata
+from approval_package import PACKAGE_DOWNLOAD_MAX_MB, build_package, verify_package, discard_package
+from s3_storage import pending_key, approved_key, upload_package, approve_package, reject_package, download_url
 
 # Sayfa yapılandırması
 st.set_page_config(page_title="ING - DDP", page_icon="🔐", layout="centered", initial_sidebar_state="expanded")
 
+# Metadata ve Data Quality sekmelerinde bir sayfada düzenlenen kolon sayısı
+COLUMNS_PER_PAGE = 25
+# Kolon düzenleyicilerinin widget anahtarları; açıklama/kurallar dışarıdan
+# doldurulduğunda eski widget değerleri silinir. Önekler sadece kolon başına
+# widget'larla eşleşmeli; filtre, sayfa ve içe aktarma widget'ları korunur
+EDITOR_KEY_PREFIXES = ("metadata_col_", "quality_rule_", "min_len_", "max_len_", "min_val_", "max_val_", "date_format_", "regex_", "allowed_")
+
 # Kullanıcı veritabanı ve onaylayıcı ilişkileri
 USERS = {
     "okan": {
@@ -645,6 +512,8 @@ if st.session_state.logged_in:
             st.session_state.uploaded_file_data = None
         if 'df_data' not in st.session_state:
             st.session_state.df_data = None
+        if 'file_profile' not in st.session_state:
+            st.session_state.file_profile = None
         
         # Tab oluştur - normal Streamlit tabs kullan
         tab1, tab2, tab3, tab4, tab5 = st.tabs(["🔒 Güvenlik", "📁 Dosya Yükleme", "📝 Metadata", "⚡ Data Quality", "📤 Onaya Gönder"])
@@ -714,6 +583,16 @@ if st.session_state.logged_in:
                 uploaded_file = st.file_uploader("Dosya seçin", type=['csv', 'xlsx', 'txt', 'pdf'], key="main_file_uploader")
                 
                 if uploaded_file is not None:
+                    # Farklı bir dosya yüklendiyse önceki kural kontrol sonuçları geçersizdir.
+                    # İçerik özeti yükleme başına bir kez hesaplanır; kural sonuçları önbelleğinin anahtarıdır
+                    file_key = uploaded_file.file_id
+                    if st.session_state.get('quality_results_file') != file_key:
+                        st.session_state.quality_results = {}
+                        st.session_state.quality_results_file = file_key
+                        st.session_state.file_hash = content_hash(uploaded_file)
+                        st.session_state.file_profile = None
+                        st.session_state.df_data = None
+                    
                     # Dosya bilgilerini session state'e kaydet
                     st.session_state.uploaded_file_data = {
                         'name': uploaded_file.name,
@@ -737,47 +616,28 @@ if st.session_state.logged_in:
                     with st.spinner('🔄 Önizleme yükleniyor...'):
                         try:
                             import pandas as pd
-                            import io
-                            import time
-                            
-                            # Kısa bekleme (gerçekçi yükleme hissi için)
-                            time.sleep(0.5)
                             
                             # Dosya pointer'ını sıfırla
                             uploaded_file.seek(0)
                             
                             # Dosya tipine göre okuma
-                            if uploaded_file.name.endswith('.csv'):
-                                # CSV için encoding ve separator kontrolü
-                                try:
-                                    # İlk birkaç satırı oku ve kontrol et
-                                    sample = uploaded_file.read(1024).decode('utf-8')
-                                    uploaded_file.seek(0)
-                                    
-                                    # Separator tespiti
-                                    if ';' in sample:
-                                        separator = ';'
-                                    elif ',' in sample:
-                                        separator = ','
-                                    elif '\t' in sample:
-                                        separator = '\t'
-                                    else:
-                                        separator = ','
-                                    
-                                    df = pd.read_csv(uploaded_file, nrows=5, sep=separator, encoding='utf-8')
-                                    uploaded_file.seek(0)
-                                    st.session_state.df_data = pd.read_csv(uploaded_file, sep=separator, encoding='utf-8')
-                                except UnicodeDecodeError:
-                                    # UTF-8 başarısız ise latin-1 dene
-                                    uploaded_file.seek(0)
-                                    df = pd.read_csv(uploaded_file, nrows=5, encoding='latin-1')
-                                    uploaded_file.seek(0)
-                                    st.session_state.df_data = pd.read_csv(uploaded_file, encoding='latin-1')
-                                    
-                            elif uploaded_file.name.endswith(('.xlsx', '.xls')):
-                                df = pd.read_excel(uploaded_file, nrows=5)
-                                uploaded_file.seek(0)
-                                st.session_state.df_data = pd.read_excel(uploaded_file)
+                            if upload_kind(uploaded_file.name):
+                                # Dosya yükleme başına bir kez ayrıştırılır; sonraki rerun'larda
+                                # session state'ten, aynı içerik tekrar yüklendiğinde önbellekten gelir
+                                if st.session_state.file_profile is None:
+                                    profile = profile_upload(uploaded_file, uploaded_file.name, uploaded_file.size, st.session_state.file_hash)
+                                    st.session_state.file_profile = profile
+                                    st.session_state.df_data = profile.dataframe
+                                    # Aynı (veya benzer) kolon düzeninde daha önce gönderilmiş dosyanın
+                                    # açıklama ve kuralları önceden doldurulur
+                                    schema_match, stored_metadata, stored_rules = recall_schema(schema_columns(profile))
+                                    for key in [k for k in st.session_state if k.startswith(EDITOR_KEY_PREFIXES)]:
+                                        del st.session_state[key]
+                                    st.session_state.column_metadata = stored_metadata
+                                    st.session_state.quality_rules = stored_rules
+                                    recalled_columns = [name for name in profile.columns if name in stored_metadata or name in stored_rules]
+                                    st.session_state.schema_match = (schema_match, len(stored_metadata), len(stored_rules), recalled_columns) if schema_match else None
+                                df = st.session_state.file_profile.preview
                                 
                             elif uploaded_file.name.endswith('.txt'):
                                 # Text dosyası için
@@ -792,11 +652,27 @@ if st.session_state.logged_in:
                                 st.info("📄 Bu dosya tipi için önizleme desteklenmiyor.")
                             
                             # DataFrame için preview
-                            if uploaded_file.name.endswith(('.csv', '.xlsx', '.xls')):
+                            if upload_kind(uploaded_file.name):
                                 if len(df.columns) > 0:
                                     st.markdown("**İlk 5 satır:**")
                                     st.dataframe(df, use_container_width=True)
                                     st.markdown(f"**Toplam sütun sayısı:** {len(df.columns)}")
+                                    st.markdown(f"**Toplam satır sayısı:** {st.session_state.file_profile.row_count:,}")
+                                    if st.session_state.file_profile.kind == "csv":
+                                        separator_name = {"\t": "tab"}.get(st.session_state.file_profile.separator, st.session_state.file_profile.separator)
+                                        st.caption(f"Kodlama: {st.session_state.file_profile.encoding} · Ayırıcı: {separator_name}")
+                                    if st.session_state.file_profile.truncated:
+                                        st.info(f"ℹ️ Büyük dosya: sadece ilk {st.session_state.file_profile.row_count:,} satır incelendi.")
+                                    if st.session_state.get('schema_match'):
+                                        schema_match, metadata_count, rule_count, recalled_columns = st.session_state.schema_match
+                                        if schema_match == MATCH_EXACT:
+                                            st.info(f"♻️ Aynı kolon düzenindeki önceki yüklemeden {metadata_count} açıklama ve {rule_count} kural dolduruldu.")
+                                        else:
+                                            # Kısmi eşleşmede hangi kolonların doldurulduğu gösterilir, kullanıcı kontrol edebilsin
+                                            shown = ", ".join(str(name) for name in recalled_columns[:10])
+                                            more = f" ve {len(recalled_columns) - 10} kolon daha" if len(recalled_columns) > 10 else ""
+                                            st.info(f"♻️ Benzer kolon düzenindeki önceki yüklemeden {metadata_count} açıklama ve {rule_count} kural dolduruldu. "
+                                                    f"Doldurulan kolonlar: {shown}{more}. Lütfen Metadata sekmesinde kontrol edin.")
                                     
                                     st.success("📝 **Metadata** sekmesine geçebilirsiniz!")
                                 else:
@@ -812,273 +688,449 @@ if st.session_state.logged_in:
         
         # Tab 3: Metadata
         with tab3:
-            if st.session_state.df_data is None:
+            if st.session_state.file_profile is None:
                 st.warning("⚠️ Önce dosya yükleyiniz.")
             else:
                 st.markdown("### 📝 Kolon Metadata Düzenleme")
                 st.markdown("Her kolon için açıklayıcı metadata ekleyin:")
                 
-                df = st.session_state.df_data
+                # Kolon bilgileri dosya profilinden okunur (tam veri bellekte olmayabilir)
+                profile = st.session_state.file_profile
                 
                 # Session state'te metadata sakla
                 if 'column_metadata' not in st.session_state:
                     st.session_state.column_metadata = {}
                 
-                # Her kolon için metadata input alanı
-                for i, column in enumerate(df.columns):
-                    col1, col2 = st.columns([1, 3])
+                # Kolon düzenleyici bir fragment'tır: arama, sayfa değişimi ve kaydetme sadece
+                # bu bölümü yeniden çalıştırır (CSS, önizleme ve diğer sekmeler yeniden çizilmez)
+                @st.fragment
+                def metadata_editor():
+                    profile = st.session_state.file_profile
                     
-                    with col1:
-                        st.markdown(f"**{column}**")
-                        # İlk birkaç değer örneği göster
-                        sample_values = df[column].dropna().head(3).tolist()
-                        if sample_values:
-                            st.caption(f"Örnek: {', '.join(str(v) for v in sample_values)}")
-                    
-                    with col2:
-                        # Her kolon için benzersiz key
-                        metadata_key = f"metadata_{column}_{i}"
-                        metadata_value = st.text_area(
-                            "Metadata Açıklaması",
-                            value=st.session_state.column_metadata.get(column, ""),
-                            placeholder=f"{column} kolonu hakkında açıklayıcı bilgi girin...",
-                            key=metadata_key,
-                            height=80,
-                            label_visibility="collapsed"
+                    # Geniş dosyalarda açıklama ve kurallar dosyadan toplu olarak alınıp verilebilir
+                    with st.expander("📥 Toplu İçe / Dışa Aktar"):
+                        col_csv, col_json = st.columns(2)
+                        with col_csv:
+                            st.download_button(
+                                "⬇️ CSV olarak indir",
+                                export_csv(profile.column_names, st.session_state.column_metadata, st.session_state.get('quality_rules')),
+                                file_name=f"{profile.name}_metadata.csv",
+                                mime="text/csv",
+                                on_click="ignore",
+                                use_container_width=True
+                            )
+                        with col_json:
+                            st.download_button(
+                                "⬇️ JSON olarak indir",
+                                export_json(profile.column_names, st.session_state.column_metadata, st.session_state.get('quality_rules')),
+                                file_name=f"{profile.name}_metadata.json",
+                                mime="application/json",
+                                on_click="ignore",
+                                use_container_width=True
+                            )
+                        import_file = st.file_uploader(
+                            "Açıklama / kural dosyası (kolon;aciklama;kural;parametreler)",
+                            type=["csv", "json"],
+                            key="metadata_import_file"
                         )
-                        # Session state'i güncelle
-                        st.session_state.column_metadata[column] = metadata_value
+                        if import_file is not None and st.button("📤 İçe Aktar", key="metadata_import_btn", use_container_width=True):
+                            imported, import_message, imported_metadata, imported_rules = import_metadata(
+                                import_file.name, import_file.getvalue(), profile.column_names
+                            )
+                            if imported:
+                                st.session_state.column_metadata.update(imported_metadata)
+                                st.session_state.setdefault('quality_rules', {}).update(imported_rules)
+                                # Düzenleyiciler içe aktarılan değerlerle yeniden çizilsin
+                                for key in [k for k in st.session_state if k.startswith(EDITOR_KEY_PREFIXES)]:
+                                    del st.session_state[key]
+                                st.session_state.metadata_import_message = import_message
+                                st.rerun()
+                            else:
+                                st.error(f"❌ {import_message}")
+                    if 'metadata_import_message' in st.session_state:
+                        st.success(f"✅ {st.session_state.pop('metadata_import_message')}")
+                    
+                    # Geniş dosyalarda sadece filtreye uyan kolonların bir sayfası çizilir;
+                    # diğer kolonların girilen değerleri column_metadata'da korunur
+                    col_search, col_page = st.columns([3, 1])
+                    with col_search:
+                        metadata_filter = st.text_input("Kolon ara", placeholder="Kolon adı...", key="metadata_column_filter")
+                    metadata_columns = [
+                        (i, column) for i, column in enumerate(profile.column_names)
+                        if metadata_filter.strip().lower() in column.lower()
+                    ]
+                    page_count = max(1, -(-len(metadata_columns) // COLUMNS_PER_PAGE))
+                    with col_page:
+                        metadata_page = st.selectbox("Sayfa", range(1, page_count + 1), key="metadata_page")
+                    page_start = (metadata_page - 1) * COLUMNS_PER_PAGE
+                    page_columns = metadata_columns[page_start:page_start + COLUMNS_PER_PAGE]
+                    if page_columns:
+                        st.caption(f"{len(metadata_columns)} kolondan {page_start + 1}–{page_start + len(page_columns)} arası gösteriliyor")
+                    else:
+                        st.info("🔍 Aramaya uyan kolon bulunamadı.")
                 
-                # Metadata özeti
-                st.markdown("---")
-                st.markdown("### 📊 Metadata Özeti")
+                    # Açıklama kutudan çıkıldığı anda column_metadata'ya yazılır; sayfa/arama
+                    # değişimi, sekme geçişi veya "Onaya Gönder" girilen metni kaybettirmez.
+                    # Değişiklik sadece bu fragment'ı yeniden çalıştırır.
+                    def store_metadata(column, metadata_key):
+                        st.session_state.column_metadata[column] = st.session_state[metadata_key]
+                    
+                    # Her kolon için metadata input alanı
+                    for i, column in page_columns:
+                        col1, col2 = st.columns([1, 3])
                 
-                # Metadata özeti metrikleri için CSS
-                st.markdown("""
-                <style>
-                .stMetric {
-                    color: black !important;
-                }
-                .stMetric > div {
-                    color: black !important;
-                }
-                .stMetric [data-testid="metric-container"] {
-                    color: black !important;
-                }
-                .stMetric [data-testid="metric-container"] > div {
-                    color: black !important;
-                }
-                .stMetric label {
-                    color: black !important;
-                }
-                .stMetric div[data-testid="metric-container"] div {
-                    color: black !important;
-                }
-                </style>
-                """, unsafe_allow_html=True)
+                        with col1:
+                            st.markdown(f"**{column}**")
+                            # Kolon özeti ve ilk birkaç değer örneği (yükleme sırasında bir kez hesaplanır)
+                            column_profile = profile.columns[column]
+                            st.caption(" · ".join(column_profile.summary()))
+                            if column_profile.samples:
+                                st.caption(f"Örnek: {', '.join(str(v) for v in column_profile.samples)}")
                 
-                filled_metadata = {k: v for k, v in st.session_state.column_metadata.items() if v.strip()}
-                total_columns = len(df.columns)
-                filled_columns = len(filled_metadata)
+                        with col2:
+                            # Her kolon için benzersiz key
+                            metadata_key = f"metadata_col_{column}_{i}"
+                            st.text_area(
+                                "Metadata Açıklaması",
+                                value=st.session_state.column_metadata.get(column, ""),
+                                placeholder=f"{column} kolonu hakkında açıklayıcı bilgi girin...",
+                                key=metadata_key,
+                                height=80,
+                                label_visibility="collapsed",
+                                on_change=store_metadata,
+                                args=(column, metadata_key)
+                            )
                 
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Toplam Kolon", total_columns)
-                with col2:
-                    st.metric("Metadata Eklenen", filled_columns)
-                with col3:
-                    completion_rate = (filled_columns / total_columns) * 100 if total_columns > 0 else 0
-                    st.metric("Tamamlanma", f"{completion_rate:.0f}%")
+                    if st.button("📋 Metadata'yı Kaydet", use_container_width=True):
+                        st.session_state.metadata_saved = True
+                        # Diğer sekmelerdeki özetler de güncellensin diye tüm sayfa bir kez yeniden çalışır
+                        st.rerun()
+                
+                    # Metadata özeti
+                    st.markdown("---")
+                    st.markdown("### 📊 Metadata Özeti")
+                
+                    # Metadata özeti metrikleri için CSS
+                    st.markdown("""
+                    <style>
+                    .stMetric {
+                        color: black !important;
+                    }
+                    .stMetric > div {
+                        color: black !important;
+                    }
+                    .stMetric [data-testid="metric-container"] {
+                        color: black !important;
+                    }
+                    .stMetric [data-testid="metric-container"] > div {
+                        color: black !important;
+                    }
+                    .stMetric label {
+                        color: black !important;
+                    }
+                    .stMetric div[data-testid="metric-container"] div {
+                        color: black !important;
+                    }
+                    </style>
+                    """, unsafe_allow_html=True)
+                
+                    filled_metadata = {k: v for k, v in st.session_state.column_metadata.items() if v.strip()}
+                    total_columns = len(profile.columns)
+                    filled_columns = len(filled_metadata)
                 
-                # Metadata kaydetme butonu
-                if st.button("📋 Metadata'yı Kaydet", key="metadata_save_btn", use_container_width=True):
-                    st.success("✅ Metadata başarıyla kaydedildi!")
-                    # Metadata'yı göster
-                    with st.expander("🔍 Kaydedilen Metadata'yı Görüntüle"):
-                        for col, meta in filled_metadata.items():
-                            st.markdown(f"**{col}:** {meta}")
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Toplam Kolon", total_columns)
+                    with col2:
+                        st.metric("Metadata Eklenen", filled_columns)
+                    with col3:
+                        completion_rate = (filled_columns / total_columns) * 100 if total_columns > 0 else 0
+                        st.metric("Tamamlanma", f"{completion_rate:.0f}%")
+                
+                    # Kaydetme sonrası tam rerun'da gösterilir
+                    if st.session_state.pop('metadata_saved', False):
+                        st.success("✅ Metadata başarıyla kaydedildi!")
+                        # Metadata'yı göster
+                        with st.expander("🔍 Kaydedilen Metadata'yı Görüntüle"):
+                            for col, meta in filled_metadata.items():
+                                st.markdown(f"**{col}:** {meta}")
                     
-                    # Data Quality'ye yönlendirme
-                    st.success("⚡ **Data Quality** sekmesine geçebilirsiniz!")
+                        # Data Quality'ye yönlendirme
+                        st.success("⚡ **Data Quality** sekmesine geçebilirsiniz!")
+                
+                metadata_editor()
         
         # Tab 4: Data Quality
         with tab4:
-            if st.session_state.df_data is None:
+            if st.session_state.file_profile is None:
                 st.warning("⚠️ Önce dosya yükleyiniz.")
             else:
                 st.markdown("### ⚡ Data Quality Kuralları")
                 st.markdown("Her kolon için veri kalitesi kuralları belirleyin:")
                 
-                df = st.session_state.df_data
+                profile = st.session_state.file_profile
                 
                 # Session state'te quality rules sakla
                 if 'quality_rules' not in st.session_state:
                     st.session_state.quality_rules = {}
                 
-                # Quality rule seçenekleri
-                quality_options = [
-                    "Kural Seçiniz",
-                    "Boş Değer Kontrolü (Not Null)",
-                    "Benzersiz Değer Kontrolü (Unique)",
-                    "Sayısal Değer Kontrolü (Numeric)",
-                    "E-mail Format Kontrolü",
-                    "Telefon Format Kontrolü", 
-                    "Tarih Format Kontrolü",
-                    "Minimum Uzunluk Kontrolü",
-                    "Maksimum Uzunluk Kontrolü",
-                    "Regex Pattern Kontrolü",
-                    "Değer Aralığı Kontrolü (Min-Max)",
-                    "İzin Verilen Değerler Listesi"
-                ]
+                # Kural düzenleyici bir fragment'tır: kural/parametre değişiklikleri ve kontrol
+                # çalıştırma sadece bu bölümü yeniden çalıştırır
+                @st.fragment
+                def quality_editor():
+                    profile = st.session_state.file_profile
+                    
+                    # Quality rule seçenekleri
+                    quality_options = [NO_RULE] + RULE_NAMES
                 
-                # Her kolon için quality rule seçimi
-                for i, column in enumerate(df.columns):
-                    st.markdown("---")
-                    col1, col2 = st.columns([1, 2])
+                    # Geniş dosyalarda sadece filtreye uyan kolonların bir sayfası çizilir;
+                    # diğer kolonların kuralları quality_rules'da korunur
+                    col_search, col_page = st.columns([3, 1])
+                    with col_search:
+                        quality_filter = st.text_input("Kolon ara", placeholder="Kolon adı...", key="quality_column_filter")
+                    quality_columns = [
+                        (i, column) for i, column in enumerate(profile.column_names)
+                        if quality_filter.strip().lower() in column.lower()
+                    ]
+                    page_count = max(1, -(-len(quality_columns) // COLUMNS_PER_PAGE))
+                    with col_page:
+                        quality_page = st.selectbox("Sayfa", range(1, page_count + 1), key="quality_page")
+                    page_start = (quality_page - 1) * COLUMNS_PER_PAGE
+                    page_columns = quality_columns[page_start:page_start + COLUMNS_PER_PAGE]
+                    if page_columns:
+                        st.caption(f"{len(quality_columns)} kolondan {page_start + 1}–{page_start + len(page_columns)} arası gösteriliyor")
+                    else:
+                        st.info("🔍 Aramaya uyan kolon bulunamadı.")
+                
+                    # Her kolon için quality rule seçimi
+                    for i, column in page_columns:
+                        st.markdown("---")
+                        col1, col2 = st.columns([1, 2])
                     
-                    with col1:
-                        st.markdown(f"**{column}**")
-                        # Kolon tipi ve örnek değerler
-                        col_type = str(df[column].dtype)
-                        st.caption(f"Tip: {col_type}")
-                        sample_values = df[column].dropna().head(3).tolist()
-                        if sample_values:
-                            st.caption(f"Örnek: {', '.join(str(v) for v in sample_values)}")
+                        with col1:
+                            st.markdown(f"**{column}**")
+                            # Kolon tipi, özeti ve en sık değerler (yükleme sırasında bir kez hesaplanır)
+                            column_profile = profile.columns[column]
+                            st.caption(f"Tip: {column_profile.dtype}")
+                            st.caption(" · ".join(column_profile.summary()))
+                            if column_profile.top_values:
+                                st.caption(f"En sık: {', '.join(f'{v} ({n:,})' for v, n in column_profile.top_values)}")
+                            if column_profile.samples:
+                                st.caption(f"Örnek: {', '.join(str(v) for v in column_profile.samples)}")
                     
-                    with col2:
-                        # Quality rule seçimi
-                        rule_key = f"quality_rule_{column}_{i}"
-                        selected_rule = st.selectbox(
-                            "Quality Rule",
-                            quality_options,
-                            key=rule_key,
-                            label_visibility="collapsed"
-                        )
+                        with col2:
+                            # Quality rule seçimi; sayfaya geri dönüldüğünde kayıtlı kural ve parametreler yüklenir
+                            saved_rule = st.session_state.quality_rules.get(column, {})
+                            saved_params = saved_rule.get('params') or {}
+                            rule_key = f"quality_rule_{column}_{i}"
+                            selected_rule = st.selectbox(
+                                "Quality Rule",
+                                quality_options,
+                                index=quality_options.index(saved_rule['rule']) if saved_rule.get('rule') in quality_options else 0,
+                                key=rule_key,
+                                label_visibility="collapsed"
+                            )
                         
-                        # Seçilen kurala göre ek parametreler
-                        rule_params = {}
+                            # Seçilen kurala göre ek parametreler
+                            rule_params = {}
                         
-                        if selected_rule == "Minimum Uzunluk Kontrolü":
-                            min_length = st.number_input(
-                                "Minimum uzunluk",
-                                min_value=0,
-                                value=1,
-                                key=f"min_len_{column}_{i}"
-                            )
-                            rule_params['min_length'] = min_length
-                            
-                        elif selected_rule == "Maksimum Uzunluk Kontrolü":
-                            max_length = st.number_input(
-                                "Maksimum uzunluk",
-                                min_value=1,
-                                value=100,
-                                key=f"max_len_{column}_{i}"
-                            )
-                            rule_params['max_length'] = max_length
+                            if selected_rule == "Minimum Uzunluk Kontrolü":
+                                min_length = st.number_input(
+                                    "Minimum uzunluk",
+                                    min_value=0,
+                                    value=int(saved_params.get('min_length', 1)),
+                                    key=f"min_len_{column}_{i}"
+                                )
+                                rule_params['min_length'] = min_length
                             
-                        elif selected_rule == "Değer Aralığı Kontrolü (Min-Max)":
-                            col_min, col_max = st.columns(2)
-                            with col_min:
-                                min_val = st.number_input(
-                                    "Min değer",
-                                    key=f"min_val_{column}_{i}"
+                            elif selected_rule == "Maksimum Uzunluk Kontrolü":
+                                max_length = st.number_input(
+                                    "Maksimum uzunluk",
+                                    min_value=1,
+                                    value=int(saved_params.get('max_length', 100)),
+                                    key=f"max_len_{column}_{i}"
                                 )
-                            with col_max:
-                                max_val = st.number_input(
-                                    "Max değer", 
-                                    key=f"max_val_{column}_{i}"
+                                rule_params['max_length'] = max_length
+                            
+                            elif selected_rule == "Değer Aralığı Kontrolü (Min-Max)":
+                                col_min, col_max = st.columns(2)
+                                with col_min:
+                                    min_val = st.number_input(
+                                        "Min değer",
+                                        value=float(saved_params.get('min_value', 0.0)),
+                                        key=f"min_val_{column}_{i}"
+                                    )
+                                with col_max:
+                                    max_val = st.number_input(
+                                        "Max değer", 
+                                        value=float(saved_params.get('max_value', 0.0)),
+                                        key=f"max_val_{column}_{i}"
+                                    )
+                                rule_params['min_value'] = min_val
+                                rule_params['max_value'] = max_val
+                            
+                            elif selected_rule == "Tarih Format Kontrolü":
+                                date_format = st.text_input(
+                                    "Tarih formatı",
+                                    value=saved_params.get('date_format', DEFAULT_DATE_FORMAT),
+                                    help="strftime formatı, örn. %d.%m.%Y veya %Y-%m-%d",
+                                    key=f"date_format_{column}_{i}"
                                 )
-                            rule_params['min_value'] = min_val
-                            rule_params['max_value'] = max_val
+                                rule_params['date_format'] = date_format
                             
-                        elif selected_rule == "Regex Pattern Kontrolü":
-                            pattern = st.text_input(
-                                "Regex Pattern",
-                                placeholder="^[A-Za-z0-9]+$",
-                                key=f"regex_{column}_{i}"
-                            )
-                            rule_params['pattern'] = pattern
+                            elif selected_rule == "Regex Pattern Kontrolü":
+                                pattern = st.text_input(
+                                    "Regex Pattern",
+                                    value=saved_params.get('pattern', ""),
+                                    placeholder="^[A-Za-z0-9]+$",
+                                    key=f"regex_{column}_{i}"
+                                )
+                                rule_params['pattern'] = pattern
                             
-                        elif selected_rule == "İzin Verilen Değerler Listesi":
-                            allowed_values = st.text_area(
-                                "İzin verilen değerler (virgülle ayırın)",
-                                placeholder="değer1, değer2, değer3",
-                                key=f"allowed_{column}_{i}"
-                            )
-                            rule_params['allowed_values'] = [v.strip() for v in allowed_values.split(',') if v.strip()]
+                            elif selected_rule == "İzin Verilen Değerler Listesi":
+                                allowed_values = st.text_area(
+                                    "İzin verilen değerler (virgülle ayırın)",
+                                    value=", ".join(saved_params.get('allowed_values', [])),
+                                    placeholder="değer1, değer2, değer3",
+                                    key=f"allowed_{column}_{i}"
+                                )
+                                rule_params['allowed_values'] = [v.strip() for v in allowed_values.split(',') if v.strip()]
                         
-                        # Session state'i güncelle
-                        if selected_rule != "Kural Seçiniz":
-                            st.session_state.quality_rules[column] = {
-                                'rule': selected_rule,
-                                'params': rule_params
-                            }
-                        elif column in st.session_state.quality_rules:
-                            del st.session_state.quality_rules[column]
+                            # Session state'i güncelle
+                            if selected_rule != "Kural Seçiniz":
+                                st.session_state.quality_rules[column] = {
+                                    'rule': selected_rule,
+                                    'params': rule_params
+                                }
+                            elif column in st.session_state.quality_rules:
+                                del st.session_state.quality_rules[column]
                 
-                # Quality Rules özeti
-                st.markdown("---")
-                st.markdown("### 📊 Quality Rules Özeti")
+                    # Quality Rules özeti
+                    st.markdown("---")
+                    st.markdown("### 📊 Quality Rules Özeti")
                 
-                # Quality Rules özeti metrikleri için CSS
-                st.markdown("""
-                <style>
-                .stMetric {
-                    color: black !important;
-                }
-                .stMetric > div {
-                    color: black !important;
-                }
-                .stMetric [data-testid="metric-container"] {
-                    color: black !important;
-                }
-                .stMetric [data-testid="metric-container"] > div {
-                    color: black !important;
-                }
-                .stMetric label {
-                    color: black !important;
-                }
-                .stMetric div[data-testid="metric-container"] div {
-                    color: black !important;
-                }
-                /* Özel buton CSS */
-                .st-emotion-cache-11byp7q {
-                    background-color: #FF6600 !important;
-                    color: white !important;
-                    border: none !important;
-                }
-                .st-emotion-cache-11byp7q:hover {
-                    background-color: #E55A00 !important;
-                    color: white !important;
-                }
-                </style>
-                """, unsafe_allow_html=True)
+                    # Quality Rules özeti metrikleri için CSS
+                    st.markdown("""
+                    <style>
+                    .stMetric {
+                        color: black !important;
+                    }
+                    .stMetric > div {
+                        color: black !important;
+                    }
+                    .stMetric [data-testid="metric-container"] {
+                        color: black !important;
+                    }
+                    .stMetric [data-testid="metric-container"] > div {
+                        color: black !important;
+                    }
+                    .stMetric label {
+                        color: black !important;
+                    }
+                    .stMetric div[data-testid="metric-container"] div {
+                        color: black !important;
+                    }
+                    /* Özel buton CSS */
+                    .st-emotion-cache-11byp7q {
+                        background-color: #FF6600 !important;
+                        color: white !important;
+                        border: none !important;
+                    }
+                    .st-emotion-cache-11byp7q:hover {
+                        background-color: #E55A00 !important;
+                        color: white !important;
+                    }
+                    </style>
+                    """, unsafe_allow_html=True)
                 
-                applied_rules = {k: v for k, v in st.session_state.quality_rules.items() if v['rule'] != "Kural Seçiniz"}
-                total_columns = len(df.columns)
-                rules_applied = len(applied_rules)
+                    applied_rules = {k: v for k, v in st.session_state.quality_rules.items() if v['rule'] != "Kural Seçiniz"}
+                    total_columns = len(profile.columns)
+                    rules_applied = len(applied_rules)
                 
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Toplam Kolon", total_columns)
-                with col2:
-                    st.metric("Kural Atanan", rules_applied)
-                with col3:
-                    completion_rate = (rules_applied / total_columns) * 100 if total_columns > 0 else 0
-                    st.metric("Tamamlanma", f"{completion_rate:.0f}%")
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Toplam Kolon", total_columns)
+                    with col2:
+                        st.metric("Kural Atanan", rules_applied)
+                    with col3:
+                        completion_rate = (rules_applied / total_columns) * 100 if total_columns > 0 else 0
+                        st.metric("Tamamlanma", f"{completion_rate:.0f}%")
                 
-                # Quality rules kaydetme butonu
-                if st.button("⚡ Quality Rules'ı Kaydet", key="quality_save_btn", use_container_width=True):
-                    st.success("✅ Quality Rules başarıyla kaydedildi!")
-                    # Rules'ları göster
-                    with st.expander("🔍 Kaydedilen Quality Rules'ları Görüntüle"):
-                        for col, rule_info in applied_rules.items():
-                            st.markdown(f"**{col}:** {rule_info['rule']}")
-                            if rule_info['params']:
-                                for param, value in rule_info['params'].items():
-                                    st.markdown(f"  - {param}: {value}")
+                    # Quality rules kaydetme butonu; diğer sekmelerdeki özetler de güncellensin
+                    # diye tüm sayfa bir kez yeniden çalışır, mesaj o rerun'da gösterilir
+                    if st.button("⚡ Quality Rules'ı Kaydet", key="quality_save_btn", use_container_width=True):
+                        st.session_state.quality_rules_saved = True
+                        st.rerun()
+                    if st.session_state.pop('quality_rules_saved', False):
+                        st.success("✅ Quality Rules başarıyla kaydedildi!")
+                        # Rules'ları göster
+                        with st.expander("🔍 Kaydedilen Quality Rules'ları Görüntüle"):
+                            for col, rule_info in applied_rules.items():
+                                st.markdown(f"**{col}:** {rule_info['rule']}")
+                                if rule_info['params']:
+                                    for param, value in rule_info['params'].items():
+                                        st.markdown(f"  - {param}: {value}")
                 
-                st.success("📤 **Onaya Gönder** sekmesine geçebilirsiniz!")
+                    # Kuralları veri üzerinde çalıştır
+                    # Sadece kuralı değişen (önbellekte sonucu olmayan) kolonlar yeniden kontrol edilir
+                    if st.button("🔍 Kuralları Çalıştır", key="quality_run_btn", use_container_width=True, disabled=not applied_rules):
+                        file_hash = st.session_state.get('file_hash')
+                        if st.session_state.df_data is not None:
+                            with st.spinner("⚡ Kurallar kontrol ediliyor..."):
+                                st.session_state.quality_results = evaluate_incremental(
+                                    file_hash,
+                                    applied_rules,
+                                    lambda rules: evaluate_rules(st.session_state.df_data, rules)
+                                )
+                        else:
+                            # Büyük dosya: kurallar yüklenen dosya üzerinde parça parça çalıştırılır
+                            total_rows = max(profile.row_count, 1)
+                            progress_bar = st.progress(0.0, text="⚡ Kurallar kontrol ediliyor...")
+                            try:
+                                st.session_state.quality_results = evaluate_incremental(
+                                    file_hash,
+                                    applied_rules,
+                                    lambda rules: validate_chunks(
+                                        iter_file_chunks(st.session_state.uploaded_file_data['content'], profile),
+                                        rules,
+                                        progress=lambda rows: progress_bar.progress(min(rows / total_rows, 1.0), text=f"⚡ {rows:,} / {total_rows:,} satır kontrol edildi")
+                                    )
+                                )
+                            except ValueError as e:
+                                st.warning(f"⚠️ Kurallar çalıştırılamadı: {str(e)}")
+                            finally:
+                                progress_bar.empty()
+                
+                    quality_results = st.session_state.get('quality_results') or {}
+                    if quality_results:
+                        st.markdown("#### 🔍 Kontrol Sonuçları")
+                        st.dataframe(
+                            [
+                                {
+                                    "Kolon": column,
+                                    "Kural": result.rule,
+                                    "Kontrol Edilen": result.checked,
+                                    "İhlal": result.violations,
+                                    "İhlal Oranı": f"{result.violation_rate:.2%}",
+                                    "Durum": f"⚠️ {result.error}" if result.error else ("✅" if result.violations == 0 else "❌")
+                                }
+                                for column, result in quality_results.items()
+                            ],
+                            use_container_width=True,
+                            hide_index=True
+                        )
+                        for column, result in quality_results.items():
+                            if result.samples:
+                                with st.expander(f"❌ {column}: örnek ihlaller"):
+                                    st.dataframe(
+                                        [{"Satır": row, "Değer": str(value)} for row, value in result.samples],
+                                        use_container_width=True,
+                                        hide_index=True
+                                    )
+                
+                    st.success("📤 **Onaya Gönder** sekmesine geçebilirsiniz!")
+                
+                quality_editor()
         
         # Tab 5: Onaya Gönder
         with tab5:
@@ -1093,7 +1145,7 @@ if st.session_state.logged_in:
             st.markdown(f"**🔒 Güvenlik Adımı:** {security_status}")
             
             # Dosya yükleme durumu
-            file_status = "✅ Yüklendi ve Önizlendi" if st.session_state.uploaded_file_data is not None and st.session_state.df_data is not None else "❌ Yüklenmedi"
+            file_status = "✅ Yüklendi ve Önizlendi" if st.session_state.uploaded_file_data is not None and st.session_state.file_profile is not None else "❌ Yüklenmedi"
             st.markdown(f"**📁 Dosya Eklendi:** {file_status}")
             
             # Metadata durumu
@@ -1119,7 +1171,7 @@ if st.session_state.logged_in:
                     file_size_mb = st.session_state.uploaded_file_data['size'] / (1024 * 1024)
                     st.metric("Dosya Boyutu", f"{file_size_mb:.2f} MB")
                 with col3:
-                    column_count = len(st.session_state.df_data.columns) if st.session_state.df_data is not None else 0
+                    column_count = len(st.session_state.file_profile.columns) if st.session_state.file_profile is not None else 0
                     st.metric("Kolon Sayısı", column_count)
                 
                 st.markdown("---")
@@ -1128,7 +1180,7 @@ if st.session_state.logged_in:
             can_approve = (
                 hasattr(st.session_state, 'security_passed') and st.session_state.security_passed and
                 st.session_state.uploaded_file_data is not None and
-                st.session_state.df_data is not None
+                st.session_state.file_profile is not None
             )
             
             if not can_approve:
@@ -1148,9 +1200,6 @@ if st.session_state.logged_in:
                 # Onaya gönderme butonu
                 if st.button("📤 Onaya Gönder", type="primary", use_container_width=True):
                     try:
-                        import json
-                        import zipfile
-                        import io
                         from datetime import datetime
                         
                         with st.spinner("📋 Dosya onaya hazırlanıyor..."):
@@ -1158,11 +1207,10 @@ if st.session_state.logged_in:
                             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                             original_filename = st.session_state.uploaded_file_data['name']
                             
-                            # Ana dosya içeriğini hazırla
+                            # Ana dosya içeriği (belleğe okunmaz, pakete akıtılır)
                             file_content = st.session_state.uploaded_file_data['content']
-                            file_content.seek(0)
-                            file_data = file_content.read()
-                            original_file_size = len(file_data)
+                            original_file_size = st.session_state.uploaded_file_data['size']
+                            upload_id = f"{timestamp}_{st.session_state.username}_{original_filename}"
                             
                             # Metadata JSON'u oluştur
                             metadata_json = {
@@ -1172,34 +1220,41 @@ if st.session_state.logged_in:
                                 "original_filename": original_filename,
                                 "file_size_mb": round(original_file_size / (1024 * 1024), 2),
                                 "file_type": st.session_state.uploaded_file_data['type'],
-                                "columns": list(st.session_state.df_data.columns.tolist()) if st.session_state.df_data is not None else [],
+                                "columns": st.session_state.file_profile.column_names if st.session_state.file_profile is not None else [],
                                 "metadata": st.session_state.column_metadata if hasattr(st.session_state, 'column_metadata') else {},
                                 "quality_rules": st.session_state.quality_rules if hasattr(st.session_state, 'quality_rules') else {},
+                                "quality_results": {column: result.to_dict() for column, result in (st.session_state.get('quality_results') or {}).items()},
                                 "security_check_passed": True,
                                 "status": "pending_approval",
                                 "comment": comment if comment else "Not eklenmedi"
                             }
                             
-                            # ZIP dosyası oluştur (memory'de tut)
-                            zip_buffer = io.BytesIO()
-                            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                                # Ana dosyayı ZIP'e ekle
-                                zip_file.writestr(original_filename, file_data)
-                                # Metadata'yı ZIP'e ekle
-                                zip_file.writestr(f"{original_filename}_metadata.json", json.dumps(metadata_json, indent=2, ensure_ascii=False).encode('utf-8'))
+                            # ZIP paketi diske akıtılır; kayıtta sadece yolu ve özeti tutulur
+                            package = build_package(file_content, original_filename, original_file_size, metadata_json, upload_id)
                             
-                            zip_buffer.seek(0)
-                            zip_data = zip_buffer.read()
+                            # Paket hemen S3'te pending/ altına yüklenir; onay sadece sunucu tarafı kopya olur.
+                            # Yüklenemezse paket yerel diskte bekler ve onayda oradan yüklenir.
+                            s3_key = pending_key(upload_id)
+                            staged, stage_message = upload_package(package.path, s3_key, package.sha256)
+                            if staged:
+                                discard_package(package.path)
+                            else:
+                                s3_key = None
+                                st.warning(f"⚠️ {stage_message} (paket onaya kadar sunucuda bekletilecek)")
                             
                             # Pending uploads listesine ekle
                             upload_item = {
-                                "id": f"{timestamp}_{st.session_state.username}_{original_filename}",
+                                "id": upload_id,
                                 "timestamp": timestamp,
                                 "uploader": st.session_state.username,
                                 "approver": USERS.get(st.session_state.username, {}).get('approver'),
                                 "filename": original_filename,
                                 "file_size_mb": round(original_file_size / (1024 * 1024), 2),
-                                "zip_data": zip_data,
+                                "package_path": None if staged else package.path,
+                                "s3_key": s3_key,
+                                "package_sha256": package.sha256,
+                                "package_size": package.size,
+                                "package_codec": package.codec,
                                 "metadata": metadata_json,
                                 "status": "pending_approval",
                                 "comment": comment if comment else "Not eklenmedi"
@@ -1207,6 +1262,15 @@ if st.session_state.logged_in:
                             
                             st.session_state.pending_uploads.append(upload_item)
                             
+                            # Açıklama ve kurallar aynı düzendeki sonraki yüklemelerde önceden doldurulur
+                            schema_saved, schema_message = remember_schema(
+                                schema_columns(st.session_state.file_profile),
+                                metadata_json["metadata"],
+                                metadata_json["quality_rules"]
+                            )
+                            if not schema_saved:
+                                st.warning(f"⚠️ {schema_message}")
+                            
                             # History'ye kayıt ekle
                             history_item = {
                                 "timestamp": timestamp,
@@ -1315,6 +1379,8 @@ if st.session_state.logged_in:
                         st.markdown("**📋 Dosya Bilgileri:**")
                         st.markdown(f"- **Dosya Tipi:** {metadata.get('file_type', 'N/A')}")
                         st.markdown(f"- **Kolon Sayısı:** {len(metadata.get('columns', []))}")
+                        if upload.get('package_size') is not None:
+                            st.markdown(f"- **Paket:** {upload['package_size'] / (1024 * 1024):.2f} MB ({upload.get('package_codec', 'deflate-6')})")
                         st.markdown(f"- **Güvenlik Kontrolü:** {'✅ Geçti' if metadata.get('security_check_passed') else '❌ Geçmedi'}")
                         
                         if metadata.get('metadata'):
@@ -1334,51 +1400,25 @@ if st.session_state.logged_in:
                         # Yükle butonu (S3'e yükle)
                         if st.button("📤 Yükle", key=f"upload_{upload['id']}", use_container_width=True):
                             try:
-                                import boto3
-                                import io
                                 from datetime import datetime
-                                from botocore.exceptions import ClientError, NoCredentialsError
-                                
-                                # S3 bağlantı bilgileri (environment variables'dan al)
-                                import os
-                                s3_endpoint_url = os.getenv("S3_ENDPOINT_URL", "http://localhost:9000")
-                                aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "minioadmin")
-                                aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "minioadmin123")
-                                bucket_name = os.getenv("S3_BUCKET_NAME", "data-uploads")
-                                region_name = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
                                 
+                                zip_filename = approved_key(upload['timestamp'], upload['filename'])
                                 with st.spinner("📦 Dosya S3'e yükleniyor..."):
-                                    # S3 client oluştur
-                                    s3_client = boto3.client(
-                                        's3',
-                                        endpoint_url=s3_endpoint_url,
-                                        aws_access_key_id=aws_access_key_id,
-                                        aws_secret_access_key=aws_secret_access_key,
-                                        region_name=region_name
-                                    )
-                                    
-                                    # Bucket var mı kontrol et, yoksa oluştur
-                                    try:
-                                        s3_client.head_bucket(Bucket=bucket_name)
-                                    except ClientError as e:
-                                        error_code = e.response['Error']['Code']
-                                        if error_code == '404':
-                                            # Bucket yok, oluştur
-                                            s3_client.create_bucket(Bucket=bucket_name)
-                                        else:
-                                            raise e
-                                    
-                                    # ZIP dosyasını S3'e yükle
-                                    zip_filename = f"approved/{upload['timestamp']}_{upload['filename']}.zip"
-                                    s3_client.put_object(
-                                        Bucket=bucket_name,
-                                        Key=zip_filename,
-                                        Body=io.BytesIO(upload['zip_data']),
-                                        ContentType="application/zip"
-                                    )
+                                    if upload.get('s3_key'):
+                                        # Paket gönderimde pending/ altına yüklendi; onay sunucu tarafı kopyadır
+                                        approved, approve_message = approve_package(upload['s3_key'], zip_filename, upload.get('package_sha256'))
+                                    else:
+                                        # Gönderimde S3'e yüklenemeyen paket yerel diskten yüklenir
+                                        approved, approve_message = verify_package(upload.get('package_path'), upload.get('package_sha256'))
+                                        if approved:
+                                            approved, approve_message = upload_package(upload['package_path'], zip_filename, upload['package_sha256'])
+                                    if not approved:
+                                        raise RuntimeError(approve_message)
                                     
-                                    # Upload'ın durumunu güncelle
+                                    # Upload'ın durumunu güncelle, yerel paketi sil
                                     upload['status'] = 'approved'
+                                    upload['s3_key'] = zip_filename
+                                    discard_package(upload.get('package_path'))
                                     
                                     # History'ye onaylama kaydı ekle
                                     from datetime import datetime
@@ -1400,16 +1440,17 @@ if st.session_state.logged_in:
                                     st.info(f"📁 Dosya konumu: `{zip_filename}`")
                                     st.rerun()
                                     
-                            except NoCredentialsError:
-                                st.error("❌ AWS kimlik bilgileri bulunamadı!")
-                            except ClientError as e:
-                                st.error(f"❌ S3 hatası: {e.response['Error']['Message']}")
                             except Exception as e:
                                 st.error(f"❌ Yükleme hatası: {str(e)}")
                         
                         # Red butonu
                         if st.button("❌ Reddet", key=f"reject_{upload['id']}", use_container_width=True):
                             upload['status'] = 'rejected'
+                            discard_package(upload.get('package_path'))
+                            if upload.get('s3_key'):
+                                rejected, reject_message = reject_package(upload['s3_key'])
+                                if not rejected:
+                                    st.warning(f"⚠️ {reject_message}")
                             
                             # History'ye reddetme kaydı ekle
                             from datetime import datetime
@@ -1431,14 +1472,49 @@ if st.session_state.logged_in:
                         
                         # İndir butonu
                         if st.button("📥 İndir", key=f"download_{upload['id']}", use_container_width=True):
-                            st.download_button(
-                                label="💾 ZIP Dosyasını İndir",
-                                data=upload['zip_data'],
-                                file_name=f"{upload['filename']}.zip",
-                                mime="application/zip",
-                                key=f"download_btn_{upload['id']}",
-                                use_container_width=True
-                            )
+                            if upload.get('s3_key'):
+                                # S3'teki paket sunucudan geçmeden, süreli bağlantıyla indirilir
+                                package_url = download_url(upload['s3_key'], upload['filename'])
+                                if package_url:
+                                    st.link_button("💾 ZIP Dosyasını İndir", package_url, use_container_width=True)
+                                else:
+                                    st.error("❌ İndirme bağlantısı oluşturulamadı")
+                            elif upload['package_size'] > PACKAGE_DOWNLOAD_MAX_MB * 1024 * 1024:
+                                # download_button dosyanın tamamını bellekte tutar; büyük paket önce S3'e yüklenir
+                                st.warning(f"⚠️ {PACKAGE_DOWNLOAD_MAX_MB:g} MB'tan büyük paketler S3 bağlantısıyla indirilir.")
+                                st.session_state[f"stage_requested_{upload['id']}"] = True
+                            else:
+                                package_ok, package_message = verify_package(upload.get('package_path'), upload.get('package_sha256'))
+                                if not package_ok:
+                                    st.error(f"❌ {package_message}")
+                                else:
+                                    with open(upload['package_path'], 'rb') as package_file:
+                                        st.download_button(
+                                            label="💾 ZIP Dosyasını İndir",
+                                            data=package_file,
+                                            file_name=f"{upload['filename']}.zip",
+                                            mime="application/zip",
+                                            key=f"download_btn_{upload['id']}",
+                                            use_container_width=True
+                                        )
+                        
+                        # Yerelde bekleyen büyük paket S3'e yüklenince süreli bağlantıyla indirilebilir
+                        stage_flag = f"stage_requested_{upload['id']}"
+                        if st.session_state.get(stage_flag) and not upload.get('s3_key'):
+                            if st.button("☁️ S3'e Yükle", key=f"stage_{upload['id']}", use_container_width=True):
+                                with st.spinner("📦 Paket S3'e yükleniyor..."):
+                                    staged, stage_message = verify_package(upload.get('package_path'), upload.get('package_sha256'))
+                                    if staged:
+                                        s3_key = pending_key(upload['id'])
+                                        staged, stage_message = upload_package(upload['package_path'], s3_key, upload['package_sha256'])
+                                if staged:
+                                    discard_package(upload['package_path'])
+                                    upload['package_path'] = None
+                                    upload['s3_key'] = s3_key
+                                    del st.session_state[stage_flag]
+                                    st.rerun()
+                                else:
+                                    st.error(f"❌ {stage_message}")
 
     elif st.session_state.current_page == 'gecmis':
         # Geçmiş sayfası CSS ve üst boşluk azaltma
@@ -1741,15 +1817,18 @@ else:
 
         if login_button:
             if username and password:
-                # LDAP ile kullanıcı doğrulama
-                auth_success, auth_message = ldap_authenticate(username, password)
+                # LDAP ile kullanıcı doğrulama (arka plan havuzunda, süre sınırlı)
+                with st.spinner("🔐 Kimlik doğrulanıyor..."):
+                    auth_status, auth_message = authenticate_with_deadline(username, password)
                 
-                if auth_success:
+                if auth_status == AUTH_OK:
                     # Kullanıcı bilgilerini session'a kaydet
                     st.session_state.username = username
                     # SMS doğrulama sayfasına yönlendir
                     st.session_state.show_sms = True
                     st.rerun()
+                elif auth_status in (AUTH_TIMEOUT, AUTH_BUSY):
+                    st.warning(f"⏳ {auth_message}")
                 else:
                     st.error(f"❌ {auth_message}")
             else:
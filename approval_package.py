@@ -0,0 +1,405 @@
+# Onay paketlerinin (ZIP) diske akışla yazılması
+#
+# Yüklenen dosya ve metadata JSON'u sabit boyutlu tamponlarla doğrudan geçici
+# dizindeki bir ZIP dosyasına yazılır; dosyanın tamamı hiçbir aşamada belleğe
+# alınmaz. Çıktı arama (seek) yapılamayan bir yazıcıdan geçirildiği için
+# zipfile yerel başlıkları geri dönüp düzeltmez, boyut ve CRC'yi her kaydın
+# sonuna (data descriptor) yazar; böylece paketin SHA-256 özeti de yazarken
+# tek geçişte hesaplanır. Onay bekleyen kayıtlar sadece dosya yolunu ve özeti
+# tutar.
+#
+# Sıkıştırma yöntemi ve seviyesi DATA_PACKAGE_CODEC ile seçilir. "auto" zaten
+# sıkıştırılmış biçimleri (xlsx, pdf, zip...) ve ilk birkaç MB'ı hızlı
+# sıkıştırıldığında küçülmeyen dosyaları sıkıştırmadan (stored) yazar; büyük
+# metin dosyalarında hızlı, diğerlerinde varsayılan deflate seviyesini seçer.
+#
+# Büyük dosyalarda deflate, pigz'deki gibi iş parçacıklarına bölünür: veri
+# bloklara ayrılır, her blok bir önceki bloğun son 32 KB'ı sözlük olarak
+# verilerek ayrı ayrı sıkıştırılır ve bloklar sync flush ile bittiği için
+# sırayla art arda yazıldığında tek ve standart bir deflate akışı oluşur.
+# zlib sıkıştırırken GIL'i bıraktığından bloklar gerçekten paralel çalışır.
+# Bu yolda ZIP yapısı (yerel başlık, data descriptor, merkezi dizin, ZIP64)
+# zipfile'ın iç yapılarına dokunmadan _StreamingZip ile doğrudan yazılır.
+
+import collections
+import concurrent.futures
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Paketlerin yazıldığı dizin
+PACKAGE_DIR = os.getenv("DATA_PACKAGE_DIR", os.path.join(tempfile.gettempdir(), "ddp_packages"))
+# Kopyalama tamponu (KB)
+PACKAGE_BUFFER_KB = int(os.getenv("DATA_PACKAGE_BUFFER_KB", "1024"))
+# Bu süreden (saat) eski paketler yeni paket yazılırken silinir (0 = silinmez)
+PACKAGE_MAX_AGE_HOURS = float(os.getenv("DATA_PACKAGE_MAX_AGE_HOURS", "72"))
+# S3'e yüklenemeyip yerelde bekleyen paketler bu boyuta (MB) kadar uygulama üzerinden
+# indirilebilir; Streamlit indirilen dosyanın tamamını bellekte tuttuğu için büyükleri S3 bağlantısıyla indirilir
+PACKAGE_DOWNLOAD_MAX_MB = float(os.getenv("DATA_PACKAGE_DOWNLOAD_MAX_MB", "50"))
+# Sıkıştırma: auto veya CODECS'teki adlardan biri
+PACKAGE_CODEC = os.getenv("DATA_PACKAGE_CODEC", "auto").strip().lower()
+# auto seçimde deneme sıkıştırması yapılan baştaki bölüm (MB)
+PACKAGE_SAMPLE_MB = float(os.getenv("DATA_PACKAGE_SAMPLE_MB", "4"))
+# auto seçimde bu boyutun (MB) üstündeki dosyalar hızlı seviyeyle sıkıştırılır
+PACKAGE_FAST_MB = float(os.getenv("DATA_PACKAGE_FAST_MB", "256"))
+# Deflate'i paralel çalıştıran iş parçacığı sayısı (1 = kapalı)
+PACKAGE_THREADS = int(os.getenv("DATA_PACKAGE_THREADS", str(min(4, os.cpu_count() or 1))))
+# Paralel deflate'te her iş parçacığına verilen blok (KB)
+PACKAGE_BLOCK_KB = int(os.getenv("DATA_PACKAGE_BLOCK_KB", "1024"))
+# Bu boyutun (MB) altındaki dosyalarda iş parçacıklarına dağıtmanın maliyeti kazançtan büyüktür
+PARALLEL_MIN_MB = 16
+
+PACKAGE_SUFFIX = ".zip"
+_PARTIAL_SUFFIX = ".part"
+
+CODEC_AUTO = "auto"
+# ad -> (zipfile sıkıştırma yöntemi, seviye)
+CODECS = {
+    "stored": (zipfile.ZIP_STORED, None),
+    "deflate-1": (zipfile.ZIP_DEFLATED, 1),
+    "deflate-6": (zipfile.ZIP_DEFLATED, 6),
+    "deflate-9": (zipfile.ZIP_DEFLATED, 9),
+    "bzip2-9": (zipfile.ZIP_BZIP2, 9),
+    # Info-ZIP unzip LZMA kayıtlarını açamaz; auto seçimde kullanılmaz
+    "lzma": (zipfile.ZIP_LZMA, None),
+}
+# Zstandard ZIP kaydı Python 3.14 zipfile'ı ile gelir; eski unzip sürümleri
+# açamadığı için auto seçimde kullanılmaz, sadece açıkça seçilebilir
+if hasattr(zipfile, "ZIP_ZSTANDARD"):
+    CODECS["zstd-3"] = (zipfile.ZIP_ZSTANDARD, 3)
+    CODECS["zstd-10"] = (zipfile.ZIP_ZSTANDARD, 10)
+
+# Kendi içinde sıkıştırılmış biçimler; tekrar sıkıştırmak sadece CPU harcar
+COMPRESSED_EXTENSIONS = (
+    ".xlsx", ".xlsm", ".docx", ".pptx", ".pdf", ".zip", ".gz", ".bz2", ".xz",
+    ".zst", ".7z", ".rar", ".parquet", ".png", ".jpg", ".jpeg",
+)
+# Deneme sıkıştırmasında bu orandan az küçülen veri sıkıştırılmaz
+INCOMPRESSIBLE_RATIO = 0.9
+# Deflate penceresi; her blok bir öncekinin bu kadar sonunu sözlük olarak kullanır
+DEFLATE_WINDOW = 32 * 1024
+DEFAULT_DEFLATE_LEVEL = 6
+
+# ZIP kayıt yapıları (APPNOTE 4.3); zipfile'ın kullandığı düzenle aynı
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+_END_RECORD64 = struct.Struct("<4sQ2H2L4Q")
+_END_LOCATOR64 = struct.Struct("<4sLQL")
+# Bit 3: boyut ve CRC kaydın sonundaki data descriptor'da; bit 11: ad UTF-8
+_FLAGS = 0x08 | 0x800
+_UINT32_MAX = 0xFFFFFFFF
+_UINT16_MAX = 0xFFFF
+# Unix (3) üzerinde, ZIP64 gerektiren (4.5) sürüm
+_CREATE_SYSTEM = 3
+_ZIP64_VERSION = 45
+_DEFAULT_VERSION = 20
+
+
+@dataclass(frozen=True)
+class Package:
+    path: str
+    sha256: str
+    size: int
+    codec: str
+
+
+class _HashingWriter:
+    """
+    Yazılan baytların SHA-256 özetini ve sayısını tutan, tell/seek desteği
+    olmayan yazıcı (zipfile bu durumda akış moduna geçer)
+    """
+
+    def __init__(self, raw):
+        self._raw = raw
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self._digest.update(data)
+        self._raw.write(data)
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        self._raw.flush()
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+
+def _deflate_block(block, dictionary, level, last):
+    # Ham deflate (başlıksız, wbits=-15); zipfile'ın ZIP_DEFLATED kayıtları da böyle
+    if dictionary:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class ParallelDeflate:
+    """
+    zlib.compressobj ile aynı arayüze (compress/flush) sahip, blokları iş
+    parçacığı havuzunda sıkıştıran deflate sıkıştırıcısı. Çıktı sırası
+    korunur; bellekte en fazla 2 x iş parçacığı sayısı kadar blok bekler.
+    """
+
+    def __init__(self, level, threads, block_size):
+        self._level = level
+        self._executor = _get_executor(threads)
+        self._max_pending = 2 * threads
+        self._block_size = block_size
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._pending = collections.deque()
+
+    def _submit(self, block, last=False):
+        self._pending.append(self._executor.submit(_deflate_block, block, self._dictionary, self._level, last))
+        self._dictionary = block[-DEFLATE_WINDOW:]
+
+    def _collect(self, wait_all=False):
+        output = []
+        while self._pending and (wait_all or len(self._pending) > self._max_pending or self._pending[0].done()):
+            output.append(self._pending.popleft().result())
+        return b"".join(output)
+
+    def compress(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            block = bytes(self._buffer[:self._block_size])
+            del self._buffer[:self._block_size]
+            self._submit(block)
+        return self._collect()
+
+    def flush(self):
+        # Son blok (boş olabilir) Z_FINISH ile akışı kapatır
+        self._submit(bytes(self._buffer), last=True)
+        self._buffer = bytearray()
+        return self._collect(wait_all=True)
+
+
+_executor = None
+_executor_threads = 0
+_executor_lock = threading.Lock()
+
+
+def _get_executor(threads):
+    global _executor, _executor_threads
+    with _executor_lock:
+        if _executor is None or _executor_threads != threads:
+            if _executor is not None:
+                # Eski havuzdaki işler tamamlanır, sadece yeni iş alınmaz
+                _executor.shutdown(wait=False)
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads, thread_name_prefix="package-deflate")
+            _executor_threads = threads
+        return _executor
+
+
+def _dos_datetime():
+    year, month, day, hour, minute, second = time.localtime()[:6]
+    return (max(year, 1980) - 1980) << 9 | month << 5 | day, hour << 11 | minute << 5 | second // 2
+
+
+class _StreamingZip:
+    """
+    Geri dönüp arama yapmadan (seek) deflate kayıtları yazan ZIP yazıcı.
+    out: write ve size özniteliği olan yazıcı (_HashingWriter). Boyutlar ve
+    CRC her kaydın sonundaki data descriptor'a, konumlar merkezi dizine yazılır.
+    """
+
+    def __init__(self, out):
+        self._out = out
+        self._entries = []
+
+    def add(self, name, chunks, compressor, zip64):
+        """
+        chunks: sıkıştırılmamış bayt blokları; compressor: compress/flush
+        arayüzlü ham deflate sıkıştırıcı. zip64, sıkıştırılmamış boyut 4 GB'ı
+        aşabilecekse True olmalıdır.
+        """
+        encoded = name.encode("utf-8")
+        date, clock = _dos_datetime()
+        offset = self._out.size
+        version = _ZIP64_VERSION if zip64 else _DEFAULT_VERSION
+        # Boyutlar henüz bilinmez; ZIP64'te yerel başlık 0xFFFFFFFF ve boş ZIP64 alanı taşır
+        extra = struct.pack("<HHQQ", 1, 16, 0, 0) if zip64 else b""
+        size_field = _UINT32_MAX if zip64 else 0
+        self._out.write(_LOCAL_HEADER.pack(
+            b"PK\x03\x04", version, 0, _FLAGS, zipfile.ZIP_DEFLATED, clock, date,
+            0, size_field, size_field, len(encoded), len(extra)
+        ) + encoded + extra)
+
+        crc = 0
+        file_size = 0
+        compress_size = 0
+        for chunk in chunks:
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            data = compressor.compress(chunk)
+            self._out.write(data)
+            compress_size += len(data)
+        data = compressor.flush()
+        self._out.write(data)
+        compress_size += len(data)
+
+        if zip64:
+            self._out.write(struct.pack("<4sLQQ", b"PK\x07\x08", crc, compress_size, file_size))
+        elif max(file_size, compress_size) >= _UINT32_MAX:
+            raise RuntimeError(f"{name}: dosya ZIP64 olmadan yazılamayacak kadar büyük")
+        else:
+            self._out.write(struct.pack("<4sLLL", b"PK\x07\x08", crc, compress_size, file_size))
+        self._entries.append((encoded, version, clock, date, crc, compress_size, file_size, offset))
+
+    def close(self):
+        """Merkezi dizini ve arşiv sonu kayıtlarını yazar"""
+        directory_offset = self._out.size
+        for encoded, version, clock, date, crc, compress_size, file_size, offset in self._entries:
+            # 32 bite sığmayan alanlar 0xFFFFFFFF yazılıp ZIP64 ek alanında verilir
+            large = [value for value in (file_size, compress_size, offset) if value >= _UINT32_MAX]
+            extra = struct.pack(f"<HH{len(large)}Q", 1, 8 * len(large), *large) if large else b""
+            self._out.write(_CENTRAL_HEADER.pack(
+                b"PK\x01\x02", version, _CREATE_SYSTEM, version, 0, _FLAGS, zipfile.ZIP_DEFLATED, clock, date,
+                crc, min(compress_size, _UINT32_MAX), min(file_size, _UINT32_MAX),
+                len(encoded), len(extra), 0, 0, 0, 0o600 << 16, min(offset, _UINT32_MAX)
+            ) + encoded + extra)
+        directory_size = self._out.size - directory_offset
+        count = len(self._entries)
+        if count >= _UINT16_MAX or directory_offset >= _UINT32_MAX or directory_size >= _UINT32_MAX:
+            end64_offset = self._out.size
+            self._out.write(_END_RECORD64.pack(
+                b"PK\x06\x06", _END_RECORD64.size - 12, _ZIP64_VERSION, _ZIP64_VERSION, 0, 0,
+                count, count, directory_size, directory_offset
+            ))
+            self._out.write(_END_LOCATOR64.pack(b"PK\x06\x07", 0, end64_offset, 1))
+        self._out.write(_END_RECORD.pack(
+            b"PK\x05\x06", 0, 0, min(count, _UINT16_MAX), min(count, _UINT16_MAX),
+            min(directory_size, _UINT32_MAX), min(directory_offset, _UINT32_MAX), 0
+        ))
+
+
+def _use_parallel(compression, threads, size):
+    return compression == zipfile.ZIP_DEFLATED and threads > 1 and size >= PARALLEL_MIN_MB * 1024 * 1024
+
+
+def choose_codec(file, filename, size):
+    """Dosya uzantısı ve baştaki bölümün deneme sıkıştırmasıyla CODECS'ten bir ad seçer"""
+    if filename.lower().endswith(COMPRESSED_EXTENSIONS):
+        return "stored"
+    file.seek(0)
+    sample = file.read(int(PACKAGE_SAMPLE_MB * 1024 * 1024))
+    file.seek(0)
+    if sample and len(zlib.compress(sample, 1)) > len(sample) * INCOMPRESSIBLE_RATIO:
+        return "stored"
+    if size >= PACKAGE_FAST_MB * 1024 * 1024:
+        return "deflate-1"
+    return "deflate-6"
+
+
+def resolve_codec(codec, file, filename, size):
+    """codec (None ise PACKAGE_CODEC) auto veya bilinmeyen bir ad ise otomatik seçim yapar"""
+    codec = (codec or PACKAGE_CODEC).strip().lower()
+    if codec in CODECS:
+        return codec
+    return choose_codec(file, filename, size)
+
+
+def _safe_name(name):
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in name)[:120]
+
+
+def prune_packages(directory=PACKAGE_DIR, max_age_hours=PACKAGE_MAX_AGE_HOURS):
+    """Oturumu kapanmış kayıtlardan kalan eski paketleri siler; silinen dosya sayısını döndürür"""
+    if max_age_hours <= 0 or not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+    for entry in os.scandir(directory):
+        if not entry.name.endswith((PACKAGE_SUFFIX, _PARTIAL_SUFFIX)):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def build_package(file, filename, size, metadata, package_id, directory=PACKAGE_DIR, codec=None, threads=None):
+    """
+    Dosyayı ve metadata JSON'unu diske bir ZIP olarak akıtır; Package döndürür.
+    codec verilmezse PACKAGE_CODEC, threads verilmezse PACKAGE_THREADS
+    kullanılır. Yarım kalan yazım .part uzantılı dosyada kalmaz, silinir.
+    """
+    os.makedirs(directory, exist_ok=True)
+    prune_packages(directory)
+    codec = resolve_codec(codec, file, filename, size)
+    compression, level = CODECS[codec]
+    threads = PACKAGE_THREADS if threads is None else threads
+    buffer_bytes = max(PACKAGE_BUFFER_KB, 64) * 1024
+    path = os.path.join(directory, _safe_name(package_id) + PACKAGE_SUFFIX)
+    fd, partial_path = tempfile.mkstemp(suffix=_PARTIAL_SUFFIX, dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            writer = _HashingWriter(raw)
+            metadata_bytes = json.dumps(metadata, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+            # Sıkıştırılmamış boyut 2 GB'a yaklaşıyorsa kayıt ZIP64 alanlarıyla açılır
+            zip64 = size * 1.05 > zipfile.ZIP64_LIMIT
+            file.seek(0)
+            if _use_parallel(compression, threads, size):
+                level = level or DEFAULT_DEFLATE_LEVEL
+                archive = _StreamingZip(writer)
+                archive.add(
+                    filename, iter(lambda: file.read(buffer_bytes), b""),
+                    ParallelDeflate(level, threads, max(PACKAGE_BLOCK_KB, 64) * 1024), zip64
+                )
+                archive.add(
+                    f"{filename}_metadata.json", [metadata_bytes],
+                    zlib.compressobj(level, zlib.DEFLATED, -15), False
+                )
+                archive.close()
+            else:
+                with zipfile.ZipFile(writer, "w", compression=compression, compresslevel=level) as archive:
+                    with archive.open(filename, "w", force_zip64=zip64) as entry:
+                        shutil.copyfileobj(file, entry, buffer_bytes)
+                    archive.writestr(f"{filename}_metadata.json", metadata_bytes)
+        os.replace(partial_path, path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    return Package(path=path, sha256=writer.hexdigest(), size=writer.size, codec=codec)
+
+
+def verify_package(path, sha256):
+    """Diskteki paketin özetini karşılaştırır; (başarılı, mesaj) döndürür"""
+    if not path or not os.path.exists(path):
+        return False, "Paket dosyası bulunamadı (sunucu yeniden başlatılmış veya paket silinmiş olabilir)"
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(max(PACKAGE_BUFFER_KB, 64) * 1024), b""):
+            digest.update(block)
+    if digest.hexdigest() != sha256:
+        return False, "Paket dosyası değişmiş (SHA-256 özeti tutmuyor)"
+    return True, "Paket doğrulandı"
+
+
+def discard_package(path):
+    """Paketi diskten siler (yoksa sessizce geçer)"""
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
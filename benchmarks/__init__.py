@@ -0,0 +1 @@
+# Performans ölçüm betikleri (python -m benchmarks.<modül> ile çalıştırılır)
@@ -0,0 +1,141 @@
+# CSV okuma motorlarının süre ve bellek (RSS) karşılaştırması
+#
+#   python -m benchmarks.csv_engine_bench --sizes 100
+#   python -m benchmarks.csv_engine_bench --sizes 100,500,2000 --dir /data/tmp
+#
+# Verilen boyutlarda geniş, metin ağırlıklı sentetik CSV dosyaları üretilir.
+# Her ölçüm ayrı bir alt süreçte yapılır; tepe RSS alt sürecin ru_maxrss değeridir.
+#   eski          : pd.read_csv ile tüm dosya (önceki davranış)
+#   pandas/akış   : data_ingest.profile_csv, pandas motoru, parça parça
+#   pyarrow/akış  : data_ingest.profile_csv, pyarrow motoru, blok blok
+#   pyarrow/tam   : pyarrow motoru, tüm dosya çok iş parçacıklı tek okumada
+# "taban RSS" satırı kütüphaneler yüklendikten sonraki boş süreç belleğidir.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import data_ingest
+
+CASES = (
+    ("eski", "pandas", None),
+    ("pandas/akış", "pandas", "stream"),
+    ("pyarrow/akış", "pyarrow", "stream"),
+    ("pyarrow/tam", "pyarrow", "memory"),
+)
+
+CITIES = np.array(["İstanbul", "Ankara", "İzmir", "Bursa", "Antalya", "Şanlıurfa", "Eskişehir", "Muğla"])
+WORDS = np.array(["müşteri", "hesap", "kredi", "kart", "şube", "işlem", "ödeme", "yatırım", "çağrı", "güncelleme"])
+
+
+def write_synthetic(path, size_mb, text_columns=20, numeric_columns=10, seed=42):
+    """Yaklaşık size_mb boyutunda ; ayırıcılı, UTF-8 sentetik CSV yazar"""
+    rng = np.random.default_rng(seed)
+    header = (["musteri_no", "sehir", "kayit_tarihi"]
+              + [f"aciklama_{i}" for i in range(text_columns)]
+              + [f"tutar_{i}" for i in range(numeric_columns)])
+    target = size_mb * 1024 * 1024
+    rows_per_block = 20000
+    written = 0
+    row_id = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(";".join(header) + "\n")
+        while written < target:
+            ids = np.arange(row_id, row_id + rows_per_block)
+            row_id += rows_per_block
+            columns = [
+                ids.astype(str),
+                rng.choice(CITIES, rows_per_block),
+                np.datetime_as_string(np.datetime64("2020-01-01") + rng.integers(0, 1500, rows_per_block), unit="D"),
+            ]
+            for _ in range(text_columns):
+                columns.append(np.char.add(np.char.add(rng.choice(WORDS, rows_per_block), " "),
+                                           rng.choice(WORDS, rows_per_block)))
+            for _ in range(numeric_columns):
+                columns.append(np.round(rng.random(rows_per_block) * 10000, 2).astype(str))
+            block = "\n".join(";".join(row) for row in zip(*columns)) + "\n"
+            f.write(block)
+            written += len(block.encode("utf-8"))
+
+
+def child(args):
+    """Tek ölçüm: sonucu JSON olarak stdout'a yazar"""
+    size = os.path.getsize(args.file)
+    started = time.perf_counter()
+    if args.mode == "baseline":
+        # Sadece kütüphanelerin yüklenmiş hali
+        if data_ingest.pyarrow_available():
+            import pyarrow.csv  # noqa: F401
+        rows, columns = 0, 0
+    elif args.mode is None:
+        import pandas as pd
+        df = pd.read_csv(args.file, sep=";", encoding="utf-8")
+        rows, columns = len(df), len(df.columns)
+    else:
+        data_ingest.INMEMORY_MAX_MB = float("inf") if args.mode == "memory" else 0
+        with open(args.file, "rb") as f:
+            profile = data_ingest.profile_csv(f, os.path.basename(args.file), size, engine=args.engine)
+        rows, columns = profile.row_count, len(profile.columns)
+        if profile.engine != args.engine:
+            print(f"uyarı: {args.engine} yerine {profile.engine} kullanıldı", file=sys.stderr)
+    print(json.dumps({"seconds": time.perf_counter() - started, "rows": rows, "columns": columns}))
+
+
+def measure(path, engine, mode):
+    command = [sys.executable, "-m", "benchmarks.csv_engine_bench", "--child", "--file", path, "--engine", engine]
+    if mode:
+        command += ["--mode", mode]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE)
+    output = process.stdout.read()
+    process.stdout.close()
+    _, status, usage = os.wait4(process.pid, 0)
+    if status != 0:
+        return None
+    result = json.loads(output)
+    # Linux'ta ru_maxrss KB cinsindendir
+    result["rss_mb"] = usage.ru_maxrss / 1024
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV okuma motoru karşılaştırması")
+    parser.add_argument("--sizes", default="100", help="MB cinsinden dosya boyutları (virgülle)")
+    parser.add_argument("--dir", help="sentetik dosyaların yazılacağı dizin (varsayılan: geçici dizin)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    parser.add_argument("--engine", default="pandas", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+
+    if not data_ingest.pyarrow_available():
+        print("pyarrow kurulu değil; pyarrow ölçümleri pandas motoruna düşer")
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        print(f"{'boyut':>7} {'motor':<14} {'süre sn':>8} {'MB/sn':>8} {'tepe RSS MB':>12} {'satır':>10}")
+        for size_mb in (int(s) for s in args.sizes.split(",")):
+            path = os.path.join(directory, f"sentetik_{size_mb}mb.csv")
+            write_synthetic(path, size_mb)
+            actual_mb = os.path.getsize(path) / (1024 * 1024)
+            baseline = measure(path, "pandas", "baseline")
+            print(f"{size_mb:>5}MB {'(taban RSS)':<14} {'':>8} {'':>8} {baseline['rss_mb']:>12.0f}")
+            for label, engine, mode in CASES:
+                result = measure(path, engine, mode)
+                if result is None:
+                    print(f"{size_mb:>5}MB {label:<14} {'başarısız (bellek yetersiz?)':>30}")
+                    continue
+                print(f"{size_mb:>5}MB {label:<14} {result['seconds']:>8.2f} {actual_mb / result['seconds']:>8.1f} "
+                      f"{result['rss_mb']:>12.0f} {result['rows']:>10,}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# Metadata / Data Quality düzenleyicilerinde rerun sayısı ve sunucu CPU ölçümü
+#
+#   python -m benchmarks.editor_rerun_bench --columns 200 --edits 20
+#
+# app.py, Streamlit'in AppTest'i ile gerçek betik çalıştırıcısında çalıştırılır;
+# CPU süresi sürecin process_time farkıdır (betik ve AppTest'in çıktıyı
+# ayrıştırması dahil). Ölçülen iki çalışma türü:
+#   tam rerun      : tüm app.py (CSS blokları, önizleme, tüm sekmeler)
+#   fragment rerun : sadece metadata_editor / quality_editor fragment'ı
+# AppTest her zaman tam rerun yaptığından fragment rerun'ı, tarayıcının
+# gönderdiği gibi fragment kimliği verilerek tetiklenir. AppTest betiği her
+# çalıştırmada yeniden derler; sunucu derlenmiş betiği sakladığı için burada da
+# tek bir ScriptCache paylaşılır.
+#
+# Senaryo: kullanıcı --edits kolonun açıklamasını yazar ve kaydeder, sonra
+# --edits kolona kural seçip kaydeder. İki taraf da AppTest ile oynatılıp
+# ölçülür (hesaplanmış tahmin yoktur):
+#   önce  : aynı app.py, st.fragment devre dışı; fragment'sız sürümde olduğu
+#           gibi her açıklama, kural ve kaydetme tüm betiği yeniden çalıştırır
+#   sonra : her değişiklik tarayıcının yaptığı gibi fragment kimliğiyle
+#           gönderilir; kaydetmedeki st.rerun() ayrıca tam rerun yapar
+# Tam rerun'lar st.set_page_config çağrılarından sayılır.
+
+import argparse
+import functools
+import io
+import os
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import local_script_runner
+
+import data_ingest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# app.py COLUMNS_PER_PAGE; senaryo ilk sayfadaki kolonları düzenler
+PAGE_COLUMNS = 25
+
+
+def build_app(columns, rows=1000):
+    """Geniş sentetik bir CSV yüklenmiş, Metadata ve Data Quality sekmeleri açık uygulama"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"kolon_{j:04d}": rng.integers(0, 100, rows) for j in range(columns)})
+    data = io.BytesIO(df.to_csv(index=False).encode("utf-8"))
+    profile = data_ingest.profile_csv(data, "genis.csv", len(data.getvalue()))
+    app = AppTest.from_file(os.path.join(REPO_DIR, "app.py"), default_timeout=300)
+    state = {
+        "logged_in": True,
+        "username": "okan",
+        "current_page": "dosya_yukleme",
+        "security_passed": True,
+        "file_profile": profile,
+        "df_data": profile.dataframe,
+        "file_hash": None,
+        "uploaded_file_data": {"name": "genis.csv", "size": len(data.getvalue()), "type": "text/csv", "content": data},
+    }
+    for key, value in state.items():
+        app.session_state[key] = value
+    return app
+
+
+def timed_run(app, fragment_id=None):
+    """Tek çalıştırmanın CPU süresi (sn)"""
+    original = local_script_runner.RerunData
+    if fragment_id is not None:
+        local_script_runner.RerunData = functools.partial(original, fragment_id_queue=[fragment_id])
+    try:
+        started = time.process_time()
+        app.run()
+        return time.process_time() - started
+    finally:
+        local_script_runner.RerunData = original
+
+
+class RunCounter:
+    """app.py'nin her tam çalıştırmada bir kez çağırdığı st.set_page_config'i sayar"""
+
+    def __init__(self):
+        self.full_runs = 0
+        self._original = st.set_page_config
+
+    def __enter__(self):
+        def counting(*args, **kwargs):
+            self.full_runs += 1
+            return self._original(*args, **kwargs)
+
+        st.set_page_config = counting
+        return self
+
+    def __exit__(self, *exc):
+        st.set_page_config = self._original
+
+
+def without_fragments(func=None, **kwargs):
+    """st.fragment yerine: fonksiyonu olduğu gibi bırakır, her etkileşim tam rerun olur"""
+    if func is None:
+        return lambda f: f
+    return func
+
+
+def fragment_ids_of(app):
+    storage = app._fragment_storage
+    ids = sorted(storage._fragments, key=storage._registration_sequence_by_id.get)
+    if len(ids) < 2:
+        raise SystemExit("metadata_editor / quality_editor fragment'ları bulunamadı")
+    return ids[:2]
+
+
+def run_scenario(app, edits, fragments):
+    """
+    Senaryoyu oynatır; (tam rerun, fragment rerun, CPU sn) döndürür.
+    fragments False ise her etkileşim tam rerun olarak çalıştırılır.
+    """
+    metadata_fragment, quality_fragment = fragment_ids_of(app) if fragments else (None, None)
+    runs = 0
+    cpu = 0.0
+    with RunCounter() as counter:
+        for i in range(edits):
+            app.text_area(key=f"metadata_col_kolon_{i:04d}_{i}").input(f"Açıklama {i}")
+            cpu += timed_run(app, metadata_fragment)
+            runs += 1
+        [button for button in app.button if "Metadata'yı Kaydet" in str(button.label)][0].click()
+        cpu += timed_run(app, metadata_fragment)
+        runs += 1
+        for i in range(edits):
+            app.selectbox(key=f"quality_rule_kolon_{i:04d}_{i}").select("Sayısal Değer Kontrolü (Numeric)")
+            cpu += timed_run(app, quality_fragment)
+            runs += 1
+        app.button(key="quality_save_btn").click()
+        cpu += timed_run(app, quality_fragment)
+        runs += 1
+    if app.exception:
+        raise SystemExit(f"uygulama hata verdi: {app.exception[0].value}")
+    saved = app.session_state["column_metadata"]
+    if len(saved) != edits or len(app.session_state["quality_rules"]) < edits:
+        raise SystemExit("senaryo düzenlemeleri kaydedilmedi")
+    # st.rerun() aynı run() içinde ek bir tam çalıştırma yapar; sayaç onları da sayar
+    return counter.full_runs, runs if fragments else 0, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Düzenleyici rerun sayısı ve CPU ölçümü")
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument("--edits", type=int, default=20, help="düzenlenen kolon sayısı (ilk sayfadan)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    edits = min(args.edits, args.columns, PAGE_COLUMNS)
+
+    # app.py logo gibi dosyaları çalışma dizinine göre açar
+    os.chdir(REPO_DIR)
+    script_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: script_cache
+
+    # Tek çalıştırma maliyetleri
+    app = build_app(args.columns)
+    app.run()
+    if app.exception:
+        raise SystemExit(f"uygulama hata verdi: {app.exception[0].value}")
+    metadata_fragment, quality_fragment = fragment_ids_of(app)
+    full = statistics.median(timed_run(app) for _ in range(args.repeat))
+    metadata = statistics.median(timed_run(app, metadata_fragment) for _ in range(args.repeat))
+    quality = statistics.median(timed_run(app, quality_fragment) for _ in range(args.repeat))
+
+    # önce: fragment'lar kapalı
+    fragment = st.fragment
+    st.fragment = without_fragments
+    try:
+        app = build_app(args.columns)
+        app.run()
+        before_full, before_fragments, before_cpu = run_scenario(app, edits, fragments=False)
+    finally:
+        st.fragment = fragment
+
+    # sonra: fragment'lar açık
+    app = build_app(args.columns)
+    app.run()
+    after_full, after_fragments, after_cpu = run_scenario(app, edits, fragments=True)
+
+    print(f"{args.columns} kolon, {edits} açıklama + {edits} kural düzenlemesi (ölçülen)")
+    print(f"tam rerun CPU              : {full * 1000:8.1f} ms")
+    print(f"metadata fragment CPU      : {metadata * 1000:8.1f} ms")
+    print(f"quality fragment CPU       : {quality * 1000:8.1f} ms")
+    print(f"{'':<8} {'tam rerun':>10} {'fragment':>10} {'CPU sn':>8}")
+    print(f"{'önce':<8} {before_full:>10} {before_fragments:>10} {before_cpu:>8.2f}")
+    print(f"{'sonra':<8} {after_full:>10} {after_fragments:>10} {after_cpu:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
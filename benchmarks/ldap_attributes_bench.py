@@ -0,0 +1,89 @@
+# Attribute projeksiyonu ve birleşik arama öncesi/sonrası karşılaştırması
+#
+#   python -m benchmarks.ldap_attributes_bench --users 200 --logins 50
+#
+# MOCK_SYNC ağ kullanmadığından gecikme sütunları sadece istemci tarafı
+# işlem süresini gösterir; "ağ ms" sütunu yanıt boyutunun verilen bant
+# genişliğinde aktarım süresidir.
+
+import argparse
+import dataclasses
+import statistics
+import time
+
+import ldap3
+
+import ldap_auth
+from ldap_config import LDAP_CONFIG
+
+from benchmarks.mock_directory import build_directory, install_pool, response_wire_bytes, user_password
+
+SCENARIOS = {
+    # ALL_ATTRIBUTES ile iki ayrı arama (eski davranış)
+    "once": {"lookup_attributes": (ldap3.ALL_ATTRIBUTES,), "merge_group_search": False},
+    # Sadece DN ve tek birleşik arama
+    "sonra": {"lookup_attributes": (ldap3.NO_ATTRIBUTES,), "merge_group_search": True},
+}
+
+
+def run_scenario(name, user_count, logins, bandwidth_mbit):
+    stats = {"searches": 0, "bytes": 0}
+    original_search = ldap3.Connection.search
+
+    def counting_search(self, *args, **kwargs):
+        result = original_search(self, *args, **kwargs)
+        stats["searches"] += 1
+        stats["bytes"] += response_wire_bytes(self)
+        return result
+
+    # Yapılandırma değiştirilemez; senaryo için kopyası ldap_auth'a verilir
+    ldap_auth.LDAP_CONFIG = dataclasses.replace(LDAP_CONFIG, **SCENARIOS[name])
+    latencies = []
+    ldap3.Connection.search = counting_search
+    try:
+        for n in range(logins):
+            index = n % user_count
+            # Önbellek devre dışı: her giriş dizin aramalarını yapar
+            ldap_auth.user_cache.clear()
+            started = time.perf_counter()
+            ok, message = ldap_auth.ldap_authenticate(f"user{index:05d}", user_password(index))
+            latencies.append(time.perf_counter() - started)
+    finally:
+        ldap3.Connection.search = original_search
+
+    latencies.sort()
+    return {
+        "senaryo": name,
+        "arama/giriş": stats["searches"] / logins,
+        "KB/giriş": stats["bytes"] / logins / 1024,
+        "p50 ms": statistics.median(latencies) * 1000,
+        "p95 ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "ağ ms": stats["bytes"] / logins * 8 / (bandwidth_mbit * 1_000_000) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LDAP attribute projeksiyonu benchmark'ı")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--memberof", type=int, default=100, help="kullanıcı başına memberOf değeri")
+    parser.add_argument("--bandwidth", type=float, default=10.0, help="ağ süresi tahmini için Mbit/s")
+    args = parser.parse_args()
+
+    print(f"Sahte dizin oluşturuluyor: {args.users} kullanıcı, kullanıcı başına {args.memberof} memberOf")
+    server = build_directory(user_count=args.users, memberof_per_user=args.memberof)
+    install_pool(server)
+
+    try:
+        rows = [run_scenario(name, args.users, args.logins, args.bandwidth) for name in SCENARIOS]
+    finally:
+        ldap_auth.LDAP_CONFIG = LDAP_CONFIG
+
+    print(f"{'senaryo':<8}{'arama/giriş':>13}{'KB/giriş':>12}{'p50 ms':>10}{'p95 ms':>10}{'ağ ms':>10}")
+    for row in rows:
+        print(f"{row['senaryo']:<8}{row['arama/giriş']:>13.2f}{row['KB/giriş']:>12.1f}"
+              f"{row['p50 ms']:>10.2f}{row['p95 ms']:>10.2f}{row['ağ ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Çoklu domain controller seçimi ve devre kesici senaryosu
+#
+# Aynı sahte dizini paylaşan üç yerel stand-in sunucu kullanılır:
+#   dc-olu   : bağlantı açılamıyor (devre kesici açılmalı)
+#   dc-yavas : her işlemde yapay gecikme
+#   dc-hizli : gecikmesiz
+#
+#   python -m benchmarks.ldap_failover_bench --logins 60 --slow-ms 40
+
+import argparse
+import statistics
+import time
+from collections import Counter
+
+import ldap3
+
+import ldap_auth
+
+from benchmarks.mock_directory import build_directory, inject_faults, install_pool, stand_in_servers, user_password
+
+
+def run_strategy(strategy, args):
+    primary = build_directory(user_count=args.users, memberof_per_user=10, photo_bytes=0,
+                              certificate_bytes=0, host="dc-olu")
+    servers = stand_in_servers(primary, ["dc-yavas", "dc-hizli"])
+    delays = {"dc-yavas": args.slow_ms / 1000}
+    dead = {"dc-olu"}
+    server_pool = ldap_auth.LDAPServerPool(
+        servers,
+        strategy=strategy,
+        failure_threshold=1,
+        probe_interval=args.probe_interval,
+        probe=lambda server: server.host not in dead
+    )
+
+    used = Counter()
+    latencies = []
+    with inject_faults(delays, dead):
+        pool = install_pool(server_pool, size=args.pool_size)
+        original_search = ldap3.Connection.search
+
+        def tracking_search(self, *a, **kw):
+            used[self.server.host] += 1
+            return original_search(self, *a, **kw)
+
+        ldap3.Connection.search = tracking_search
+        try:
+            for n in range(args.logins):
+                index = n % args.users
+                ldap_auth.user_cache.clear()
+                # Havuzdaki bağlantıları yenile ki sunucu seçimi her girişte devreye girsin
+                pool.close()
+                started = time.perf_counter()
+                ok, message = ldap_auth.ldap_authenticate(f"user{index:05d}", user_password(index))
+                latencies.append(time.perf_counter() - started)
+                if not ok and "grupta değil" not in message:
+                    print(f"  beklenmeyen sonuç: {message}")
+
+            # Ölü sunucu geri gelir; yoklama devreyi kapatmalı
+            dead.clear()
+            time.sleep(args.probe_interval * 2.5)
+            recovered = not server_pool.status()[0]["open"]
+        finally:
+            ldap3.Connection.search = original_search
+            ldap_auth.set_pool(None)
+
+    return {
+        "strateji": strategy,
+        "p50 ms": statistics.median(latencies) * 1000,
+        "max ms": max(latencies) * 1000,
+        "arama dağılımı": dict(used),
+        "devre": server_pool.status()[0],
+        "geri geldi": recovered,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LDAP çoklu sunucu / devre kesici senaryosu")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=60)
+    parser.add_argument("--slow-ms", type=float, default=40.0)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--probe-interval", type=float, default=0.2)
+    args = parser.parse_args()
+
+    for strategy in ldap_auth.LDAPServerPool.STRATEGIES:
+        row = run_strategy(strategy, args)
+        print(f"{row['strateji']:<12} p50 {row['p50 ms']:7.2f} ms  max {row['max ms']:7.2f} ms  "
+              f"aramalar {row['arama dağılımı']}  dc-olu yoklama sonrası geri geldi: {row['geri geldi']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# Giriş (login) verimi ve gecikme yüzdelikleri ölçümü
+#
+#   python -m benchmarks.ldap_login_bench --users 2000 --logins 64 --latency-ms 5
+#   python -m benchmarks.ldap_login_bench --client async --json sonuc.json
+#
+# ldap_authenticate, binlerce sentetik kullanıcı içeren süreç içi sahte dizine
+# (MOCK_SYNC / MOCK_ASYNC) karşı 1..64 eşzamanlı iş parçacığıyla çağrılır.
+# Her eşzamanlılık seviyesi iki kez ölçülür:
+#   soğuk : kullanıcı önbelleği boş (her giriş dizin araması yapar)
+#   sıcak : tüm kullanıcılar önceden bir kez giriş yapmış (sadece rebind)
+# --latency-ms her bağlantı açılışı, bind ve aramaya eklenen ağ gecikmesidir.
+# Sahte dizin aramaları Python içinde doğrusal tarama yaptığından soğuk
+# ölçümler gerçek bir AD'ye göre CPU ağırlıklıdır; karşılaştırmalar aynı
+# parametrelerle yapılmalıdır.
+
+import argparse
+import json
+import math
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ldap3
+
+import ldap_auth
+
+from benchmarks.mock_directory import build_directory, inject_faults, install_pool, user_password
+
+CLIENT_STRATEGIES = {"sync": ldap3.MOCK_SYNC, "async": ldap3.MOCK_ASYNC}
+CONCURRENCY_LEVELS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def percentile(values, fraction):
+    """Sıralı değerlerde en yakın sıra yöntemiyle yüzdelik"""
+    ordered = sorted(values)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _timed_login(index):
+    started = time.perf_counter()
+    ok, message = ldap_auth.ldap_authenticate(f"user{index:05d}", user_password(index))
+    return time.perf_counter() - started, ok or "grupta değil" in message
+
+
+def run_level(concurrency, logins, user_count, offset):
+    """logins adet girişi concurrency iş parçacığıyla yapar"""
+    indexes = [(offset + n) % user_count for n in range(logins)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(_timed_login, indexes))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in results]
+    return {
+        "eşzamanlılık": concurrency,
+        "giriş": logins,
+        "hata": sum(1 for _, ok in results if not ok),
+        "p50 ms": percentile(latencies, 0.50) * 1000,
+        "p95 ms": percentile(latencies, 0.95) * 1000,
+        "p99 ms": percentile(latencies, 0.99) * 1000,
+        "ortalama ms": statistics.mean(latencies) * 1000,
+        "giriş/sn": logins / elapsed,
+    }
+
+
+def run(args):
+    server = build_directory(
+        user_count=args.users,
+        group_count=args.groups,
+        memberof_per_user=args.memberof,
+        photo_bytes=0,
+        certificate_bytes=0
+    )
+    levels = [c for c in CONCURRENCY_LEVELS if c <= args.max_concurrency]
+    rows = []
+    with inject_faults({server.host: args.latency_ms / 1000}):
+        pool = install_pool(server, size=args.pool_size, client_strategy=CLIENT_STRATEGIES[args.client])
+        try:
+            offset = 0
+            for concurrency in levels:
+                # Soğuk: önbellek boş, her seviyede daha önce girilmemiş kullanıcılar
+                ldap_auth.user_cache.clear()
+                row = run_level(concurrency, args.logins, args.users, offset)
+                rows.append(dict(row, önbellek="soğuk"))
+                offset += args.logins
+
+            # Sıcak: ölçülecek kullanıcılar önceden önbelleğe alınır
+            ldap_auth.user_cache.clear()
+            run_level(args.max_concurrency, args.logins, args.users, 0)
+            for concurrency in levels:
+                row = run_level(concurrency, args.logins, args.users, 0)
+                rows.append(dict(row, önbellek="sıcak"))
+            cache_stats = ldap_auth.get_cache_stats()
+        finally:
+            pool.close()
+            ldap_auth.set_pool(None)
+            ldap_auth.user_cache.clear()
+
+    return {
+        "parametreler": {
+            "istemci": args.client,
+            "kullanıcı": args.users,
+            "giriş/seviye": args.logins,
+            "gecikme ms": args.latency_ms,
+            "havuz": args.pool_size,
+        },
+        "sonuçlar": rows,
+        "önbellek": cache_stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LDAP giriş verimi ve gecikme yüzdelikleri")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--memberof", type=int, default=5, help="kullanıcı başına memberOf değeri")
+    parser.add_argument("--logins", type=int, default=64, help="her seviyedeki giriş sayısı")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="işlem başına yapay ağ gecikmesi")
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    parser.add_argument("--client", choices=sorted(CLIENT_STRATEGIES), default="sync")
+    parser.add_argument("--json", help="sonuçların yazılacağı JSON dosyası (CI karşılaştırması için)")
+    args = parser.parse_args()
+    if args.logins * len([c for c in CONCURRENCY_LEVELS if c <= args.max_concurrency]) > args.users:
+        parser.error("soğuk ölçüm için --users, --logins x seviye sayısından büyük olmalı")
+
+    report = run(args)
+    print(f"{'önbellek':<8} {'eşz.':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'giriş/sn':>9} {'hata':>5}")
+    for row in report["sonuçlar"]:
+        print(f"{row['önbellek']:<8} {row['eşzamanlılık']:>5} {row['p50 ms']:>9.2f} {row['p95 ms']:>9.2f} "
+              f"{row['p99 ms']:>9.2f} {row['giriş/sn']:>9.1f} {row['hata']:>5}")
+    print(f"önbellek: {report['önbellek']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
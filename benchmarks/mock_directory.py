@@ -0,0 +1,165 @@
+# Benchmark'lar için ldap3 MOCK_SYNC tabanlı, süreç içi sahte Active Directory
+
+import os
+import time
+from contextlib import contextmanager
+
+import ldap3
+from ldap3.core.exceptions import LDAPSocketOpenError
+from ldap3.strategy.mockAsync import MockAsyncStrategy
+from ldap3.strategy.mockSync import MockSyncStrategy
+
+import ldap_auth
+from ldap_config import LDAP_CONFIG
+
+SERVICE_PASSWORD = "svc-password"
+
+
+def user_password(index):
+    return f"Parola-{index}"
+
+
+def build_directory(user_count=1000, group_count=50, memberof_per_user=200,
+                    photo_bytes=16 * 1024, certificate_bytes=2 * 1024, member_ratio=0.8,
+                    host="mock-dc"):
+    """
+    Büyük kullanıcı kayıtları (çok sayıda memberOf, fotoğraf, sertifika) içeren
+    sahte bir dizin oluşturur ve ldap3.Server nesnesini döndürür.
+    Kullanıcı adları user00000, user00001, ... şeklindedir; ilk
+    user_count * member_ratio kullanıcı yetkili gruptadır.
+    """
+    server = ldap3.Server(host, get_info=ldap3.OFFLINE_AD_2012_R2)
+    loader = ldap3.Connection(server, client_strategy=ldap3.MOCK_SYNC)
+    base_dn = LDAP_CONFIG.user_base_dn
+    group_dn = LDAP_CONFIG.group_dn
+
+    loader.strategy.add_entry(LDAP_CONFIG.bind_dn, {
+        "objectClass": "user",
+        "sAMAccountName": "svc",
+        "userPassword": SERVICE_PASSWORD
+    })
+
+    other_groups = [f"CN=Grup{g:04d},OU=Groups,{base_dn}" for g in range(group_count)]
+    photo = os.urandom(photo_bytes)
+    certificate = os.urandom(certificate_bytes)
+    member_limit = int(user_count * member_ratio)
+
+    for i in range(user_count):
+        groups = [other_groups[(i + k) % group_count] for k in range(min(memberof_per_user, group_count))]
+        groups += [f"CN=Dagitim{i % 97}-{k:04d},OU=Lists,{base_dn}" for k in range(max(0, memberof_per_user - group_count))]
+        if i < member_limit:
+            groups.append(group_dn)
+        loader.strategy.add_entry(f"CN=user{i:05d},{base_dn}", {
+            "objectClass": "user",
+            "sAMAccountName": f"user{i:05d}",
+            "userPassword": user_password(i),
+            "memberOf": groups,
+            "thumbnailPhoto": photo,
+            "userCertificate": certificate,
+            "description": f"Sentetik kullanıcı {i}"
+        })
+    return server
+
+
+def stand_in_servers(primary, hosts):
+    """
+    primary ile aynı sahte dizini paylaşan ek sunucular oluşturur
+    (birden fazla domain controller simülasyonu)
+    """
+    servers = [primary]
+    for host in hosts:
+        server = ldap3.Server(host, get_info=ldap3.OFFLINE_AD_2012_R2)
+        server.dit = primary.dit
+        server.dit_lock = primary.dit_lock
+        servers.append(server)
+    return servers
+
+
+@contextmanager
+def inject_faults(delays=None, dead=None):
+    """
+    Sahte sunuculara yapay gecikme ve erişilemezlik ekler.
+    delays: {host: saniye} - bağlantı açılışı, bind ve her aramada beklenir
+    dead: bağlantı açılışında LDAPSocketOpenError veren host kümesi
+          (çalışma sırasında değiştirilebilir)
+    """
+    delays = delays if delays is not None else {}
+    dead = dead if dead is not None else set()
+    # MOCK_SYNC ve MOCK_ASYNC stratejileri
+    strategies = (MockSyncStrategy, MockAsyncStrategy)
+    original_opens = {strategy: strategy.__dict__.get("open") for strategy in strategies}
+    inherited_opens = {strategy: strategy.open for strategy in strategies}
+    original_bind = ldap3.Connection.bind
+    original_search = ldap3.Connection.search
+
+    def slow_open(self, *args, **kwargs):
+        inherited_opens[type(self)](self, *args, **kwargs)
+        host = self.connection.server.host
+        time.sleep(delays.get(host, 0))
+        if host in dead:
+            raise LDAPSocketOpenError(f"{host} erişilemez (yapay hata)")
+
+    def slow_bind(self, *args, **kwargs):
+        time.sleep(delays.get(self.server.host, 0))
+        return original_bind(self, *args, **kwargs)
+
+    def slow_search(self, *args, **kwargs):
+        time.sleep(delays.get(self.server.host, 0))
+        return original_search(self, *args, **kwargs)
+
+    for strategy in strategies:
+        strategy.open = slow_open
+    ldap3.Connection.bind = slow_bind
+    ldap3.Connection.search = slow_search
+    try:
+        yield delays, dead
+    finally:
+        for strategy, original_open in original_opens.items():
+            if original_open is None:
+                del strategy.open
+            else:
+                strategy.open = original_open
+        ldap3.Connection.bind = original_bind
+        ldap3.Connection.search = original_search
+
+
+def install_pool(server, size=4, client_strategy=ldap3.MOCK_SYNC):
+    """
+    Sahte dizine bağlanan bir havuzu ldap_authenticate için varsayılan yapar.
+    server tek bir ldap3.Server veya ldap_auth.LDAPServerPool olabilir.
+    """
+    pool = ldap_auth.LDAPConnectionPool(
+        server,
+        LDAP_CONFIG.bind_dn,
+        SERVICE_PASSWORD,
+        size=size,
+        client_strategy=client_strategy
+    )
+    ldap_auth.set_pool(pool)
+    return pool
+
+
+def _ber_size(length):
+    # tag (1 bayt) + uzunluk baytları + içerik
+    if length < 128:
+        return 2 + length
+    return 2 + (length.bit_length() + 7) // 8 + length
+
+
+def response_wire_bytes(conn):
+    """
+    Son aramanın yanıtının BER kodlanmış boyutunu tahmin eder.
+    MOCK_SYNC soket kullanmadığından alınan bayt sayısı ldap3 tarafından ölçülmez.
+    """
+    total = 0
+    for response in conn.response or []:
+        if response.get("type") != "searchResEntry":
+            continue
+        attributes = 0
+        for name, values in response.get("raw_attributes", {}).items():
+            encoded_values = sum(_ber_size(len(v)) for v in values)
+            attributes += _ber_size(_ber_size(len(name)) + _ber_size(encoded_values))
+        entry = _ber_size(len(response["dn"].encode("utf-8"))) + _ber_size(attributes)
+        total += _ber_size(3 + _ber_size(entry))
+    # searchResDone mesajı
+    return total + 14
@@ -0,0 +1,85 @@
+# Benchmark'lar ve akış kontrolleri için moto tabanlı, süreç içi sahte S3 sunucusu
+#
+# moto proje bağımlılığı değildir; ayrıca kurulmalıdır:
+#   pip install "moto[server]"
+
+import logging
+import socket
+from contextlib import contextmanager
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+try:
+    from moto.server import ThreadedMotoServer
+except ImportError:
+    ThreadedMotoServer = None
+
+import s3_storage
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def mock_s3(bucket=s3_storage.S3_BUCKET_NAME):
+    """
+    Boş bir port üzerinde sahte S3 başlatır, bucket'ı oluşturur ve bu
+    sunucuya bağlı boto3 istemcisini verir. Çıkışta sunucu durdurulur.
+    """
+    if ThreadedMotoServer is None:
+        raise SystemExit('moto kurulu değil: pip install "moto[server]"')
+    # Her istek için yazılan erişim kayıtları çıktıyı boğmasın
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    port = _free_port()
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+    server.start()
+    try:
+        client = boto3.client(
+            "s3",
+            endpoint_url=f"http://127.0.0.1:{port}",
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+            region_name="us-east-1",
+            config=Config(retries={"max_attempts": 1, "mode": "standard"})
+        )
+        client.create_bucket(Bucket=bucket)
+        yield client
+    finally:
+        server.stop()
+
+
+@contextmanager
+def copy_limits(object_limit, part_bytes):
+    """Parçalı kopyayı küçük nesnelerle denemek için S3 kopya sınırlarını geçici olarak değiştirir"""
+    original = s3_storage.COPY_OBJECT_LIMIT, s3_storage.COPY_PART_BYTES
+    s3_storage.COPY_OBJECT_LIMIT, s3_storage.COPY_PART_BYTES = object_limit, part_bytes
+    try:
+        yield
+    finally:
+        s3_storage.COPY_OBJECT_LIMIT, s3_storage.COPY_PART_BYTES = original
+
+
+@contextmanager
+def failing_operation(client, operation, after=0, code="InternalError"):
+    """
+    İstemcinin verilen işlemini (ör. UploadPartCopy) ilk after çağrıdan sonra
+    sunucuya gitmeden code hatasıyla düşürür.
+    """
+    calls = []
+
+    def fail(**kwargs):
+        calls.append(operation)
+        if len(calls) > after:
+            raise ClientError({"Error": {"Code": code, "Message": f"{operation} düşürüldü"}}, operation)
+
+    event = f"before-call.s3.{operation}"
+    client.meta.events.register(event, fail)
+    try:
+        yield calls
+    finally:
+        client.meta.events.unregister(event, fail)
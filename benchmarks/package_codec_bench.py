@@ -0,0 +1,78 @@
+# Onay paketi sıkıştırma yöntemlerinin hız ve oran ölçümü
+#
+#   python -m benchmarks.package_codec_bench --csv-mb 200
+#   python -m benchmarks.package_codec_bench --codecs stored,deflate-1,deflate-6
+#
+# Üç temsili dosya paketlenir:
+#   csv    : Data Quality ölçümündeki metin ağırlıklı sentetik tablo
+#   xlsx   : aynı tablonun ilk satırlarından oluşturulan Excel dosyası
+#   binary : rastgele baytlar (pdf, görüntü gibi sıkıştırılmış içerik yerine)
+# Her yöntem için giriş verisine göre MB/sn ve paket boyutunun giriş boyutuna
+# oranı yazılır; "auto" satırı otomatik seçilen yöntemi ve deneme sıkıştırması
+# dahil süresini gösterir.
+
+import argparse
+import io
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+import approval_package
+from benchmarks.quality_parallel_bench import build_frame
+
+
+def build_files(csv_mb, xlsx_rows, binary_mb):
+    # Satır başına yaklaşık 78 bayt
+    df = build_frame(max(int(csv_mb * 1024 * 1024 / 78), 1000))
+    csv_data = df.to_csv(index=False, sep=";").encode("utf-8")
+    xlsx_buffer = io.BytesIO()
+    df.head(xlsx_rows).to_excel(xlsx_buffer, index=False)
+    binary_data = np.random.default_rng(0).bytes(int(binary_mb * 1024 * 1024))
+    return {
+        "veri.csv": csv_data,
+        "veri.xlsx": xlsx_buffer.getvalue(),
+        "belge.bin": binary_data,
+    }
+
+
+def measure(data, filename, codec, directory, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        package = approval_package.build_package(
+            io.BytesIO(data), filename, len(data), {}, f"bench_{codec}", directory=directory, codec=codec
+        )
+        timings.append(time.perf_counter() - started)
+        approval_package.discard_package(package.path)
+    return min(timings), package
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paket sıkıştırma yöntemleri ölçümü")
+    parser.add_argument("--csv-mb", type=float, default=100)
+    parser.add_argument("--xlsx-rows", type=int, default=50_000)
+    parser.add_argument("--binary-mb", type=float, default=50)
+    parser.add_argument("--codecs", help="virgülle yöntemler (varsayılan: hepsi)")
+    parser.add_argument("--repeat", type=int, default=2, help="her ölçümün tekrar sayısı (en iyisi alınır)")
+    args = parser.parse_args()
+
+    codecs = args.codecs.split(",") if args.codecs else list(approval_package.CODECS)
+    files = build_files(args.csv_mb, args.xlsx_rows, args.binary_mb)
+    directory = tempfile.mkdtemp(prefix="package_bench_")
+    try:
+        for filename, data in files.items():
+            size_mb = len(data) / (1024 * 1024)
+            print(f"\n{filename}: {size_mb:.1f} MB")
+            print(f"{'yöntem':<16} {'süre sn':>8} {'MB/sn':>8} {'oran':>7}")
+            for codec in codecs + [approval_package.CODEC_AUTO]:
+                seconds, package = measure(data, filename, codec, directory, args.repeat)
+                label = codec if codec != approval_package.CODEC_AUTO else f"auto→{package.codec}"
+                print(f"{label:<16} {seconds:>8.2f} {size_mb / seconds:>8.1f} {package.size / len(data):>7.1%}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Onay paketlerinde paralel deflate: ölçeklenme ölçümü
+#
+#   python -m benchmarks.package_parallel_bench --csv-mb 500
+#   python -m benchmarks.package_parallel_bench --csv-mb 1000 --threads 1,2,4,8 --codec deflate-1
+#
+# Sentetik bir CSV 1..N iş parçacığıyla paketlenir. 1 iş parçacığı zipfile'ın
+# kendi (seri) deflate yoludur; diğerleri blokları ParallelDeflate ile iş
+# parçacığı havuzunda sıkıştırır. Paketin zipfile ile açılıp (CRC kontrolü
+# dahil) içeriğin aynı olduğu ve sıkıştırma oranının korunduğu da kontrol
+# edilir.
+
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+import approval_package
+from benchmarks.package_codec_bench import build_files
+
+
+def measure(data, codec, threads, directory, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        package = approval_package.build_package(
+            io.BytesIO(data), "veri.csv", len(data), {}, f"bench_{threads}", directory=directory,
+            codec=codec, threads=threads
+        )
+        timings.append(time.perf_counter() - started)
+    with zipfile.ZipFile(package.path) as archive:
+        same = archive.read("veri.csv") == data
+    approval_package.discard_package(package.path)
+    return min(timings), package.size, same
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paralel deflate ölçeklenmesi")
+    parser.add_argument("--csv-mb", type=float, default=200)
+    parser.add_argument("--codec", default="deflate-6", choices=[c for c in approval_package.CODECS if c.startswith("deflate")])
+    parser.add_argument("--threads", help="virgülle iş parçacığı sayıları (varsayılan: 1..CPU sayısı)")
+    parser.add_argument("--repeat", type=int, default=2, help="her ölçümün tekrar sayısı (en iyisi alınır)")
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    if args.threads:
+        levels = [int(t) for t in args.threads.split(",")]
+    else:
+        levels = sorted({1, *(t for t in (2, 4, 8, 16) if t <= cpu_count), cpu_count})
+
+    data = build_files(args.csv_mb, 0, 0)["veri.csv"]
+    size_mb = len(data) / (1024 * 1024)
+    print(f"{size_mb:.1f} MB CSV, {args.codec}, blok {approval_package.PACKAGE_BLOCK_KB} KB, {cpu_count} CPU")
+    if max(levels) > cpu_count:
+        print("uyarı: CPU sayısından fazla iş parçacığı ölçülüyor; hızlanma beklenmez")
+
+    directory = tempfile.mkdtemp(prefix="package_bench_")
+    try:
+        print(f"{'iş parç.':>8} {'süre sn':>8} {'MB/sn':>8} {'oran':>7} {'hızlanma':>9}")
+        serial_seconds = None
+        for threads in levels:
+            seconds, package_size, same = measure(data, args.codec, threads, directory, args.repeat)
+            serial_seconds = serial_seconds or seconds
+            if not same:
+                print(f"HATA: {threads} iş parçacığıyla açılan içerik farklı")
+            print(f"{threads:>8} {seconds:>8.2f} {size_mb / seconds:>8.1f} {package_size / len(data):>7.1%} "
+                  f"{serial_seconds / seconds:>8.2f}x")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
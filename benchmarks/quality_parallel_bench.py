@@ -0,0 +1,96 @@
+# Data Quality kurallarının süreç havuzunda paralel çalıştırılması: ölçeklenme ölçümü
+#
+#   python -m benchmarks.quality_parallel_bench --rows 2000000
+#   python -m benchmarks.quality_parallel_bench --rows 5000000 --workers 1,2,4,8
+#
+# Metin ağırlıklı sentetik bir DataFrame üzerinde regex, tarih, e-posta, telefon
+# ve sayısal kurallar 1..N işçiyle çalıştırılır. 1 işçi mevcut seri yoldur;
+# diğerleri kolonları paylaşılan belleğe Arrow IPC olarak yazıp (kolon, satır
+# aralığı) işlerini süreç havuzuna dağıtır. Havuzun açılış maliyeti ölçüme
+# girmesin diye her işçi sayısı için önce bir ısınma turu yapılır. Sonuçların
+# seri yolla aynı olduğu da kontrol edilir.
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import data_quality
+
+WORDS = np.array(["müşteri", "hesap", "kredi", "kart", "şube", "işlem", "ödeme", "yatırım"])
+
+RULES = {
+    "eposta": {"rule": "E-mail Format Kontrolü"},
+    "telefon": {"rule": "Telefon Format Kontrolü"},
+    "tarih": {"rule": "Tarih Format Kontrolü", "params": {"date_format": "%d.%m.%Y"}},
+    "tutar": {"rule": "Sayısal Değer Kontrolü (Numeric)"},
+    "kod": {"rule": "Regex Pattern Kontrolü", "params": {"pattern": r"[A-Z]{2}-\d{4}-[a-zçğıöşü]+"}},
+    "aciklama": {"rule": "Maksimum Uzunluk Kontrolü", "params": {"max_length": 12}},
+}
+
+
+def build_frame(rows, seed=42):
+    """Kurallarda yaklaşık %10 ihlal üreten sentetik veri"""
+    rng = np.random.default_rng(seed)
+    bad = rng.random(rows) < 0.1
+    words = rng.choice(WORDS, rows)
+    numbers = rng.integers(0, 10000, rows).astype(str)
+    days = rng.integers(1, 29, rows).astype(str)
+    return pd.DataFrame({
+        "eposta": np.where(bad, "gecersiz", np.char.add(words, "@ornek.com.tr")),
+        "telefon": np.where(bad, "12345", np.char.add("0532 ", np.char.zfill(numbers, 7))),
+        "tarih": np.where(bad, "31.02.2024", np.char.add(np.char.zfill(days, 2), ".03.2024")),
+        "tutar": np.where(bad, "yok", np.char.add(numbers, ",50")),
+        "kod": np.where(bad, "xx", np.char.add(np.char.add("TR-", np.char.zfill(numbers, 4)), np.char.add("-", words))),
+        "aciklama": np.char.add(np.char.add(words, " "), rng.choice(WORDS, rows)),
+    }).astype("str")
+
+
+def measure(df, workers, repeat):
+    # Isınma: süreçlerin açılması ve modüllerin yüklenmesi ölçüme girmez
+    data_quality.evaluate_rules(df, RULES, workers=workers)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = data_quality.evaluate_rules(df, RULES, workers=workers)
+        timings.append(time.perf_counter() - started)
+    return min(timings), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paralel kural çalıştırma ölçeklenmesi")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", help="virgülle işçi sayıları (varsayılan: 1..CPU sayısı)")
+    parser.add_argument("--repeat", type=int, default=3, help="her ölçümün tekrar sayısı (en iyisi alınır)")
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    if args.workers:
+        levels = [int(w) for w in args.workers.split(",")]
+    else:
+        levels = sorted({1, *(w for w in (2, 4, 8, 16) if w <= cpu_count), cpu_count})
+
+    df = build_frame(args.rows)
+    # Küçük verilerde de paralel yol ölçülsün
+    data_quality.PARALLEL_MIN_ROWS = 0
+    print(f"{args.rows:,} satır, {len(RULES)} kural, {cpu_count} CPU")
+    if max(levels) > cpu_count:
+        print("uyarı: CPU sayısından fazla işçi ölçülüyor; hızlanma beklenmez")
+
+    print(f"{'işçi':>5} {'süre sn':>9} {'hızlanma':>9} {'verim':>7}")
+    serial_seconds = None
+    serial_results = None
+    for workers in levels:
+        seconds, results = measure(df, workers, args.repeat)
+        if serial_results is None:
+            serial_seconds, serial_results = seconds, results
+        elif {c: r.to_dict() for c, r in results.items()} != {c: r.to_dict() for c, r in serial_results.items()}:
+            print(f"HATA: {workers} işçinin sonuçları seri sonuçlardan farklı")
+        speedup = serial_seconds / seconds
+        print(f"{workers:>5} {seconds:>9.2f} {speedup:>8.2f}x {speedup / workers:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Paketlerin S3'e yüklenme ve onay süreleri
+#
+#   python -m benchmarks.s3_approval_bench --sizes-mb 10,100,500
+#   python -m benchmarks.s3_approval_bench --sizes-mb 1000 --chunk-mb 32 --concurrency 16
+#
+# S3_ENDPOINT_URL / S3_BUCKET_NAME ile yapılandırılmış (MinIO veya AWS) bucket
+# kullanılır. Her boyut için rastgele içerikli bir paket önce pending/ altına
+# ölçülür:
+#   tek istek : önceki davranış, tek put_object ile yükleme (5 GB sınırı, hata olursa baştan)
+#   parçalı   : upload_package, --chunk-mb parçalarla --concurrency eş zamanlı yükleme
+#   kopya     : approve_package, pending/ -> approved/ sunucu tarafı kopya + silme
+# Ölçüm nesneleri bench/ önekine yazılır ve sonunda silinir.
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+
+import s3_storage
+
+PREFIX = "bench/"
+
+
+def write_package(path, size_mb):
+    digest = hashlib.sha256()
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for _ in range(int(size_mb)):
+            f.write(block)
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="S3 onay süresi ölçümü")
+    parser.add_argument("--sizes-mb", default="10,100,500", help="virgülle paket boyutları (MB)")
+    parser.add_argument("--chunk-mb", type=int, default=s3_storage.S3_MULTIPART_CHUNK_MB)
+    parser.add_argument("--concurrency", type=int, default=s3_storage.S3_MAX_CONCURRENCY)
+    args = parser.parse_args()
+    config = s3_storage.transfer_config(chunk_mb=args.chunk_mb, concurrency=args.concurrency)
+
+    client = s3_storage.create_client()
+    s3_storage.ensure_bucket(client)
+    print(f"{s3_storage.S3_ENDPOINT_URL} / {s3_storage.S3_BUCKET_NAME}, "
+          f"parça {args.chunk_mb} MB, {args.concurrency} eş zamanlı")
+    print(f"{'boyut MB':>9} {'tek istek sn':>13} {'parçalı sn':>11} {'kopya sn':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size_mb in (float(s) for s in args.sizes_mb.split(",")):
+            path = os.path.join(directory, "paket.zip")
+            sha256 = write_package(path, size_mb)
+            pending = f"{PREFIX}pending/{size_mb:g}.zip"
+            approved = f"{PREFIX}approved/{size_mb:g}.zip"
+            try:
+                started = time.perf_counter()
+                with open(path, "rb") as package_file:
+                    client.put_object(Bucket=s3_storage.S3_BUCKET_NAME, Key=approved, Body=package_file)
+                single_seconds = time.perf_counter() - started
+
+                started = time.perf_counter()
+                ok, message = s3_storage.upload_package(path, pending, sha256, client=client, config=config)
+                multipart_seconds = time.perf_counter() - started
+                if not ok:
+                    raise SystemExit(message)
+
+                started = time.perf_counter()
+                ok, message = s3_storage.approve_package(pending, approved, sha256, client=client)
+                copy_seconds = time.perf_counter() - started
+                if not ok:
+                    raise SystemExit(message)
+                print(f"{size_mb:>9g} {single_seconds:>13.2f} {multipart_seconds:>11.2f} {copy_seconds:>9.2f}")
+            finally:
+                for key in (pending, approved):
+                    client.delete_object(Bucket=s3_storage.S3_BUCKET_NAME, Key=key)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# Onay akışının sahte S3 (moto) üzerinde uçtan uca kontrolü
+#
+#   pip install "moto[server]"
+#   python -m benchmarks.s3_flow_check
+#
+# Gönder (pending/ yükleme) -> onay (tek copy_object ve parçalı upload_part_copy)
+# -> red (tag ve delete) akışını, SHA-256 uyuşmazlığını ve parçalı kopyada bir
+# parça düştüğünde yarım yüklemenin iptal edildiğini dener. Her adım için
+# TAMAM/HATA satırı yazar; bir adım bile tutmazsa çıkış kodu 1'dir.
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import urllib.request
+
+import s3_storage
+from benchmarks.mock_s3 import copy_limits, failing_operation, mock_s3
+
+# S3'ün kabul ettiği en küçük parça boyutu (son parça hariç)
+MIN_PART_BYTES = 5 * 1024 * 1024
+
+
+def write_package(path, size_bytes):
+    data = os.urandom(size_bytes)
+    with open(path, "wb") as f:
+        f.write(data)
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def keys(client, prefix=""):
+    listing = client.list_objects_v2(Bucket=s3_storage.S3_BUCKET_NAME, Prefix=prefix)
+    return sorted(item["Key"] for item in listing.get("Contents", []))
+
+
+def read_object(client, key):
+    return client.get_object(Bucket=s3_storage.S3_BUCKET_NAME, Key=key)
+
+
+def run_checks(client, path, data, sha256):
+    """(adım, başarılı, ayrıntı) üçlülerini sırayla üretir"""
+    bucket = s3_storage.S3_BUCKET_NAME
+
+    # Gönder
+    source = s3_storage.pending_key("akis-1")
+    ok, message = s3_storage.upload_package(path, source, sha256, client=client)
+    stored = read_object(client, source)["Metadata"] if ok else {}
+    yield "gönder: pending/ yükleme", ok and stored.get(s3_storage.CHECKSUM_METADATA_KEY) == sha256, message
+
+    # Tek copy_object ile onay
+    target = s3_storage.approved_key("20260101_000000", "tek")
+    ok, message = s3_storage.approve_package(source, target, sha256, client=client)
+    copied = read_object(client, target)
+    yield "onay: tek kopya", (
+        ok and copied["Body"].read() == data and source not in keys(client)
+        and copied["Metadata"].get(s3_storage.CHECKSUM_METADATA_KEY) == sha256
+    ), message
+
+    # SHA-256 uyuşmazlığı: kopya yapılmaz, kaynak yerinde kalır
+    source = s3_storage.pending_key("akis-2")
+    s3_storage.upload_package(path, source, sha256, client=client)
+    target = s3_storage.approved_key("20260101_000001", "parcali")
+    ok, message = s3_storage.approve_package(source, target, "0" * 64, client=client)
+    yield "onay: SHA-256 uyuşmazlığı reddedilir", (
+        not ok and source in keys(client) and target not in keys(client)
+    ), message
+
+    with copy_limits(1, MIN_PART_BYTES):
+        # Parçalı kopyada ikinci parça düşer: yarım yükleme iptal edilir, kaynak kalır
+        with failing_operation(client, "UploadPartCopy", after=1) as calls:
+            ok, message = s3_storage.approve_package(source, target, sha256, client=client)
+        uploads = client.list_multipart_uploads(Bucket=bucket).get("Uploads", [])
+        yield "onay: parçalı kopya hatasında iptal", (
+            not ok and len(calls) == 2 and not uploads
+            and source in keys(client) and target not in keys(client)
+        ), message
+
+        # Parçalı kopya ile onay
+        ok, message = s3_storage.approve_package(source, target, sha256, client=client)
+        copied = read_object(client, target)
+        yield "onay: parçalı kopya", (
+            ok and copied["Body"].read() == data and source not in keys(client)
+            and copied["Metadata"].get(s3_storage.CHECKSUM_METADATA_KEY) == sha256
+        ), message
+
+    # Onaylı paketin süreli indirme bağlantısı
+    url = s3_storage.download_url(target, "Müşteri dosyası.csv", client=client)
+    with urllib.request.urlopen(url) as response:
+        yield "indirme: süreli bağlantı", (
+            response.read() == data and "filename*=UTF-8''" in response.headers["Content-Disposition"]
+        ), url.split("?")[0]
+
+    # Red: etiketleme
+    source = s3_storage.pending_key("akis-3")
+    s3_storage.upload_package(path, source, sha256, client=client)
+    ok, message = s3_storage.reject_package(source, client=client, action="tag")
+    tags = client.get_object_tagging(Bucket=bucket, Key=source)["TagSet"] if ok else []
+    yield "red: etiketleme", ok and {"Key": "status", "Value": "rejected"} in tags, message
+
+    # Red: silme
+    ok, message = s3_storage.reject_package(source, client=client, action="delete")
+    yield "red: silme", ok and source not in keys(client), message
+
+    # Olmayan paketin onayı hata mesajıyla döner
+    ok, message = s3_storage.approve_package(s3_storage.pending_key("yok"), "approved/yok.zip", client=client)
+    yield "onay: olmayan paket", not ok, message
+
+    yield "son durum: pending/ boş", not keys(client, s3_storage.PENDING_PREFIX), keys(client)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sahte S3 üzerinde onay akışı kontrolü")
+    parser.add_argument("--size-mb", type=float, default=12,
+                        help="paket boyutu (MB); parçalı kopya için 5'ten büyük olmalı")
+    args = parser.parse_args()
+    size = int(args.size_mb * 1024 * 1024)
+    if size <= MIN_PART_BYTES:
+        parser.error("--size-mb parçalı kopyada en az iki parça olacak kadar büyük olmalı")
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp, mock_s3() as client:
+        path = os.path.join(tmp, "paket.zip")
+        data, sha256 = write_package(path, size)
+        for step, ok, detail in run_checks(client, path, data, sha256):
+            failures += not ok
+            print(f"{'TAMAM' if ok else 'HATA ':<5}  {step:<40} {detail}")
+
+    print(f"{failures} adım başarısız" if failures else "Tüm adımlar başarılı")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,629 @@
+# Yüklenen dosyaların parça parça (chunk) okunması ve kolon profili çıkarılması
+#
+# Büyük dosyalar hiçbir zaman tamamen belleğe alınmaz; Metadata ve Data Quality
+# sekmelerinin ihtiyaç duyduğu bilgiler (önizleme, kolonlar, tipler, örnek
+# değerler) okuma sırasında adım adım toplanır.
+
+import codecs
+import csv
+import dataclasses
+import hashlib
+import io
+import os
+import zipfile
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Bir seferde okunan satır sayısı
+CHUNK_ROWS = int(os.getenv("DATA_CHUNK_ROWS", "100000"))
+# Bu boyutun (MB) altındaki dosyalar ayrıca tam DataFrame olarak da tutulur (.xlsx için açılmış boyut)
+INMEMORY_MAX_MB = float(os.getenv("DATA_INMEMORY_MAX_MB", "50"))
+# Excel dosyalarında profillenecek en fazla satır (0 = sınırsız)
+EXCEL_MAX_ROWS = int(os.getenv("DATA_EXCEL_MAX_ROWS", "0"))
+# CSV okuma motoru: pandas (varsayılan) veya pyarrow (çok iş parçacıklı, Arrow string tipleri)
+CSV_ENGINE = os.getenv("DATA_CSV_ENGINE", "pandas").strip().lower()
+CSV_ENGINES = ("pandas", "pyarrow")
+# pyarrow motorunda bir seferde okunan blok boyutu
+ARROW_BLOCK_BYTES = 4 * 1024 * 1024
+# Ayrıştırılmış dosya önbelleğinde (tüm oturumlar) tutulan en fazla dosya
+PARSE_CACHE_ENTRIES = int(os.getenv("DATA_PARSE_CACHE_ENTRIES", "8"))
+
+# İçerik özeti hesaplanırken bir seferde okunan bayt
+HASH_BLOCK_BYTES = 1024 * 1024
+
+PREVIEW_ROWS = 5
+SAMPLE_VALUES = 3
+# Kolon profilinde gösterilen en sık değer sayısı
+TOP_K = 5
+# Parçalar boyunca sayımı tutulan en fazla farklı değer (en sık değerler yaklaşıktır)
+TOP_K_TRACKED = 1000
+# HyperLogLog yazmaç sayısı 2^HLL_PRECISION (12 -> 4 KB, ~%1,6 standart hata)
+HLL_PRECISION = 12
+
+# Kodlama/ayırıcı tespiti için dosyanın farklı yerlerinden okunan bloklar
+SNIFF_BLOCKS = 4
+SNIFF_BLOCK_BYTES = 64 * 1024
+SEPARATOR_CANDIDATES = (";", ",", "\t", "|")
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# cp1254'te tanımsız baytlar (bunlar varsa veri cp1254 olamaz)
+_CP1254_UNDEFINED = (0x81, 0x8D, 0x8E, 0x8F, 0x90, 0x9D, 0x9E)
+# cp1254'te Ğ İ Ş ğ ı ş, latin-1'de Ð Ý Þ ð ý þ
+_CP1254_TURKISH = (0xD0, 0xDD, 0xDE, 0xF0, 0xFD, 0xFE)
+
+
+def _format_value(value):
+    if isinstance(value, (float, np.floating)):
+        return f"{value:,.6g}"
+    if isinstance(value, pd.Timestamp) and value == value.normalize():
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+def _bit_length(values):
+    """uint64 dizisindeki her değerin bit uzunluğu (float64'e 32 bitlik yarılar halinde tam sığar)"""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """
+    Farklı değer sayısı tahmini. Bellek kullanımı değer sayısından bağımsızdır
+    (2^precision bayt); parçalar halinde beslenebilir.
+    """
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values):
+        """values: NumPy dizisi (hash'lenebilir değerler)"""
+        if not len(values):
+            return
+        hashes = pd.util.hash_array(values)
+        rest_bits = 64 - self.precision
+        index = (hashes >> np.uint64(rest_bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        rank = (rest_bits - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Küçük kümelerde doğrusal sayım daha isabetlidir
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+
+@dataclass
+class ColumnProfile:
+    """
+    Tek bir kolonun okuma sırasında biriktirilen özeti. Metadata ve Data Quality
+    sekmeleri DataFrame'e dokunmadan bu özetten çizilir.
+    """
+    name: str
+    dtype: Optional[str] = None
+    null_count: int = 0
+    samples: List[object] = field(default_factory=list)
+    distinct: HyperLogLog = field(default_factory=HyperLogLog)
+    # Sayısal ve tarih kolonlarında
+    min_value: object = None
+    max_value: object = None
+    # Metin kolonlarında karakter uzunlukları
+    min_length: Optional[int] = None
+    max_length: Optional[int] = None
+    length_total: int = 0
+    text_count: int = 0
+    top_counts: Counter = field(default_factory=Counter)
+
+    def update(self, series):
+        non_null = series.dropna()
+        self.null_count += len(series) - len(non_null)
+        # Tamamen boş parçanın tipi (float64) asıl tipi bozmasın
+        if len(non_null) or self.dtype is None:
+            self.dtype = _merge_dtype(self.dtype, series.dtype, has_values=len(non_null) > 0)
+        if not len(non_null):
+            return
+        if len(self.samples) < SAMPLE_VALUES:
+            self.samples.extend(non_null.head(SAMPLE_VALUES - len(self.samples)).tolist())
+
+        dtype = non_null.dtype
+        if (pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)) \
+                or pd.api.types.is_datetime64_any_dtype(dtype):
+            low, high = non_null.min(), non_null.max()
+            self.min_value = low if self.min_value is None else min(self.min_value, low)
+            self.max_value = high if self.max_value is None else max(self.max_value, high)
+        else:
+            lengths = non_null.astype(str).str.len()
+            low, high = int(lengths.min()), int(lengths.max())
+            self.min_length = low if self.min_length is None else min(self.min_length, low)
+            self.max_length = high if self.max_length is None else max(self.max_length, high)
+            self.length_total += int(lengths.sum())
+            self.text_count += len(lengths)
+
+        # HyperLogLog'a sadece parçadaki farklı değerler verilir
+        counts = non_null.value_counts()
+        self.distinct.add(counts.index.to_numpy())
+        counts = counts.head(TOP_K_TRACKED)
+        self.top_counts.update(dict(zip(counts.index.tolist(), counts.tolist())))
+        if len(self.top_counts) > 2 * TOP_K_TRACKED:
+            self.top_counts = Counter(dict(self.top_counts.most_common(TOP_K_TRACKED)))
+
+    @property
+    def distinct_estimate(self):
+        return self.distinct.estimate()
+
+    @property
+    def mean_length(self):
+        return self.length_total / self.text_count if self.text_count else None
+
+    @property
+    def top_values(self):
+        """[(değer, adet)] en sıktan başlayarak TOP_K adet"""
+        return self.top_counts.most_common(TOP_K)
+
+    def summary(self):
+        """Sekmelerde gösterilen kısa özet parçaları"""
+        parts = [f"Boş: {self.null_count:,}", f"Farklı ≈ {self.distinct_estimate:,}"]
+        if self.min_value is not None:
+            parts.append(f"Min: {_format_value(self.min_value)} · Max: {_format_value(self.max_value)}")
+        if self.min_length is not None:
+            parts.append(f"Uzunluk: {self.min_length}–{self.max_length} (ort. {self.mean_length:.1f})")
+        return parts
+
+
+@dataclass
+class FileProfile:
+    """
+    Yüklenen tablo dosyasının özeti. dataframe sadece küçük dosyalarda doludur.
+    """
+    name: str
+    size: int
+    kind: str
+    encoding: Optional[str] = None
+    separator: Optional[str] = None
+    engine: Optional[str] = None
+    row_count: int = 0
+    preview: Optional[pd.DataFrame] = None
+    columns: Dict[str, ColumnProfile] = field(default_factory=dict)
+    dataframe: Optional[pd.DataFrame] = None
+    # Satır sınırı nedeniyle dosyanın sadece başı okunduysa True
+    truncated: bool = False
+
+    @property
+    def column_names(self):
+        return list(self.columns)
+
+
+def _merge_dtype(current, dtype, has_values):
+    """Parçalar arasında farklı çıkan tipleri birleştirir"""
+    if current is None or current == "empty":
+        return str(dtype) if has_values else "empty"
+    if current == str(dtype):
+        return current
+    try:
+        if pd.api.types.is_numeric_dtype(np.dtype(current)) and pd.api.types.is_numeric_dtype(dtype) \
+                and not pd.api.types.is_bool_dtype(dtype) and current != "bool":
+            return str(np.promote_types(np.dtype(current), dtype))
+    except TypeError:
+        pass
+    return "object"
+
+
+@dataclass(frozen=True)
+class SniffResult:
+    """Tek okumada belirlenen CSV kodlaması ve ayırıcısı"""
+    encoding: str
+    separator: str
+
+
+def _sample_blocks(file, size):
+    """Dosyanın başından, ortasından ve sonundan SNIFF_BLOCKS adet blok okur"""
+    file.seek(0)
+    if size <= SNIFF_BLOCK_BYTES * SNIFF_BLOCKS:
+        return [file.read()]
+    blocks = []
+    step = (size - SNIFF_BLOCK_BYTES) // (SNIFF_BLOCKS - 1)
+    for i in range(SNIFF_BLOCKS):
+        file.seek(i * step)
+        blocks.append(file.read(SNIFF_BLOCK_BYTES))
+    file.seek(0)
+    return blocks
+
+
+def _is_utf8(block, first):
+    """Blok UTF-8 mi; blok sınırında bölünmüş çok baytlı karakterler hata sayılmaz"""
+    if not first:
+        # Ortadan başlayan blokta yarım kalmış karakterin devam baytlarını atla
+        start = 0
+        while start < min(3, len(block)) and 0x80 <= block[start] <= 0xBF:
+            start += 1
+        block = block[start:]
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(block, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _single_byte_encoding(data):
+    """
+    UTF-8 olmayan veri için cp1254 (Türkçe) veya latin-1 seçer.
+    İki kodlama sadece 0x80-0x9F ve Ğ/İ/Ş/ğ/ı/ş baytlarında ayrışır.
+    """
+    counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    if counts[list(_CP1254_UNDEFINED)].any():
+        return "latin-1"
+    if counts[list(_CP1254_TURKISH)].any() or counts[0x80:0xA0].any():
+        return "cp1254"
+    return "latin-1"
+
+
+def detect_encoding(blocks):
+    """BOM, örnek blokların UTF-8 geçerliliği ve Türkçe karakter baytlarıyla kodlamayı belirler"""
+    head = blocks[0]
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    if all(_is_utf8(block, i == 0) for i, block in enumerate(blocks)):
+        return "utf-8"
+    return _single_byte_encoding(b"".join(blocks))
+
+
+def _sample_lines(blocks, encoding):
+    """Bloklardan tam satırları çıkarır (ortadaki blokların yarım ilk/son satırları atılır)"""
+    lines = []
+    for i, block in enumerate(blocks):
+        text = block.decode(encoding, errors="replace").splitlines()
+        if i > 0:
+            text = text[1:]
+        if len(blocks) > 1 and text:
+            text = text[:-1]
+        lines.extend(line for line in text if line.strip())
+    return lines
+
+
+def detect_separator(lines):
+    """
+    Aday ayırıcılar arasından örnek satırlarda alan sayısı en tutarlı (ve başlıkla
+    aynı) olanı seçer. Hiçbiri birden fazla alan vermezse virgül döner.
+    """
+    best, best_score = ",", None
+    for separator in SEPARATOR_CANDIDATES:
+        counts = [len(row) for row in csv.reader(lines, delimiter=separator)]
+        if not counts:
+            continue
+        mode = Counter(counts).most_common(1)[0][0]
+        if mode < 2:
+            continue
+        consistency = counts.count(mode) / len(counts)
+        score = (consistency, counts[0] == mode, mode)
+        if best_score is None or score > best_score:
+            best, best_score = separator, score
+    return best
+
+
+def sniff_csv(file, size):
+    """Dosyayı birkaç blok halinde bir kez örnekleyip kodlama ve ayırıcıyı döndürür"""
+    blocks = _sample_blocks(file, size)
+    encoding = detect_encoding(blocks)
+    if encoding == "utf-16":
+        # Ortadaki bloklar karakter sınırında başlamayabilir
+        blocks = blocks[:1]
+    separator = detect_separator(_sample_lines(blocks, encoding))
+    return SniffResult(encoding=encoding, separator=separator)
+
+
+def content_hash(file):
+    """
+    Dosya içeriğinin SHA-256 özeti (hex). Dosya bloklar halinde okunur ve
+    okuma konumu başa alınır. Aynı içerik, adı farklı olsa da aynı özeti verir.
+    """
+    digest = hashlib.sha256()
+    file.seek(0)
+    for block in iter(lambda: file.read(HASH_BLOCK_BYTES), b""):
+        digest.update(block)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def keep_in_memory(size):
+    """Dosya tam DataFrame olarak saklanacak kadar küçük mü"""
+    return size <= INMEMORY_MAX_MB * 1024 * 1024
+
+
+def xlsx_data_size(file, size):
+    """
+    .xlsx sıkıştırılmış bir ZIP'tir; birkaç MB'lık dosya açıldığında 10-20 kat
+    büyüyebilir. Bellek sınırı için sayfa XML'leri ve paylaşılan metinlerin
+    açılmış boyutları toplamı kullanılır (okunamazsa dosya boyutu).
+    """
+    file.seek(0)
+    try:
+        with zipfile.ZipFile(file) as archive:
+            expanded = sum(
+                info.file_size for info in archive.infolist()
+                if info.filename.startswith("xl/worksheets/") or info.filename == "xl/sharedStrings.xml"
+            )
+    except (zipfile.BadZipFile, OSError):
+        expanded = 0
+    file.seek(0)
+    return max(size, expanded)
+
+
+def pyarrow_available():
+    try:
+        import pyarrow.csv  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_engine(engine=None):
+    """İstenen motoru döndürür; pyarrow kurulu değilse pandas'a düşer"""
+    engine = engine or CSV_ENGINE
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Geçersiz DATA_CSV_ENGINE: {engine} (seçenekler: {', '.join(CSV_ENGINES)})")
+    if engine == "pyarrow" and not pyarrow_available():
+        return "pandas"
+    return engine
+
+
+def _read_header(file, separator, encoding):
+    file.seek(0)
+    text = file.read(SNIFF_BLOCK_BYTES).decode(encoding, errors="replace").lstrip("\ufeff")
+    file.seek(0)
+    return next(csv.reader(io.StringIO(text), delimiter=separator), [])
+
+
+def _iter_arrow_chunks(file, separator, encoding, whole_file):
+    """
+    pyarrow.csv ile okur. whole_file True ise dosya tüm çekirdeklerle tek seferde,
+    değilse ARROW_BLOCK_BYTES'lık bloklar halinde akış olarak okunur.
+    """
+    import pyarrow.csv as pacsv
+
+    read_options = pacsv.ReadOptions(
+        use_threads=True,
+        block_size=ARROW_BLOCK_BYTES,
+        # Kolon adları pandas ile aynı olsun (boş ve tekrar eden adlar)
+        column_names=_column_names(_read_header(file, separator, encoding)),
+        skip_rows=1,
+        encoding="utf8" if encoding in ("utf-8", "utf-8-sig") else encoding
+    )
+    parse_options = pacsv.ParseOptions(delimiter=separator)
+    # pandas gibi boş metin hücreleri de boş değer sayılır
+    convert_options = pacsv.ConvertOptions(strings_can_be_null=True)
+    file.seek(0)
+    if whole_file:
+        table = pacsv.read_csv(file, read_options, parse_options, convert_options)
+        yield table.to_pandas(types_mapper=pd.ArrowDtype)
+        return
+    with pacsv.open_csv(file, read_options, parse_options, convert_options) as reader:
+        for batch in reader:
+            yield batch.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def iter_csv_chunks(file, separator, encoding, chunk_rows=None, engine=None, whole_file=False):
+    """
+    CSV dosyasını baştan itibaren DataFrame parçaları olarak okur.
+    pandas motorunda parçalar chunk_rows satırlık, pyarrow motorunda blok boyutludur.
+    """
+    if resolve_engine(engine) == "pyarrow":
+        return _iter_arrow_chunks(file, separator, encoding, whole_file)
+    file.seek(0)
+    return pd.read_csv(file, sep=separator, encoding=encoding, chunksize=chunk_rows or CHUNK_ROWS)
+
+
+def profile_chunks(chunks, profile, keep_dataframe=False):
+    """
+    DataFrame parçalarını sırayla işleyerek profile'ı doldurur.
+    keep_dataframe True ise parçalar birleştirilip profile.dataframe'e yazılır.
+    """
+    kept = []
+    for chunk in chunks:
+        if profile.preview is None:
+            profile.preview = chunk.head(PREVIEW_ROWS)
+            profile.columns = {str(column): ColumnProfile(str(column)) for column in chunk.columns}
+        for column, column_profile in zip(chunk.columns, profile.columns.values()):
+            column_profile.update(chunk[column])
+        profile.row_count += len(chunk)
+        if keep_dataframe:
+            kept.append(chunk)
+
+    if profile.preview is None:
+        raise pd.errors.EmptyDataError("Dosyada okunacak veri yok")
+    for column_profile in profile.columns.values():
+        if column_profile.dtype == "empty":
+            column_profile.dtype = str(profile.preview[column_profile.name].dtype)
+    if keep_dataframe:
+        profile.dataframe = pd.concat(kept, ignore_index=True) if len(kept) > 1 else kept[0]
+    return profile
+
+
+def profile_csv(file, name, size, sniff=None, engine=None):
+    """
+    CSV dosyasını tek geçişte parça parça okuyup FileProfile döndürür.
+    Kodlama ve ayırıcı önce örnek bloklardan belirlenir; örneklerde görünmeyen
+    UTF-8 dışı bir bayta rastlanırsa hatalı bölgeye göre tek baytlı kodlamayla
+    yeniden okunur. pyarrow motorunda ilk bloktan çıkarılan kolon tipleri sonraki
+    bloklara uymazsa dosya pandas motoruyla okunur.
+    """
+    engine = resolve_engine(engine)
+    sniff = sniff or sniff_csv(file, size)
+    profile = FileProfile(name=name, size=size, kind="csv", encoding=sniff.encoding,
+                          separator=sniff.separator, engine=engine)
+    in_memory = keep_in_memory(size)
+    try:
+        chunks = iter_csv_chunks(file, sniff.separator, sniff.encoding, engine=engine, whole_file=in_memory)
+        return profile_chunks(chunks, profile, in_memory)
+    except UnicodeDecodeError as e:
+        if sniff.encoding not in ("utf-8", "utf-8-sig"):
+            raise
+        fallback = SniffResult(encoding=_single_byte_encoding(e.object), separator=sniff.separator)
+        return profile_csv(file, name, size, fallback, engine)
+    except ValueError:
+        # pyarrow.ArrowInvalid de ValueError'dır
+        if engine != "pyarrow":
+            raise
+        return profile_csv(file, name, size, sniff, "pandas")
+
+
+def _column_names(row):
+    """Başlık satırını pandas ile aynı şekilde adlandırır (boş -> Unnamed: i, tekrar -> ad.1)"""
+    names = []
+    seen = {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None or value == "" else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def iter_excel_chunks(file, chunk_rows=None, max_rows=None):
+    """
+    .xlsx dosyasının aktif sayfasını openpyxl read_only modunda satır satır okuyup
+    chunk_rows satırlık DataFrame parçaları olarak döndürür. Sayfa hiçbir zaman
+    tamamen belleğe alınmaz. max_rows verilirse o kadar veri satırından sonra durur.
+    Tamamen boş satırlar atlanır.
+    """
+    from openpyxl import load_workbook
+
+    chunk_rows = chunk_rows or CHUNK_ROWS
+    if max_rows is not None:
+        chunk_rows = min(chunk_rows, max_rows)
+    file.seek(0)
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        # Bazı araçların yazdığı hatalı boyut bilgisi satırların kesilmesine yol açmasın
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        # Sondaki boş başlık hücreleri kolon sayılmaz
+        width = len(header)
+        while width and header[width - 1] is None:
+            width -= 1
+        columns = _column_names(header[:width])
+
+        buffer = []
+        read = 0
+        for row in rows:
+            if max_rows is not None and read >= max_rows:
+                break
+            if all(value is None for value in row):
+                continue
+            row = row[:width]
+            if len(row) < width:
+                row = row + (None,) * (width - len(row))
+            buffer.append(row)
+            read += 1
+            if len(buffer) >= chunk_rows:
+                yield pd.DataFrame.from_records(buffer, columns=columns)
+                buffer = []
+        if buffer or not read:
+            yield pd.DataFrame.from_records(buffer, columns=columns)
+    finally:
+        workbook.close()
+
+
+def profile_excel(file, name, size, max_rows=None):
+    """
+    .xlsx dosyasını read_only modunda parça parça okuyup FileProfile döndürür.
+    max_rows (varsayılan DATA_EXCEL_MAX_ROWS) verilirse sadece ilk max_rows satır profillenir.
+    """
+    if max_rows is None:
+        max_rows = EXCEL_MAX_ROWS or None
+    profile = FileProfile(name=name, size=size, kind="excel")
+    in_memory = keep_in_memory(xlsx_data_size(file, size))
+    profile_chunks(iter_excel_chunks(file, max_rows=max_rows), profile, in_memory)
+    profile.truncated = max_rows is not None and profile.row_count >= max_rows
+    return profile
+
+
+def iter_file_chunks(file, profile, chunk_rows=None):
+    """
+    Profili çıkarılmış dosyayı aynı okuma ayarlarıyla (kodlama, ayırıcı, motor)
+    yeniden parça parça okur. Akışlı kalite kontrolü bu parçaları kullanır.
+    """
+    if profile.kind == "csv":
+        return iter_csv_chunks(file, profile.separator, profile.encoding, chunk_rows, engine=profile.engine)
+    if profile.kind == "excel" and profile.name.endswith(".xlsx"):
+        # Satır sınırıyla profillenen dosyada aynı satırlar kontrol edilir
+        max_rows = profile.row_count if profile.truncated else None
+        return iter_excel_chunks(file, chunk_rows, max_rows=max_rows)
+    raise ValueError(f"{profile.name} parça parça okunamıyor")
+
+
+def profile_dataframe(df, name, size, kind):
+    """
+    Belleğe okunmuş bir DataFrame için FileProfile oluşturur. Saklama kararı
+    dosya boyutuyla değil DataFrame'in bellekteki boyutuyla verilir.
+    """
+    profile = FileProfile(name=name, size=size, kind=kind)
+    in_memory = keep_in_memory(max(size, int(df.memory_usage(index=True, deep=True).sum())))
+    return profile_chunks([df], profile, keep_dataframe=in_memory)
+
+
+def parse_options():
+    """Ayrıştırma sonucunu etkileyen ayarlar; önbellek anahtarının parçasıdır"""
+    return (resolve_engine(), CHUNK_ROWS, INMEMORY_MAX_MB, EXCEL_MAX_ROWS)
+
+
+def upload_kind(name):
+    """Tablo olarak ayrıştırılabilen dosyalar için csv / xlsx / xls, diğerleri için None"""
+    for extension in ("csv", "xlsx", "xls"):
+        if name.endswith("." + extension):
+            return extension
+    return None
+
+
+@st.cache_data(max_entries=PARSE_CACHE_ENTRIES, show_spinner=False)
+def _cached_profile(file_hash, kind, options, _file, size):
+    # Sadece file_hash, kind ve options anahtara girer (_file hash'lenmez)
+    _file.seek(0)
+    if kind == "csv":
+        # CSV parça parça okunur; tamamı sadece küçük dosyalarda bellekte tutulur
+        return profile_csv(_file, "", size)
+    if kind == "xlsx":
+        # Excel read_only modunda satır satır okunur; sayfa tamamen belleğe alınmaz
+        return profile_excel(_file, "", size)
+    return profile_dataframe(pd.read_excel(_file), "", size, "excel")
+
+
+def profile_upload(file, name, size, file_hash=None):
+    """
+    Yüklenen tablo dosyasının FileProfile'ını döndürür. Sonuç dosya içeriğinin
+    SHA-256 özeti ve ayrıştırma ayarlarıyla önbelleğe alınır; aynı içerik başka
+    bir oturumda veya başka bir adla yüklense de yeniden ayrıştırılmaz.
+    """
+    kind = upload_kind(name)
+    if kind is None:
+        raise ValueError(f"Desteklenmeyen dosya tipi: {name}")
+    if file_hash is None:
+        file_hash = content_hash(file)
+    profile = _cached_profile(file_hash, kind, parse_options(), file, size)
+    file.seek(0)
+    return dataclasses.replace(profile, name=name)
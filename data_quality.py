@@ -0,0 +1,823 @@
+# Data Quality kurallarının kolon bazında, vektörel (pandas/NumPy) çalıştırılması
+#
+# Kurallar Data Quality sekmesinde st.session_state.quality_rules içine
+# {kolon: {'rule': kural adı, 'params': {...}}} biçiminde kaydedilir.
+# Her kural, kolonun boş olmayan değerleri üzerinde ihlal maskesi üretir.
+
+import concurrent.futures
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+NO_RULE = "Kural Seçiniz"
+
+EMAIL_PATTERN = r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9\-]+(?:\.[A-Za-z0-9\-]+)*\.[A-Za-z]{2,}"
+# (+90 / 90 / 0) + 10 hane; rakamlar arasında boşluk, tire, nokta ve parantez olabilir
+_PHONE_SEPARATOR = r"[\s\-().]*"
+PHONE_PATTERN = (rf"\+?{_PHONE_SEPARATOR}(?:9{_PHONE_SEPARATOR}0{_PHONE_SEPARATOR}|0{_PHONE_SEPARATOR})?"
+                 rf"[2-58](?:{_PHONE_SEPARATOR}\d){{9}}{_PHONE_SEPARATOR}")
+DEFAULT_DATE_FORMAT = "%d.%m.%Y"
+NUMBER_PATTERN = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+
+# Her kolon için saklanan örnek ihlal sayısı
+SAMPLE_VIOLATIONS = 5
+# Akışlı benzersizlik kontrolünde diske yazılan hash bölümü sayısı
+DUPLICATE_BUCKETS = 64
+# Kuralları çalıştıran süreç sayısı. Varsayılan 1 (seri): ölçümlerde süreç havuzu
+# hızlanma sağlamadı; sunucuda benchmarks.quality_parallel_bench ile doğrulanırsa açılır
+QUALITY_WORKERS = int(os.getenv("DATA_QUALITY_WORKERS", "1"))
+# Bu satır sayısının altında süreçlere dağıtmanın maliyeti kazançtan büyüktür
+PARALLEL_MIN_ROWS = 200_000
+# Kural sonuçları önbelleğinin üst sınırı (MB)
+RESULT_CACHE_MB = float(os.getenv("DATA_QUALITY_CACHE_MB", "64"))
+
+
+@dataclass
+class RuleResult:
+    """Bir kolonda çalıştırılan kuralın sonucu"""
+    column: str
+    rule: str
+    checked: int = 0
+    violations: int = 0
+    # (1'den başlayan veri satırı numarası, değer) çiftleri
+    samples: List[Tuple[int, object]] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def violation_rate(self):
+        return self.violations / self.checked if self.checked else 0.0
+
+    def to_dict(self):
+        return {
+            "rule": self.rule,
+            "checked": self.checked,
+            "violations": self.violations,
+            "samples": [[row, str(value)] for row, value in self.samples],
+            "error": self.error,
+        }
+
+
+def _as_text(values):
+    """
+    Değerleri metin tipine çevirir. pyarrow varsa Arrow string tipi kullanılır;
+    str.len / str.fullmatch Arrow compute ile çok daha hızlı çalışır.
+    """
+    if pd.api.types.is_string_dtype(values.dtype) and values.dtype != object:
+        return values
+    try:
+        return values.astype("string[pyarrow]")
+    except (ImportError, TypeError, ValueError):
+        return values.astype(str)
+
+
+def _value_text(values):
+    """
+    Değerlerin kullanıcının dosyada gördüğü metin hâli. Boş hücre içeren tam
+    sayı kolonları float64 okunur; tam sayı değerli float'lar "12.0" yerine
+    "12" olarak yazılır ki uzunluk, desen ve izin verilen değer kontrolleri
+    dosyadaki değerle karşılaştırılsın.
+    """
+    if not pd.api.types.is_float_dtype(values.dtype):
+        return _as_text(values)
+    numbers = values.to_numpy(dtype="float64", na_value=np.nan)
+    # 2**53 üstünde float tam sayıyı kesin temsil etmez
+    integral = np.isfinite(numbers) & (np.mod(numbers, 1) == 0) & (np.abs(numbers) < 2 ** 53)
+    if not integral.any():
+        return _as_text(values)
+    text = values.astype(str).to_numpy(dtype=object)
+    text[integral] = numbers[integral].astype("int64").astype(str)
+    return _as_text(pd.Series(text, index=values.index))
+
+
+def _fullmatch(values, pattern):
+    """Önceden derlenmiş desene tam uymayan değerler için True maskesi"""
+    text = _value_text(values)
+    try:
+        matched = text.str.fullmatch(pattern.pattern)
+    except Exception:
+        # Arrow'un RE2 motoru desteklemediği desenler (lookaround vb.) Python re ile çalışır
+        matched = text.astype(str).astype(object).str.fullmatch(pattern)
+    return ~matched.fillna(False).astype(bool)
+
+
+def _to_numeric(values):
+    """
+    Değerleri sayıya çevirir (çevrilemeyenler NaN). Metinler önce vektörel bir
+    desenle süzülür; pd.to_numeric'in satır satır hata yakalaması büyük ve
+    çoğunlukla sayısal olmayan kolonlarda çok yavaştır.
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        return values.astype("float64")
+    # Türkçe ondalık ayırıcı: 12,5
+    text = _as_text(values).str.strip().str.replace(",", ".", regex=False)
+    is_number = text.str.fullmatch(NUMBER_PATTERN).fillna(False).astype(bool)
+    numbers = pd.Series(float("nan"), index=values.index)
+    if is_number.any():
+        candidates = text[is_number]
+        try:
+            # Arrow string -> float64 dönüşümü vektöreldir
+            converted = candidates.astype("float64")
+        except (TypeError, ValueError):
+            converted = pd.to_numeric(candidates.astype(str), errors="coerce")
+        numbers[is_number] = converted.to_numpy(dtype="float64")
+    return numbers
+
+
+def _compile(pattern, rule):
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"{rule}: geçersiz regex ({e})")
+
+
+def check_numeric(values, params):
+    return _to_numeric(values).isna()
+
+
+def check_email(values, params):
+    return _fullmatch(values, _EMAIL_REGEX)
+
+
+def check_phone(values, params):
+    return _fullmatch(values, _PHONE_REGEX)
+
+
+def check_date(values, params):
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return pd.Series(False, index=values.index)
+    date_format = params.get("date_format") or DEFAULT_DATE_FORMAT
+    return pd.to_datetime(_as_text(values), format=date_format, errors="coerce").isna()
+
+
+def check_min_length(values, params):
+    return _value_text(values).str.len() < int(params.get("min_length", 1))
+
+
+def check_max_length(values, params):
+    return _value_text(values).str.len() > int(params.get("max_length", 100))
+
+
+def check_regex(values, params):
+    pattern = params.get("pattern") or ""
+    if not pattern:
+        raise ValueError("Regex Pattern Kontrolü: desen girilmemiş")
+    return _fullmatch(values, _compile(pattern, "Regex Pattern Kontrolü"))
+
+
+def check_range(values, params):
+    numbers = _to_numeric(values)
+    min_value = params.get("min_value", float("-inf"))
+    max_value = params.get("max_value", float("inf"))
+    # Sayıya çevrilemeyen değerler de aralık dışı sayılır
+    return ~numbers.between(min_value, max_value).fillna(False).astype(bool)
+
+
+def check_allowed_values(values, params):
+    allowed = set(params.get("allowed_values") or [])
+    return ~_value_text(values).isin(allowed).fillna(False).astype(bool)
+
+
+_EMAIL_REGEX = re.compile(EMAIL_PATTERN)
+_PHONE_REGEX = re.compile(PHONE_PATTERN)
+
+# Kural adı -> boş olmayan değerler üzerinde ihlal maskesi üreten fonksiyon.
+# Boş değer ve benzersizlik kontrolleri tüm kolona bakar (evaluate_rule içinde).
+RULE_CHECKS = {
+    "Boş Değer Kontrolü (Not Null)": None,
+    "Benzersiz Değer Kontrolü (Unique)": None,
+    "Sayısal Değer Kontrolü (Numeric)": check_numeric,
+    "E-mail Format Kontrolü": check_email,
+    "Telefon Format Kontrolü": check_phone,
+    "Tarih Format Kontrolü": check_date,
+    "Minimum Uzunluk Kontrolü": check_min_length,
+    "Maksimum Uzunluk Kontrolü": check_max_length,
+    "Regex Pattern Kontrolü": check_regex,
+    "Değer Aralığı Kontrolü (Min-Max)": check_range,
+    "İzin Verilen Değerler Listesi": check_allowed_values,
+}
+RULE_NAMES = list(RULE_CHECKS)
+
+
+def _int_param(value, minimum):
+    if isinstance(value, bool):
+        raise ValueError
+    number = float(value)
+    if not number.is_integer() or number < minimum:
+        raise ValueError
+    return int(number)
+
+
+def _float_param(value):
+    if isinstance(value, bool) or value is None:
+        raise ValueError
+    number = float(value)
+    if number != number:
+        raise ValueError
+    return number
+
+
+def _text_param(value):
+    if not isinstance(value, str):
+        raise ValueError
+    return value
+
+
+def _pattern_param(value):
+    re.compile(_text_param(value))
+    return value
+
+
+def _values_param(value):
+    # Dosyadan gelen "a, b, c" metni düzenleyicideki gibi virgülle bölünür
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, (list, tuple)) or any(isinstance(v, (dict, list)) for v in value):
+        raise ValueError
+    return [str(v).strip() for v in value if v is not None and str(v).strip()]
+
+
+# Kural adı -> {parametre: dönüştürücü}; dönüştürücü geçersiz değerde ValueError verir
+RULE_PARAMS = {
+    "Tarih Format Kontrolü": {"date_format": _text_param},
+    "Minimum Uzunluk Kontrolü": {"min_length": lambda v: _int_param(v, 0)},
+    "Maksimum Uzunluk Kontrolü": {"max_length": lambda v: _int_param(v, 1)},
+    "Regex Pattern Kontrolü": {"pattern": _pattern_param},
+    "Değer Aralığı Kontrolü (Min-Max)": {"min_value": _float_param, "max_value": _float_param},
+    "İzin Verilen Değerler Listesi": {"allowed_values": _values_param},
+}
+
+
+def validate_params(rule, params):
+    """
+    Dosyadan veya depodan gelen parametreleri kuralın beklediği tiplere
+    dönüştürür; bilinmeyen anahtarlar atılır. Geçersiz değerde ValueError.
+    """
+    if rule not in RULE_CHECKS:
+        raise ValueError(f"Bilinmeyen kural: {rule}")
+    if not isinstance(params, dict):
+        raise ValueError(f"{rule}: parametreler sözlük olmalı")
+    clean = {}
+    for key, convert in RULE_PARAMS.get(rule, {}).items():
+        if key not in params:
+            continue
+        try:
+            clean[key] = convert(params[key])
+        except (ValueError, TypeError, OverflowError, re.error):
+            raise ValueError(f"{rule}: geçersiz {key} değeri {params[key]!r}")
+    return clean
+
+
+def violation_mask(series, rule, params):
+    """Kolonun tamamı için ihlal maskesi (True = ihlal)"""
+    if rule == "Boş Değer Kontrolü (Not Null)":
+        return series.isna()
+    if rule == "Benzersiz Değer Kontrolü (Unique)":
+        return series.duplicated(keep=False) & series.notna()
+    check = RULE_CHECKS.get(rule)
+    if check is None:
+        raise ValueError(f"Bilinmeyen kural: {rule}")
+    # Kayıtlı parametreler (ör. {"min_length": None}) kural çalışmadan ValueError ile reddedilir
+    params = validate_params(rule, params)
+    # Boş değerler format kurallarında ihlal sayılmaz (Not Null kuralı ayrıca kontrol eder)
+    values = series.dropna()
+    mask = pd.Series(False, index=series.index)
+    if len(values):
+        mask.loc[values.index] = check(values, params).to_numpy(dtype=bool)
+    return mask
+
+
+def evaluate_rule(series, column, rule, params, row_offset=0, sample_size=SAMPLE_VIOLATIONS):
+    """Tek bir kolonda kuralı çalıştırıp RuleResult döndürür"""
+    result = RuleResult(column=column, rule=rule, checked=len(series))
+    try:
+        mask = violation_mask(series, rule, params)
+    except (TypeError, ValueError) as e:
+        result.error = str(e)
+        return result
+    positions = mask.to_numpy().nonzero()[0]
+    result.violations = len(positions)
+    result.samples = [(row_offset + int(p) + 1, series.iat[p]) for p in positions[:sample_size]]
+    return result
+
+
+def _active_rules(rules, columns):
+    """Kural atanmış ve DataFrame'de bulunan kolonlar için {kolon: (kural, parametreler)}"""
+    return {
+        column: (info["rule"], info.get("params") or {})
+        for column, info in rules.items()
+        if info.get("rule") and info["rule"] != NO_RULE and column in columns
+    }
+
+
+def evaluate_rules(df, rules, row_offset=0, sample_size=SAMPLE_VIOLATIONS, workers=None):
+    """
+    quality_rules sözlüğündeki her kuralı ilgili kolonda çalıştırır.
+    {kolon: RuleResult} döndürür; DataFrame'de olmayan kolonlar atlanır.
+    workers (varsayılan DATA_QUALITY_WORKERS) 1'den büyükse ve veri yeterince
+    büyükse (kolon, satır aralığı) işleri süreç havuzuna dağıtılır.
+    """
+    active = _active_rules(rules, df.columns)
+    workers = QUALITY_WORKERS if workers is None else workers
+    if active and _use_parallel(workers, len(df)):
+        positions = parallel_violations(df, active, workers)
+        results = {}
+        for column, (rule, _) in active.items():
+            series = df[column]
+            result = RuleResult(column=column, rule=rule, checked=len(series))
+            if isinstance(positions[column], str):
+                result.error = positions[column]
+            else:
+                result.violations = len(positions[column])
+                result.samples = [(row_offset + int(p) + 1, series.iat[p]) for p in positions[column][:sample_size]]
+            results[column] = result
+        return results
+
+    return {
+        column: evaluate_rule(df[column], column, rule, params, row_offset, sample_size)
+        for column, (rule, params) in active.items()
+    }
+
+
+# --- Süreç havuzu ile paralel kontrol ---
+#
+# Veri işçilere DataFrame olarak pickle'lanmaz: ilgili kolonlar bir kez Arrow IPC
+# biçiminde paylaşılan belleğe (shared memory) yazılır; işçiler aynı bloğu
+# kopyalamadan açıp kendi satır aralığını dilimler. İşçiden sadece ihlal
+# konumları (int64 dizi) döner.
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _use_parallel(workers, rows):
+    """Paralel çalıştırma için birden fazla işçi, yeterli satır ve pyarrow gerekir"""
+    if workers <= 1 or rows < PARALLEL_MIN_ROWS:
+        return False
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _get_executor(workers):
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            # Streamlit çok iş parçacıklı çalıştığından fork yerine spawn kullanılır
+            _executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            _executor_workers = workers
+        return _executor
+
+
+def _discard_executor(executor):
+    """Bir işçisi ölmüş (BrokenProcessPool) havuzu kapatır; sonraki çağrı yenisini açar"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+            _executor_workers = 0
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _serial_violations(df, active):
+    """parallel_violations ile aynı biçimde, süreç havuzu olmadan"""
+    results = {}
+    for column, (rule, params) in active.items():
+        try:
+            results[column] = np.flatnonzero(violation_mask(df[column], rule, params).to_numpy())
+        except (TypeError, ValueError) as e:
+            results[column] = str(e)
+    return results
+
+
+def _to_arrow_table(df, columns):
+    """Kolonları Arrow tablosuna çevirir; karışık tipli object kolonlar metne çevrilir"""
+    import pyarrow as pa
+
+    arrays = []
+    for column in columns:
+        series = df[column]
+        try:
+            arrays.append(pa.array(series, from_pandas=True))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array(series.astype(str).where(series.notna(), None), from_pandas=True))
+    return pa.Table.from_arrays(arrays, names=[str(column) for column in columns])
+
+
+def _publish(table):
+    """Tabloyu Arrow IPC akışı olarak yeni bir paylaşılan bellek bloğuna yazar"""
+    import pyarrow as pa
+
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    size = sink.size()
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    with pa.ipc.new_stream(pa.FixedSizeBufferWriter(pa.py_buffer(block.buf)), table.schema) as writer:
+        writer.write_table(table)
+    return block, size
+
+
+def _slice_violations(buffer, column, rule, params, start, length):
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(buffer).read_all()
+    series = table.column(column).slice(start, length).to_pandas(types_mapper=pd.ArrowDtype)
+    try:
+        mask = violation_mask(series, rule, params)
+    except (TypeError, ValueError) as e:
+        return str(e)
+    return np.flatnonzero(mask.to_numpy())
+
+
+def _violations_worker(name, size, column, rule, params, start, length):
+    """
+    İşçi süreç: paylaşılan bellekteki tablonun [start, start+length) satırlarında
+    kolonun ihlal konumlarını (aralığa göreli) ya da hata mesajını döndürür.
+    """
+    import pyarrow as pa
+
+    # spawn ile başlayan işçiler ana sürecin resource_tracker'ını paylaşır;
+    # bloğu yalnızca ana süreç siler
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        # Arrow nesneleri bu çağrıyla birlikte serbest kalır; blok ancak sonra kapatılabilir
+        return _slice_violations(pa.py_buffer(block.buf)[:size], column, rule, params, start, length)
+    finally:
+        block.close()
+
+
+def parallel_violations(df, active, workers):
+    """
+    active: {kolon: (kural, parametreler)}. Her kolon satır aralıklarına bölünüp
+    süreç havuzunda kontrol edilir. {kolon: sıralı ihlal konumları veya hata mesajı}
+    döndürür. Benzersizlik kuralı kolonun tamamını gerektirdiğinden bölünmez.
+    Bir işçi ölürse (bellek yetersizliği, sonlandırma) havuz yeniden kurulmak
+    üzere atılır ve bu çalıştırma seri olarak tamamlanır.
+    """
+    table = _to_arrow_table(df, list(active))
+    block, size = _publish(table)
+    del table
+    executor = _get_executor(workers)
+    try:
+        return _collect_violations(executor, block.name, size, df, active, workers)
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        return _serial_violations(df, active)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _collect_violations(executor, block_name, size, df, active, workers):
+    rows = len(df)
+    step = max(PARALLEL_MIN_ROWS // 4, -(-rows // workers))
+    futures = {}
+    for column, (rule, params) in active.items():
+        ranges = [(0, rows)] if rule == "Benzersiz Değer Kontrolü (Unique)" else \
+            [(start, min(step, rows - start)) for start in range(0, rows, step)]
+        futures[column] = [
+            (start, executor.submit(_violations_worker, block_name, size, str(column), rule, params, start, length))
+            for start, length in ranges
+        ]
+    results = {}
+    for column, parts in futures.items():
+        collected = []
+        for start, future in parts:
+            part = future.result()
+            if isinstance(part, str):
+                results[column] = part
+                break
+            collected.append(part + start)
+        else:
+            results[column] = np.concatenate(collected) if collected else np.array([], dtype=np.int64)
+    return results
+
+
+class _Reservoir:
+    """
+    Sınırsız sayıda ihlal arasından eşit olasılıkla size adet örnek tutar
+    (reservoir sampling, Algorithm R). Bellek kullanımı sabittir.
+    """
+
+    def __init__(self, size, rng):
+        self.size = size
+        self.seen = 0
+        self.items = []
+        self._rng = rng
+
+    def offer(self, rows, values):
+        """rows/values: aynı uzunlukta dizi benzeri; sadece seçilen öğelerin değeri okunur"""
+        count = len(rows)
+        if not count or not self.size:
+            self.seen += count
+            return
+        positions = np.arange(self.seen, self.seen + count)
+        slots = (self._rng.random(count) * (positions + 1)).astype(np.int64)
+        # Rezervuar dolana kadar her öğe sırayla eklenir
+        slots = np.where(positions < self.size, positions, slots)
+        for i in np.flatnonzero(slots < self.size):
+            item = (int(rows[i]), values[i])
+            if slots[i] < len(self.items):
+                self.items[slots[i]] = item
+            else:
+                self.items.append(item)
+        self.seen += count
+
+    def samples(self):
+        return sorted(self.items, key=lambda item: item[0])
+
+
+class _DuplicateTracker:
+    """
+    Parçalar arasında tekrar eden değerleri bulur. Değerlerin 64 bitlik hash'i ve
+    satır numarası hash'in üst bitlerine göre diskteki bölümlere yazılır; sonunda
+    her bölüm ayrı ayrı sıralanır. Bellek kullanımı satır sayısı / DUPLICATE_BUCKETS
+    ile sınırlıdır.
+    """
+
+    def __init__(self, directory):
+        self._directory = directory
+        self._files = {}
+
+    def add(self, values, rows):
+        if not len(values):
+            return
+        # Parçalar arasında tip farkı (1 / "1") olmasın diye metin üzerinden hash'lenir
+        hashes = pd.util.hash_array(_as_text(values).to_numpy(dtype=object))
+        buckets = (hashes >> np.uint64(58)).astype(np.int64) % DUPLICATE_BUCKETS
+        pairs = np.column_stack((hashes, np.asarray(rows, dtype=np.uint64)))
+        for bucket in np.unique(buckets):
+            if bucket not in self._files:
+                self._files[bucket] = open(os.path.join(self._directory, f"unique_{id(self)}_{bucket}.bin"), "wb")
+            pairs[buckets == bucket].tofile(self._files[bucket])
+
+    def finish(self, reservoir):
+        """Tekrar eden değer taşıyan satır sayısını döndürür, örnekleri reservoir'e ekler"""
+        violations = 0
+        for bucket, handle in sorted(self._files.items()):
+            handle.close()
+            pairs = np.fromfile(handle.name, dtype=np.uint64).reshape(-1, 2)
+            os.remove(handle.name)
+            order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+            hashes, rows = pairs[order, 0], pairs[order, 1]
+            starts = np.flatnonzero(np.r_[True, hashes[1:] != hashes[:-1]])
+            sizes = np.diff(np.r_[starts, len(hashes)])
+            duplicated = np.repeat(sizes > 1, sizes)
+            violations += int(duplicated.sum())
+            # Örnek değer olarak aynı değerin ilk görüldüğü satır gösterilir
+            first_rows = np.repeat(rows[starts], sizes)[duplicated]
+            reservoir.offer(rows[duplicated], [f"{first}. satır ile aynı" for first in first_rows])
+        self._files = {}
+        return violations
+
+
+class _Lazy:
+    """Rezervuara seçilen konumların değerini ihtiyaç anında okur"""
+
+    def __init__(self, series, positions):
+        self._series = series
+        self._positions = positions
+
+    def __getitem__(self, i):
+        return self._series.iat[self._positions[i]]
+
+
+class StreamingValidator:
+    """
+    quality_rules'u dosyanın parçaları üzerinde sırayla çalıştırır. Parça başına
+    ihlal sayaçları toplanır, örnek ihlaller sınırlı bir rezervuarda tutulur;
+    bellek kullanımı dosya boyutundan bağımsızdır.
+    """
+
+    def __init__(self, rules, sample_size=SAMPLE_VIOLATIONS, spill_dir=None, seed=0, workers=None):
+        rng = np.random.default_rng(seed)
+        self._workers = QUALITY_WORKERS if workers is None else workers
+        self._rules = {
+            column: (info["rule"], info.get("params") or {})
+            for column, info in rules.items()
+            if info.get("rule") and info["rule"] != NO_RULE
+        }
+        self._results = {column: RuleResult(column=column, rule=rule) for column, (rule, _) in self._rules.items()}
+        self._reservoirs = {column: _Reservoir(sample_size, rng) for column in self._rules}
+        self._spill = None
+        self._trackers = {}
+        for column, (rule, _) in self._rules.items():
+            if rule == "Benzersiz Değer Kontrolü (Unique)":
+                if self._spill is None:
+                    self._spill = tempfile.TemporaryDirectory(prefix="ddp_unique_", dir=spill_dir)
+                self._trackers[column] = _DuplicateTracker(self._spill.name)
+        self._present = set()
+        self.rows = 0
+
+    def add_chunk(self, df):
+        """Sıradaki parçayı kontrol eder (satır numaraları parçalar boyunca sürer)"""
+        # Benzersizlik dışındaki kurallar büyük parçalarda süreç havuzunda çalışır
+        parallel = {}
+        if _use_parallel(self._workers, len(df)):
+            pending = {
+                column: rule_params for column, rule_params in self._rules.items()
+                if column in df.columns and column not in self._trackers and not self._results[column].error
+            }
+            if pending:
+                parallel = parallel_violations(df, pending, self._workers)
+
+        for column, (rule, params) in self._rules.items():
+            result = self._results[column]
+            if result.error or column not in df.columns:
+                continue
+            self._present.add(column)
+            series = df[column]
+            result.checked += len(series)
+            if column in self._trackers:
+                values = series.dropna()
+                rows = self.rows + np.flatnonzero(series.notna().to_numpy()) + 1
+                self._trackers[column].add(values, rows)
+                continue
+            if column in parallel:
+                positions = parallel[column]
+                if isinstance(positions, str):
+                    result.error = positions
+                    continue
+            else:
+                try:
+                    mask = violation_mask(series, rule, params)
+                except (TypeError, ValueError) as e:
+                    result.error = str(e)
+                    continue
+                positions = np.flatnonzero(mask.to_numpy())
+            result.violations += len(positions)
+            self._reservoirs[column].offer(self.rows + positions + 1, _Lazy(series, positions))
+        self.rows += len(df)
+
+    def finish(self):
+        """Toplanan sonuçları {kolon: RuleResult} olarak döndürür"""
+        try:
+            for column, tracker in self._trackers.items():
+                self._results[column].violations = tracker.finish(self._reservoirs[column])
+        finally:
+            if self._spill is not None:
+                self._spill.cleanup()
+                self._spill = None
+        for column, result in self._results.items():
+            result.samples = self._reservoirs[column].samples()
+        # Dosyada olmayan kolonlar atlanır (evaluate_rules ile aynı)
+        return {column: result for column, result in self._results.items() if column in self._present}
+
+
+def validate_chunks(chunks, rules, sample_size=SAMPLE_VIOLATIONS, progress=None, workers=None):
+    """
+    DataFrame parçaları üzerinde kuralları çalıştırır. progress verilirse her
+    parçadan sonra o ana kadar işlenen satır sayısıyla çağrılır.
+    """
+    validator = StreamingValidator(rules, sample_size, workers=workers)
+    try:
+        for chunk in chunks:
+            validator.add_chunk(chunk)
+            if progress:
+                progress(validator.rows)
+    except BaseException:
+        validator.finish()
+        raise
+    return validator.finish()
+
+
+# --- Kural sonuçları önbelleği ---
+#
+# Sonuçlar (dosya içerik özeti, kolon, kural, parametreler) parmak iziyle
+# saklanır. Tek bir kolonun kuralı değiştiğinde sadece o kolon yeniden
+# kontrol edilir; aynı dosya tekrar yüklendiğinde de önceki sonuçlar kullanılır.
+
+def rule_fingerprint(content_hash, column, rule, params, sample_size=SAMPLE_VIOLATIONS):
+    """Kural sonucunu belirleyen her şeyin SHA-256 özeti"""
+    payload = json.dumps([content_hash, str(column), rule, params or {}, sample_size],
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _result_size(result):
+    """RuleResult'ın bellekte kapladığı yaklaşık bayt"""
+    size = 512 + sys.getsizeof(result.error or "")
+    for row, value in result.samples:
+        size += 64 + sys.getsizeof(value)
+    return size
+
+
+class QualityResultCache:
+    """
+    Parmak izi -> RuleResult eşlemesi için toplam boyutu max_bytes ile sınırlı,
+    LRU tahliyeli süreç içi önbellek. Tüm oturumlar tarafından paylaşılır.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # parmak izi -> (RuleResult, bayt)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, result):
+        size = _result_size(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (result, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """Önbellek boyutlandırması için isabet/ıska sayaçları"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+result_cache = QualityResultCache(max_bytes=int(RESULT_CACHE_MB * 1024 * 1024))
+
+
+def evaluate_incremental(content_hash, rules, run, sample_size=SAMPLE_VIOLATIONS, cache=None):
+    """
+    Önbellekte sonucu olmayan kurallar için run({kolon: kural bilgisi}) çağrılır
+    (ör. evaluate_rules veya validate_chunks); diğerleri önbellekten gelir.
+    {kolon: RuleResult} kural sırasıyla döndürülür. content_hash None ise
+    önbellek kullanılmaz.
+    """
+    cache = result_cache if cache is None else cache
+    active = {
+        column: info for column, info in rules.items()
+        if info.get("rule") and info["rule"] != NO_RULE
+    }
+    if content_hash is None:
+        return run(active) if active else {}
+
+    keys = {
+        column: rule_fingerprint(content_hash, column, info["rule"], info.get("params"), sample_size)
+        for column, info in active.items()
+    }
+    cached = {}
+    for column, key in keys.items():
+        result = cache.get(key)
+        if result is not None:
+            cached[column] = result
+    missing = {column: info for column, info in active.items() if column not in cached}
+    fresh = run(missing) if missing else {}
+    for column, result in fresh.items():
+        cache.put(keys[column], result)
+    merged = {**cached, **fresh}
+    return {column: merged[column] for column in active if column in merged}
+
@@ -0,0 +1,743 @@
+# LDAP kimlik doğrulama ve bağlantı havuzu
+# Streamlit app.py her etkileşimde baştan çalıştırıldığı için süreç boyunca
+# yaşaması gereken nesneler (bağlantı havuzu vb.) bu modülde tutulur.
+
+import concurrent.futures
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+
+import ldap3
+import streamlit as st
+from ldap3.core.exceptions import LDAPCommunicationError, LDAPException
+from ldap3.operation.search import (
+    AND, MATCH_APPROX, MATCH_EQUAL, MATCH_EXTENSIBLE, MATCH_GREATER_OR_EQUAL, MATCH_LESS_OR_EQUAL,
+    MATCH_PRESENT, MATCH_SUBSTRING, parse_filter
+)
+
+from ldap_config import LDAP_CONFIG
+
+
+class LDAPPoolExhaustedError(LDAPException):
+    """Havuzdaki tüm bağlantılar meşgul ve bekleme süresi doldu"""
+
+
+def build_server(address, settings=LDAP_CONFIG, tls=None):
+    """
+    Ayrıştırılmış sunucu adresinden (LDAPServerAddress) ldap3.Server nesnesi oluşturur
+    """
+    return ldap3.Server(
+        address.host,
+        port=address.port,
+        use_ssl=address.use_ssl,
+        # SSL sertifika varsa kullan, yoksa basit SSL
+        tls=tls if address.use_ssl else None,
+        connect_timeout=settings.connect_timeout
+    )
+
+
+def build_server_pool(settings=LDAP_CONFIG):
+    """
+    Yapılandırmadaki sunucu listesinden devre kesicili LDAPServerPool oluşturur
+    """
+    tls = ldap3.Tls(ca_certs_file=settings.ssl_certificate) if settings.ssl_certificate else None
+    return LDAPServerPool(
+        [build_server(address, settings, tls) for address in settings.servers],
+        strategy=settings.server_strategy,
+        failure_threshold=settings.breaker_failure_threshold,
+        probe_interval=settings.breaker_probe_interval
+    )
+
+
+@st.cache_resource
+def get_server_pool():
+    """
+    Server/Tls nesneleri süreç başına bir kez oluşturulur; giriş sırasında
+    adres ayrıştırma veya dosya sistemi kontrolü yapılmaz
+    """
+    return build_server_pool(LDAP_CONFIG)
+
+
+class _ServerHealth:
+    """Tek bir sunucunun devre kesici durumu ve son gecikme ortalaması"""
+
+    def __init__(self):
+        self.failures = 0
+        self.open = False
+        self.latency = None  # saniye, üstel hareketli ortalama
+
+
+def _probe_server(server):
+    """Sunucuya soket (ve TLS) bağlantısı açılabiliyor mu kontrol eder"""
+    conn = ldap3.Connection(server, receive_timeout=server.connect_timeout)
+    try:
+        conn.open(read_server_info=False)
+        return True
+    except LDAPException:
+        return False
+    finally:
+        _close_quietly(conn)
+
+
+class LDAPServerPool(ldap3.ServerPool):
+    """
+    ldap3.ServerPool üzerine sunucu başına devre kesici ve son gecikmelere göre
+    sunucu seçimi ekler. Seçim stratejisi: "first", "round_robin", "fastest".
+
+    Art arda failure_threshold kez ulaşılamayan sunucunun devresi açılır ve
+    seçimden çıkarılır; arka plandaki yoklama sunucuyu tekrar sağlıklı
+    bulduğunda devre kapanır.
+    """
+
+    STRATEGIES = ("first", "round_robin", "fastest")
+
+    def __init__(self, servers, strategy="first", failure_threshold=3, probe_interval=30,
+                 probe=_probe_server, latency_weight=0.3):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Geçersiz sunucu seçim stratejisi: {strategy}")
+        pool_strategy = ldap3.ROUND_ROBIN if strategy == "round_robin" else ldap3.FIRST
+        super().__init__(servers, pool_strategy=pool_strategy, active=False, exhaust=False)
+        self.selection = strategy
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.latency_weight = latency_weight
+        self._probe = probe
+        self._health = [_ServerHealth() for _ in self.servers]
+        self._cursor = -1
+        self._lock = threading.Lock()
+        self._probe_thread = None
+        self._tried = weakref.WeakKeyDictionary()  # bağlantı -> bu açılışta denenmiş sunucular
+
+    def initialize(self, connection):
+        # Seçim durumu havuzun kendisinde tutulur; ldap3'ün bağlantı başına
+        # kaydı (pool_states) bağlantıları hiç bırakmadığı için kullanılmaz
+        pass
+
+    def get_current_server(self, connection):
+        return self.servers[0]
+
+    def exclude(self, connection, servers):
+        """Bu bağlantı açılırken zaten denenmiş sunucuları seçimden çıkarır"""
+        self._tried[connection] = list(servers)
+
+    def get_server(self, connection):
+        """ldap3 bağlantı açarken çağırır; devresi kapalı sunuculardan birini seçer"""
+        tried = self._tried.get(connection, ())
+        with self._lock:
+            untried = [i for i, server in enumerate(self.servers) if not any(server is t for t in tried)]
+            candidates = [i for i in untried if not self._health[i].open]
+            if not candidates:
+                # Hepsi erişilemez görünüyorsa yine de sırayla denenir
+                candidates = untried or list(range(len(self.servers)))
+
+            if self.selection == "fastest":
+                # Gecikmesi henüz ölçülmemiş sunucular önce denenir
+                index = min(candidates, key=lambda i: self._health[i].latency or 0.0)
+            elif self.selection == "round_robin":
+                self._cursor += 1
+                index = candidates[self._cursor % len(candidates)]
+            else:
+                index = candidates[0]
+        return self.servers[index]
+
+    def record_success(self, server, latency):
+        """Başarılı işlem: hata sayacı sıfırlanır, gecikme ortalaması güncellenir"""
+        health = self._health_of(server)
+        if health is None:
+            return
+        with self._lock:
+            health.failures = 0
+            if health.latency is None:
+                health.latency = latency
+            else:
+                health.latency += self.latency_weight * (latency - health.latency)
+
+    def record_failure(self, server):
+        """Ağ hatası: eşik aşılırsa devre açılır ve arka plan yoklaması başlar"""
+        health = self._health_of(server)
+        if health is None:
+            return
+        with self._lock:
+            health.failures += 1
+            if health.failures >= self.failure_threshold and not health.open:
+                health.open = True
+                self._start_probe()
+
+    def status(self):
+        """Sunucu başına devre durumu ve gecikme bilgisi"""
+        with self._lock:
+            return [
+                {
+                    "server": str(server.host),
+                    "open": health.open,
+                    "failures": health.failures,
+                    "latency_ms": None if health.latency is None else health.latency * 1000
+                }
+                for server, health in zip(self.servers, self._health)
+            ]
+
+    def _health_of(self, server):
+        for candidate, health in zip(self.servers, self._health):
+            if candidate is server:
+                return health
+        return None
+
+    def _start_probe(self):
+        # self._lock tutulurken çağrılır
+        if self._probe_thread is None or not self._probe_thread.is_alive():
+            self._probe_thread = threading.Thread(target=self._probe_loop, name="ldap-server-probe", daemon=True)
+            self._probe_thread.start()
+
+    def _probe_loop(self):
+        while True:
+            time.sleep(self.probe_interval)
+            with self._lock:
+                tripped = [i for i, health in enumerate(self._health) if health.open]
+                if not tripped:
+                    self._probe_thread = None
+                    return
+            for index in tripped:
+                if self._probe(self.servers[index]):
+                    with self._lock:
+                        self._health[index].open = False
+                        self._health[index].failures = 0
+
+
+class _ConnectionSlots:
+    """
+    Tek tip bağlantı için sınırlı boyutlu, boşta bekleme süresi kontrollü havuz
+    """
+
+    def __init__(self, factory, size, idle_timeout, wait_timeout):
+        self._factory = factory
+        self._size = size
+        self._idle_timeout = idle_timeout
+        self._wait_timeout = wait_timeout
+        self._idle = deque()  # (bağlantı, son kullanım zamanı)
+        self._open_count = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Havuzdan sağlıklı bir bağlantı alır, gerekirse yenisini açar"""
+        deadline = time.monotonic() + self._wait_timeout
+        with self._cond:
+            while True:
+                while self._idle:
+                    conn, last_used = self._idle.pop()
+                    if self._is_healthy(conn, last_used):
+                        return conn
+                    # Bayat bağlantıyı kapat, yerine yenisi açılabilir
+                    self._open_count -= 1
+                    _close_quietly(conn)
+                if self._open_count < self._size:
+                    self._open_count += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LDAPPoolExhaustedError("LDAP bağlantı havuzu dolu, boş bağlantı beklenirken zaman aşımı")
+                self._cond.wait(remaining)
+
+        # Yeni bağlantı kilit dışında açılır (TLS el sıkışması uzun sürebilir)
+        try:
+            return self._factory()
+        except Exception:
+            with self._cond:
+                self._open_count -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn, discard=False):
+        """Bağlantıyı havuza iade eder; bozuksa kapatır"""
+        with self._cond:
+            if discard or conn.closed:
+                self._open_count -= 1
+                _close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close(self):
+        """Boştaki tüm bağlantıları kapatır"""
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._open_count -= 1
+                _close_quietly(conn)
+            self._cond.notify_all()
+
+    def _is_healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        # Sunucular/firewall'lar boştaki bağlantıları sessizce düşürebilir
+        return time.monotonic() - last_used < self._idle_timeout
+
+
+def _close_quietly(conn):
+    try:
+        conn.unbind()
+    except Exception:
+        pass
+
+
+class LDAPConnectionPool:
+    """
+    Süreç genelinde paylaşılan LDAP bağlantı havuzu.
+
+    Servis hesabı bağlantıları bind edilmiş halde açık tutulup yeniden kullanılır.
+    Kullanıcı şifre kontrolleri ayrı bir havuzdaki açık (TLS el sıkışması yapılmış)
+    bağlantılar üzerinde rebind ile yapılır.
+    """
+
+    def __init__(self, server, bind_dn, bind_password, size=4, idle_timeout=300,
+                 receive_timeout=10, wait_timeout=10, client_strategy=ldap3.SYNC):
+        self.server = server
+        self.bind_dn = bind_dn
+        self.bind_password = bind_password
+        self.receive_timeout = receive_timeout
+        self.client_strategy = client_strategy
+        self._service = _ConnectionSlots(self._open_service, size, idle_timeout, wait_timeout)
+        self._binders = _ConnectionSlots(self._open_binder, size, idle_timeout, wait_timeout)
+
+    def _new_connection(self, **kwargs):
+        return ldap3.Connection(
+            self.server,
+            client_strategy=self.client_strategy,
+            receive_timeout=self.receive_timeout,
+            **kwargs
+        )
+
+    def _connect(self, opener, **kwargs):
+        """
+        Yeni bağlantı açar. Sunucu havuzunda ulaşılamayan sunucu hatası
+        kaydedilip sıradaki sunucu denenir.
+        """
+        server_pool = self.server if isinstance(self.server, LDAPServerPool) else None
+        attempts = len(server_pool) if server_pool else 1
+        tried = []
+        for attempt in range(attempts):
+            conn = self._new_connection(**kwargs)
+            if server_pool:
+                server_pool.exclude(conn, tried)
+            started = time.monotonic()
+            try:
+                opener(conn)
+            except LDAPCommunicationError:
+                tried.append(conn.server)
+                self._record_failure(conn)
+                _close_quietly(conn)
+                if attempt == attempts - 1:
+                    raise
+                continue
+            self._record_success(conn, time.monotonic() - started)
+            return conn
+
+    def _open_service(self):
+        # Admin olarak bağlan
+        def bind(conn):
+            if not conn.bind(read_server_info=False):
+                _close_quietly(conn)
+                raise ldap3.core.exceptions.LDAPBindError(f"Admin bağlantısı başarısız: {conn.result}")
+
+        return self._connect(bind, user=self.bind_dn, password=self.bind_password)
+
+    def _open_binder(self):
+        return self._connect(lambda conn: conn.open(read_server_info=False))
+
+    def _record_success(self, conn, latency):
+        if isinstance(self.server, LDAPServerPool):
+            self.server.record_success(conn.server, latency)
+
+    def _record_failure(self, conn):
+        if isinstance(self.server, LDAPServerPool):
+            self.server.record_failure(conn.server)
+
+    def run_as_service(self, operation):
+        """
+        Havuzdan bir servis bağlantısı alıp operation(conn) sonucunu döndürür.
+        Kopmuş bir bağlantıya denk gelinirse yeni bağlantıyla bir kez daha denenir.
+        """
+        for attempt in range(2):
+            conn = self._service.acquire()
+            started = time.monotonic()
+            try:
+                result = operation(conn)
+            except LDAPCommunicationError:
+                self._record_failure(conn)
+                self._service.release(conn, discard=True)
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                self._service.release(conn, discard=True)
+                raise
+            self._record_success(conn, time.monotonic() - started)
+            self._service.release(conn)
+            return result
+
+    def check_credentials(self, user_dn, password, operation=None):
+        """
+        Açık bir bağlantı üzerinde kullanıcı DN'i ve şifresi ile rebind yapar.
+        Bind başarılıysa operation(conn) aynı bağlantıda kullanıcı yetkisiyle çalıştırılır.
+        (bound, operation sonucu) döndürür.
+        """
+        for attempt in range(2):
+            conn = self._binders.acquire()
+            try:
+                bound = conn.rebind(user=user_dn, password=password, read_server_info=False)
+                result = operation(conn) if bound and operation else None
+            except LDAPCommunicationError:
+                self._record_failure(conn)
+                self._binders.release(conn, discard=True)
+                if attempt:
+                    raise
+                continue
+            except ldap3.core.exceptions.LDAPBindError:
+                # raise_exceptions kapalıyken hatalı şifre istisna değil False döndürür;
+                # rebind'in LDAPBindError'ı sunucunun bağlantıyı kapattığı anlamına gelir.
+                # Kopmuş bağlantı havuza geri konmaz, yeni bağlantıyla tekrar denenir.
+                self._record_failure(conn)
+                self._binders.release(conn, discard=True)
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                self._binders.release(conn, discard=True)
+                raise
+            self._binders.release(conn)
+            return bound, result
+
+    def close(self):
+        """Havuzdaki boş bağlantıları kapatır"""
+        self._service.close()
+        self._binders.close()
+
+
+class UserLookupCache:
+    """
+    Kullanıcı adı -> (user_dn, grup üyeliği sonucu) eşlemesi için TTL ve LRU
+    tahliyeli, sınırlı boyutlu süreç içi önbellek.
+    "Kullanıcı bulunamadı" sonuçları ayrı ve daha kısa bir TTL ile saklanır.
+    """
+
+    _NOT_FOUND = object()
+
+    def __init__(self, max_size=1024, ttl=600, negative_ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # kullanıcı adı -> (değer, son geçerlilik zamanı)
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        """
+        (bulundu, user_dn, group_found) döndürür. Negatif kayıtta user_dn None olur.
+        """
+        with self._lock:
+            item = self._entries.get(username)
+            if item is not None:
+                value, expires_at = item
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(username)
+                    self.hits += 1
+                    if value is self._NOT_FOUND:
+                        return True, None, False
+                    return (True,) + value
+                del self._entries[username]
+            self.misses += 1
+            return False, None, False
+
+    def put(self, username, user_dn, group_found):
+        self._store(username, (user_dn, group_found), self.ttl)
+
+    def put_not_found(self, username):
+        self._store(username, self._NOT_FOUND, self.negative_ttl)
+
+    def invalidate(self, username):
+        with self._lock:
+            self._entries.pop(username, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Önbellek boyutlandırması için isabet/ıska sayaçları"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def _store(self, username, value, ttl):
+        if self.max_size <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[username] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+user_cache = UserLookupCache(
+    max_size=LDAP_CONFIG.cache_size,
+    ttl=LDAP_CONFIG.cache_ttl,
+    negative_ttl=LDAP_CONFIG.cache_negative_ttl
+)
+
+
+def get_cache_stats():
+    """Kullanıcı arama önbelleğinin isabet/ıska sayaçlarını döndürür"""
+    return user_cache.stats()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Süreç genelindeki bağlantı havuzunu döndürür (ilk çağrıda LDAP_CONFIG ile oluşturulur)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = LDAPConnectionPool(
+                get_server_pool(),
+                LDAP_CONFIG.bind_dn,
+                LDAP_CONFIG.bind_password,
+                size=LDAP_CONFIG.pool_size,
+                idle_timeout=LDAP_CONFIG.pool_idle_timeout,
+                receive_timeout=LDAP_CONFIG.receive_timeout,
+                wait_timeout=LDAP_CONFIG.connect_timeout
+            )
+        return _pool
+
+
+def set_pool(pool):
+    """Varsayılan havuzu değiştirir (ör. benchmark'larda MOCK_SYNC havuzu kullanmak için)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool is not pool:
+            _pool.close()
+        _pool = pool
+
+
+# Birleştirilmiş aramada izin verilen olumlu (! ve | içermeyen) koşul tipleri
+_POSITIVE_MATCHES = {
+    MATCH_EQUAL, MATCH_APPROX, MATCH_GREATER_OR_EQUAL, MATCH_LESS_OR_EQUAL,
+    MATCH_EXTENSIBLE, MATCH_PRESENT, MATCH_SUBSTRING
+}
+
+
+def _is_user_clause(node):
+    if node.tag != MATCH_EQUAL:
+        return False
+    value = node.assertion["value"]
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", "replace")
+    return node.assertion["attr"].lower() == LDAP_CONFIG.user_filter_attribute.lower() and value == "${USER}"
+
+
+def _pattern_targets_user_entry(group_pattern):
+    """
+    group_auth_pattern kullanıcı kaydının kendisini (ör. sAMAccountName=${USER})
+    filtreliyorsa kullanıcı araması ve grup kontrolü tek aramada birleştirilebilir.
+    Filtre ayrıştırılır; sadece kullanıcı koşulunun kendisi ya da bu koşulu doğrudan
+    içeren ve tüm koşulları olumlu olan üst düzey bir (&...) birleştirilir. (|...) veya
+    (!...) içeren filtrelerde grup ayrı aramayla kontrol edilir.
+    """
+    if not group_pattern:
+        return False
+    try:
+        root = parse_filter(group_pattern, None, auto_escape=False, auto_encode=False,
+                            validator=None, check_names=False)
+    except LDAPException:
+        return False
+    if len(root.elements) != 1:
+        return False
+    node = root.elements[0]
+    clauses = node.elements if node.tag == AND else [node]
+    if not all(clause.tag in _POSITIVE_MATCHES for clause in clauses):
+        return False
+    return any(_is_user_clause(clause) for clause in clauses)
+
+
+def _search(conn, search_base, search_filter, search_scope, attributes):
+    """
+    Aramayı yapıp sadece kayıt yanıtlarını döndürür (Entry nesneleri oluşturulmaz).
+    Senkron ve asenkron (ASYNC/MOCK_ASYNC) bağlantı stratejilerinde çalışır.
+    """
+    message_id = conn.search(
+        search_base=search_base,
+        search_filter=search_filter,
+        search_scope=search_scope,
+        attributes=attributes,
+        # Sunucu tarafı arama süresi sınırı (saniye)
+        time_limit=LDAP_CONFIG.receive_timeout
+    )
+    if conn.strategy.sync:
+        responses = conn.response
+    else:
+        responses, _ = conn.get_response(message_id, timeout=LDAP_CONFIG.receive_timeout)
+    return [response for response in responses or [] if response.get("type") == "searchResEntry"]
+
+
+def _search_dn(conn, search_base, search_filter, attributes):
+    """Aramayı yapıp ilk kaydın DN'ini döndürür"""
+    for response in _search(conn, search_base, search_filter, ldap3.SUBTREE, attributes):
+        return response["dn"]
+    return None
+
+
+def ldap_authenticate(username, password):
+    """
+    LDAP sunucusunda kullanıcı kimlik doğrulaması yapar (ldap3 ile SSL sertifika desteği)
+    """
+    try:
+        base_dn = LDAP_CONFIG.user_base_dn
+        pool = get_pool()
+
+        # Aramalarda sadece gerekli attribute'lar istenir (varsayılan: sadece DN)
+        lookup_attributes = list(LDAP_CONFIG.lookup_attributes)
+        user_filter = f"({LDAP_CONFIG.user_filter_attribute}={username})"
+
+        group_pattern = LDAP_CONFIG.group_auth_pattern
+        # Pattern'deki ${USER} placeholder'ını gerçek kullanıcı adı ile değiştir
+        group_filter = group_pattern.replace("${USER}", username) if group_pattern else None
+        merge_search = LDAP_CONFIG.merge_group_search and _pattern_targets_user_entry(group_pattern)
+
+        # Önbellekte varsa dizin aramaları atlanır, şifre kontrolü her girişte yapılır
+        cached, user_dn, group_found = user_cache.get(username)
+        if cached:
+            if user_dn is None:
+                return False, "Kullanıcı bulunamadı"
+            bound, _ = pool.check_credentials(user_dn, password)
+            if not bound:
+                # DN değişmiş olabilir; bir sonraki denemede yeniden aranır
+                user_cache.invalidate(username)
+                return False, "Geçersiz kullanıcı adı veya şifre"
+            if group_found:
+                return True, "Kullanıcı doğrulandı ve grupta bulundu"
+            return False, "Kullanıcı doğrulandı ancak gerekli grupta değil"
+
+        if merge_search:
+            # Tek arama: grup filtresine uyan kayıt kullanıcının kendisidir.
+            # Sonuç yoksa kullanıcının var olup olmadığı ayrıca sorgulanır.
+            def find_user(conn):
+                dn = _search_dn(conn, base_dn, group_filter, lookup_attributes)
+                if dn is not None:
+                    return dn, True
+                return _search_dn(conn, base_dn, user_filter, lookup_attributes), False
+
+            user_dn, group_found = pool.run_as_service(find_user)
+            if user_dn is None:
+                user_cache.put_not_found(username)
+                return False, "Kullanıcı bulunamadı"
+
+            bound, _ = pool.check_credentials(user_dn, password)
+            if not bound:
+                return False, "Geçersiz kullanıcı adı veya şifre"
+            user_cache.put(username, user_dn, group_found)
+
+            if group_found:
+                return True, "Kullanıcı doğrulandı ve grupta bulundu"
+            return False, "Kullanıcı doğrulandı ancak gerekli grupta değil"
+
+        # Kullanıcıyı ara (havuzdaki servis bağlantısı ile)
+        user_dn = pool.run_as_service(lambda conn: _search_dn(conn, base_dn, user_filter, lookup_attributes))
+        if user_dn is None:
+            user_cache.put_not_found(username)
+            return False, "Kullanıcı bulunamadı"
+
+        # Grup kontrolü (kullanıcı yetkisiyle, aynı bağlantıda)
+        def check_group(user_conn):
+            if group_filter:
+                # Kullanıcının base DN'inde grup kontrolü yap
+                return _search_dn(user_conn, base_dn, group_filter, lookup_attributes) is not None
+
+            # Eski yöntem (fallback) - kullanıcının memberOf attribute'unu kontrol et
+            group_attr = LDAP_CONFIG.group_member_attribute
+            entries = _search(user_conn, user_dn, "(objectClass=user)", ldap3.BASE, [group_attr])
+            if not entries:
+                return False
+
+            user_attrs = entries[0].get("attributes", {})
+            if group_attr not in user_attrs:
+                return False
+            group_values = user_attrs[group_attr]
+            if isinstance(group_values, list):
+                return any(LDAP_CONFIG.group_dn in group_value for group_value in group_values)
+            return LDAP_CONFIG.group_dn in str(group_values)
+
+        # Kullanıcı şifresi ile bağlanmayı dene (açık bağlantı üzerinde rebind)
+        bound, group_found = pool.check_credentials(user_dn, password, check_group)
+        if not bound:
+            return False, "Geçersiz kullanıcı adı veya şifre"
+        user_cache.put(username, user_dn, group_found)
+
+        if group_found:
+            return True, "Kullanıcı doğrulandı ve grupta bulundu"
+        else:
+            return False, "Kullanıcı doğrulandı ancak gerekli grupta değil"
+
+    except ldap3.core.exceptions.LDAPBindError as e:
+        return False, f"LDAP bağlantı hatası: {str(e)}"
+    except ldap3.core.exceptions.LDAPException as e:
+        return False, f"LDAP hatası: {str(e)}"
+    except Exception as e:
+        return False, f"Genel hata: {str(e)}"
+
+
+# Zaman sınırlı giriş denemesinin sonuç durumları
+AUTH_OK = "ok"
+AUTH_FAILED = "failed"
+AUTH_TIMEOUT = "timeout"
+AUTH_BUSY = "busy"
+
+_auth_executor = None
+_auth_executor_lock = threading.Lock()
+# Kuyrukta bekleyen + çalışan giriş denemesi sayısı sınırı
+_auth_slots = threading.BoundedSemaphore(LDAP_CONFIG.auth_max_pending)
+
+
+def _get_auth_executor():
+    global _auth_executor
+    with _auth_executor_lock:
+        if _auth_executor is None:
+            _auth_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=LDAP_CONFIG.auth_workers,
+                thread_name_prefix="ldap-auth"
+            )
+        return _auth_executor
+
+
+def authenticate_with_deadline(username, password, timeout=None):
+    """
+    ldap_authenticate'i Streamlit script thread'i dışında, sınırlı bir iş parçacığı
+    havuzunda çalıştırır ve en fazla timeout (varsayılan LDAP_AUTH_TIMEOUT) saniye bekler.
+    (durum, mesaj) döndürür; durum AUTH_OK, AUTH_FAILED, AUTH_TIMEOUT veya AUTH_BUSY olur.
+    """
+    if not _auth_slots.acquire(blocking=False):
+        return AUTH_BUSY, "Çok sayıda eşzamanlı giriş denemesi var, lütfen birazdan tekrar deneyin"
+    try:
+        future = _get_auth_executor().submit(ldap_authenticate, username, password)
+    except Exception:
+        _auth_slots.release()
+        raise
+    # Slot iş gerçekten bittiğinde serbest kalır; zaman aşımına uğrayan deneme
+    # connect/receive zaman aşımlarıyla sonlanana kadar kapasiteden düşülür
+    future.add_done_callback(lambda _: _auth_slots.release())
+
+    try:
+        success, message = future.result(timeout=timeout or LDAP_CONFIG.auth_timeout)
+    except concurrent.futures.TimeoutError:
+        return AUTH_TIMEOUT, "LDAP sunucusu zamanında yanıt vermedi, lütfen tekrar deneyin"
+    return (AUTH_OK if success else AUTH_FAILED), message
@@ -2,22 +2,180 @@
 # Bu dosyayı kendi LDAP sunucu bilgilerinizle güncelleyin
 
 import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
 from dotenv import load_dotenv
 
 # .env dosyasını otomatik yükle
 load_dotenv()
 
+
+DEFAULT_PORTS = {"ldap": 389, "ldaps": 636}
+SERVER_STRATEGIES = ("first", "round_robin", "fastest")
+
+
+@dataclass(frozen=True)
+class LDAPServerAddress:
+    """Ayrıştırılmış LDAP sunucu adresi"""
+    url: str
+    host: str
+    port: int
+    use_ssl: bool
+
+    @classmethod
+    def parse(cls, url):
+        """ldap://host[:port] veya ldaps://host[:port] adresini ayrıştırır (port yoksa varsayılan)"""
+        url = url.strip()
+        parts = urlsplit(url)
+        if parts.scheme not in DEFAULT_PORTS:
+            raise ValueError(f"Geçersiz LDAP sunucu adresi (ldap:// veya ldaps:// olmalı): {url}")
+        if not parts.hostname:
+            raise ValueError(f"LDAP sunucu adresinde host eksik: {url}")
+        try:
+            port = parts.port or DEFAULT_PORTS[parts.scheme]
+        except ValueError:
+            raise ValueError(f"LDAP sunucu adresinde geçersiz port: {url}")
+        return cls(url=url, host=parts.hostname, port=port, use_ssl=parts.scheme == "ldaps")
+
+
+@dataclass(frozen=True)
+class LDAPSettings:
+    """
+    Uygulama açılışında bir kez ayrıştırılıp doğrulanan, değiştirilemez LDAP yapılandırması
+    """
+    servers: Tuple[LDAPServerAddress, ...]
+    ssl_certificate: Optional[str]
+    ssl_verify: bool
+    allow_insecure: bool
+    base_dn: str
+    user_base_dn: str
+    bind_dn: str
+    bind_password: str
+    group_auth_pattern: str
+    group_dn: str
+    user_filter_attribute: str
+    group_member_attribute: str
+    lookup_attributes: Tuple[str, ...]
+    merge_group_search: bool
+    server_strategy: str
+    breaker_failure_threshold: int
+    breaker_probe_interval: int
+    pool_size: int
+    pool_idle_timeout: int
+    cache_size: int
+    cache_ttl: int
+    cache_negative_ttl: int
+    connect_timeout: int
+    receive_timeout: int
+    auth_timeout: int
+    auth_workers: int
+    auth_max_pending: int
+
+    @property
+    def server(self):
+        """Birincil sunucu adresi"""
+        return self.servers[0].url
+
+    @classmethod
+    def from_mapping(cls, config):
+        """
+        Sözlük biçimindeki yapılandırmayı ayrıştırır ve doğrular; hatalı değerde ValueError fırlatır
+        """
+        servers = config.get("servers") or config["server"]
+        if isinstance(servers, str):
+            servers = servers.split(",")
+        servers = tuple(LDAPServerAddress.parse(url) for url in servers if url.strip())
+        if not servers:
+            raise ValueError("En az bir LDAP sunucusu tanımlanmalı")
+
+        strategy = config.get("server_strategy", "first")
+        if strategy not in SERVER_STRATEGIES:
+            raise ValueError(f"Geçersiz LDAP_SERVER_STRATEGY: {strategy} (seçenekler: {', '.join(SERVER_STRATEGIES)})")
+
+        # Sertifika dosyası sadece açılışta kontrol edilir; yoksa basit SSL kullanılır
+        certificate = config.get("ssl_certificate") or None
+        if certificate and not os.path.exists(certificate):
+            certificate = None
+
+        lookup_attributes = config.get("lookup_attributes", "")
+        if isinstance(lookup_attributes, str):
+            lookup_attributes = lookup_attributes.split(",")
+        lookup_attributes = tuple(a.strip() for a in lookup_attributes if a.strip()) or ("1.1",)
+
+        group_auth_pattern = config.get("group_auth_pattern") or ""
+        if group_auth_pattern and "${USER}" not in group_auth_pattern:
+            raise ValueError("LDAP_GROUP_AUTH_PATTERN ${USER} yer tutucusunu içermeli")
+
+        return cls(
+            servers=servers,
+            ssl_certificate=certificate,
+            ssl_verify=_as_bool(config.get("ssl_verify", True)),
+            allow_insecure=_as_bool(config.get("allow_insecure", False)),
+            base_dn=config["base_dn"],
+            user_base_dn=config.get("user_base_dn") or config["base_dn"],
+            bind_dn=config["bind_dn"],
+            bind_password=config.get("bind_password", ""),
+            group_auth_pattern=group_auth_pattern,
+            group_dn=config.get("group_dn") or "",
+            user_filter_attribute=config.get("user_filter_attribute", "sAMAccountName"),
+            group_member_attribute=config.get("group_member_attribute", "memberOf"),
+            lookup_attributes=lookup_attributes,
+            merge_group_search=_as_bool(config.get("merge_group_search", True)),
+            server_strategy=strategy,
+            breaker_failure_threshold=_as_int(config, "breaker_failure_threshold", 3, minimum=1),
+            breaker_probe_interval=_as_int(config, "breaker_probe_interval", 30, minimum=1),
+            pool_size=_as_int(config, "pool_size", 4, minimum=1),
+            pool_idle_timeout=_as_int(config, "pool_idle_timeout", 300, minimum=1),
+            cache_size=_as_int(config, "cache_size", 1024, minimum=0),
+            cache_ttl=_as_int(config, "cache_ttl", 600, minimum=0),
+            cache_negative_ttl=_as_int(config, "cache_negative_ttl", 60, minimum=0),
+            connect_timeout=_as_int(config, "connect_timeout", 5, minimum=1),
+            receive_timeout=_as_int(config, "receive_timeout", 10, minimum=1),
+            auth_timeout=_as_int(config, "auth_timeout", 15, minimum=1),
+            auth_workers=_as_int(config, "auth_workers", 4, minimum=1),
+            auth_max_pending=_as_int(config, "auth_max_pending", 16, minimum=1)
+        )
+
+
+def _as_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() == "true"
+    return bool(value)
+
+
+def _as_int(config, key, default, minimum):
+    value = config.get(key, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"LDAP yapılandırmasında {key} sayı olmalı: {value!r}")
+    if value < minimum:
+        raise ValueError(f"LDAP yapılandırmasında {key} en az {minimum} olmalı: {value}")
+    return value
+
+
 # Environment variable'dan LDAP bilgilerini al (güvenlik için)
-LDAP_CONFIG = {
-    # LDAP sunucu adresi ve port (SSL ile)
-    "server": os.getenv("LDAP_SERVER", "ldaps://bankanet.com.tr:636"),
+# Değerler açılışta bir kez ayrıştırılıp doğrulanır (bkz. LDAPSettings)
+LDAP_CONFIG = LDAPSettings.from_mapping({
+    # LDAP sunucu adresi ve port (SSL ile); port yazılmazsa ldap:389 / ldaps:636
+    # Birden fazla domain controller virgülle ayrılarak verilebilir
+    "servers": os.getenv("LDAP_SERVER", "ldaps://bankanet.com.tr:636"),
+    
+    # Sunucu seçim stratejisi: first, round_robin, fastest (son gecikmelere göre)
+    "server_strategy": os.getenv("LDAP_SERVER_STRATEGY", "first"),
+    
+    # Devre kesici: art arda bu kadar ağ hatasında sunucu atlanır, arka planda yoklanır (saniye)
+    "breaker_failure_threshold": os.getenv("LDAP_BREAKER_FAILURES", "3"),
+    "breaker_probe_interval": os.getenv("LDAP_BREAKER_PROBE_INTERVAL", "30"),
     
     # SSL sertifika yolu
     "ssl_certificate": os.getenv("LDAP_SSL_CERTIFICATE", "/data/starburst/SSL/ldap.crt"),
     
     # SSL güvenlik ayarları
-    "ssl_verify": os.getenv("LDAP_SSL_VERIFY", "true").lower() == "true",
-    "allow_insecure": os.getenv("LDAP_ALLOW_INSECURE", "false").lower() == "true",
+    "ssl_verify": os.getenv("LDAP_SSL_VERIFY", "true"),
+    "allow_insecure": os.getenv("LDAP_ALLOW_INSECURE", "false"),
     
     # Base DN - LDAP ağacının kökü
     "base_dn": os.getenv("LDAP_BASE_DN", "DC=domain,DC=bankanet,DC=com,DC=tr"),
@@ -40,11 +198,42 @@ LDAP_CONFIG = {
     "user_filter_attribute": os.getenv("LDAP_USER_FILTER_ATTR", "sAMAccountName"),
     
     # Grup üyeliği kontrolü için kullanılan attribute
-    "group_member_attribute": os.getenv("LDAP_GROUP_MEMBER_ATTR", "memberOf")
-}
+    "group_member_attribute": os.getenv("LDAP_GROUP_MEMBER_ATTR", "memberOf"),
+    
+    # Kullanıcı ve grup aramalarında istenecek attribute'lar, virgülle ayrılmış
+    # (boş: sadece DN, "*": tüm attribute'lar)
+    "lookup_attributes": os.getenv("LDAP_LOOKUP_ATTRIBUTES", ""),
+    
+    # group_auth_pattern kullanıcı kaydını filtreliyorsa kullanıcı araması ve grup kontrolü tek aramada yapılır
+    "merge_group_search": os.getenv("LDAP_MERGE_GROUP_SEARCH", "true"),
+    
+    # Bağlantı havuzu ayarları (süreç genelinde yeniden kullanılan bağlantılar)
+    "pool_size": os.getenv("LDAP_POOL_SIZE", "4"),
+    "pool_idle_timeout": os.getenv("LDAP_POOL_IDLE_TIMEOUT", "300"),
+    
+    # Kullanıcı DN / grup üyeliği önbelleği (TTL saniye)
+    "cache_size": os.getenv("LDAP_CACHE_SIZE", "1024"),
+    "cache_ttl": os.getenv("LDAP_CACHE_TTL", "600"),
+    "cache_negative_ttl": os.getenv("LDAP_CACHE_NEGATIVE_TTL", "60"),
+    
+    # Zaman aşımları (saniye)
+    "connect_timeout": os.getenv("LDAP_CONNECT_TIMEOUT", "5"),
+    "receive_timeout": os.getenv("LDAP_RECEIVE_TIMEOUT", "10"),
+    
+    # Giriş denemesi için toplam süre sınırı (saniye); aşılırsa kullanıcıya zaman aşımı gösterilir
+    "auth_timeout": os.getenv("LDAP_AUTH_TIMEOUT", "15"),
+    
+    # Giriş denemelerini çalıştıran iş parçacığı sayısı ve aynı anda kabul edilen en fazla deneme
+    "auth_workers": os.getenv("LDAP_AUTH_WORKERS", "4"),
+    "auth_max_pending": os.getenv("LDAP_AUTH_MAX_PENDING", "16")
+})
 
 # Environment variable kullanımı için örnek:
 # export LDAP_SERVER="ldaps://bankanet.com.tr:636"
+# export LDAP_SERVER="ldaps://dc1.bankanet.com.tr:636,ldaps://dc2.bankanet.com.tr:636"  # birden fazla DC
+# export LDAP_SERVER_STRATEGY="fastest"       # first, round_robin, fastest
+# export LDAP_BREAKER_FAILURES="3"
+# export LDAP_BREAKER_PROBE_INTERVAL="30"
 # export LDAP_SSL_CERTIFICATE="/data/starburst/SSL/ldap.crt"
 # export LDAP_SSL_VERIFY="true"
 # export LDAP_ALLOW_INSECURE="false"
@@ -53,11 +242,23 @@ LDAP_CONFIG = {
 # export LDAP_BIND_DN="CN=SVCDATABEES,OU=Users,OU=Applications,DC=domain,DC=bankanet,DC=com,DC=tr"
 # export LDAP_BIND_PASSWORD="your_secure_password"
 # export LDAP_GROUP_DN="CN=StarburstUsers,OU=INGBank Security Groups,OU=IngBankUsers,DC=domain,DC=bankanet,DC=com,DC=tr"
+# export LDAP_LOOKUP_ATTRIBUTES=""            # boş: sadece DN, "*": tüm attribute'lar
+# export LDAP_MERGE_GROUP_SEARCH="true"
+# export LDAP_POOL_SIZE="4"
+# export LDAP_POOL_IDLE_TIMEOUT="300"
+# export LDAP_CACHE_SIZE="1024"
+# export LDAP_CACHE_TTL="600"
+# export LDAP_CACHE_NEGATIVE_TTL="60"
+# export LDAP_CONNECT_TIMEOUT="5"
+# export LDAP_RECEIVE_TIMEOUT="10"
+# export LDAP_AUTH_TIMEOUT="15"
+# export LDAP_AUTH_WORKERS="4"
+# export LDAP_AUTH_MAX_PENDING="16"
 
 # Örnek LDAP yapılandırmaları:
 
 # Active Directory (ING Bank) için:
-# LDAP_CONFIG = {
+# LDAP_CONFIG = LDAPSettings.from_mapping({
 #     "server": "ldaps://bankanet.com.tr:636",
 #     "ssl_certificate": "/data/starburst/SSL/ldap.crt",
 #     "ssl_verify": True,
@@ -69,10 +270,10 @@ LDAP_CONFIG = {
 #     "group_dn": "CN=StarburstUsers,OU=INGBank Security Groups,OU=IngBankUsers,DC=domain,DC=bankanet,DC=com,DC=tr",
 #     "user_filter_attribute": "sAMAccountName",
 #     "group_member_attribute": "memberOf"
-# }
+# })
 
 # OpenLDAP için:
-# LDAP_CONFIG = {
+# LDAP_CONFIG = LDAPSettings.from_mapping({
 #     "server": "ldap://ldap.company.com:389",
 #     "ssl_certificate": None,
 #     "ssl_verify": False,
@@ -84,4 +285,4 @@ LDAP_CONFIG = {
 #     "group_dn": "cn=allowed_users,ou=groups,dc=company,dc=com",
 #     "user_filter_attribute": "uid",
 #     "group_member_attribute": "member"
-# } 
\ No newline at end of file
+# }) 
\ No newline at end of file
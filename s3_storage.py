@@ -0,0 +1,212 @@
+# Onay paketlerinin S3'te hazırlanması (pending/) ve onayda sunucu tarafı kopyası
+#
+# Paket "Onaya Gönder" anında pending/ önekine yüklenir. Onay sadece S3'ün
+# sunucu tarafı kopyasıdır (copy_object; 5 GB üstünde parça parça
+# upload_part_copy) ve approved/ altına taşınır; veri onaylayıcının oturumundan
+# tekrar geçmez, süre dosya boyutundan bağımsızdır. Red, nesneyi siler ya da
+# yaşam döngüsü kuralı için etiketler.
+#
+# Yüklemeler boto3'ün aktarım yöneticisiyle (upload_file + TransferConfig)
+# diskteki paketten parça parça ve eş zamanlı yapılır; hata alan parça
+# botocore'un yeniden deneme ayarıyla tek başına tekrar gönderilir, yükleme
+# baştan başlamaz. 5 GB'lık tek istek sınırı da kalkar.
+
+import os
+from urllib.parse import quote
+
+import boto3
+import streamlit as st
+from boto3.exceptions import Boto3Error
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", "http://localhost:9000")
+AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID", "minioadmin")
+AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY", "minioadmin123")
+S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "data-uploads")
+AWS_DEFAULT_REGION = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
+# Reddedilen paket: delete (sil) veya tag (status=rejected etiketi; silmeyi yaşam döngüsü kuralı yapar)
+S3_REJECT_ACTION = os.getenv("S3_REJECT_ACTION", "delete").strip().lower()
+# Onay ekranındaki indirme bağlantısının geçerlilik süresi (sn)
+S3_DOWNLOAD_URL_TTL = int(os.getenv("S3_DOWNLOAD_URL_TTL", "900"))
+# Bu boyutun (MB) üstündeki paketler parçalı (multipart) yüklenir
+S3_MULTIPART_THRESHOLD_MB = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "64"))
+# Parça boyutu (MB); 10.000 parça sınırını aşan dosyalarda otomatik büyütülür
+S3_MULTIPART_CHUNK_MB = int(os.getenv("S3_MULTIPART_CHUNK_MB", "16"))
+# Aynı anda gönderilen parça sayısı
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "8"))
+# Her istek (parça) için toplam deneme sayısı
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+
+PENDING_PREFIX = "pending/"
+APPROVED_PREFIX = "approved/"
+# S3'ün tek copy_object ile kopyalayabildiği en büyük nesne
+COPY_OBJECT_LIMIT = 5 * 1024 ** 3
+# Parçalı kopyada parça boyutu (S3: 5 MB - 5 GB, en fazla 10.000 parça)
+COPY_PART_BYTES = 1024 ** 3
+CHECKSUM_METADATA_KEY = "sha256"
+
+# upload_file hataları S3UploadFailedError (Boto3Error) olarak gelir
+S3_ERRORS = (ClientError, BotoCoreError, Boto3Error)
+
+
+def create_client():
+    return boto3.client(
+        "s3",
+        endpoint_url=S3_ENDPOINT_URL,
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        region_name=AWS_DEFAULT_REGION,
+        config=Config(
+            # Bağlantı kopması, zaman aşımı ve 5xx hatalarında parça kendi başına tekrar gönderilir
+            retries={"max_attempts": S3_MAX_ATTEMPTS, "mode": "standard"},
+            # Eş zamanlı parçalar bağlantı havuzunda beklemesin
+            max_pool_connections=max(10, S3_MAX_CONCURRENCY)
+        )
+    )
+
+
+def transfer_config(chunk_mb=None, concurrency=None, threshold_mb=None):
+    """Parçalı yükleme ayarları; verilmeyenler ortam değişkenlerinden"""
+    return TransferConfig(
+        multipart_threshold=(threshold_mb or S3_MULTIPART_THRESHOLD_MB) * 1024 * 1024,
+        multipart_chunksize=(chunk_mb or S3_MULTIPART_CHUNK_MB) * 1024 * 1024,
+        max_concurrency=concurrency or S3_MAX_CONCURRENCY,
+        use_threads=(concurrency or S3_MAX_CONCURRENCY) > 1
+    )
+
+
+@st.cache_resource
+def get_client():
+    """boto3 istemcisi iş parçacıkları arasında paylaşılabilir; süreç başına bir kez oluşturulur"""
+    return create_client()
+
+
+def ensure_bucket(client, bucket=S3_BUCKET_NAME):
+    """Bucket yoksa oluşturur"""
+    try:
+        client.head_bucket(Bucket=bucket)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchBucket"):
+            client.create_bucket(Bucket=bucket)
+        else:
+            raise
+
+
+def _error_message(e):
+    if isinstance(e, ClientError):
+        return e.response["Error"].get("Message") or e.response["Error"].get("Code")
+    return str(e)
+
+
+def pending_key(upload_id):
+    return f"{PENDING_PREFIX}{upload_id}.zip"
+
+
+def approved_key(timestamp, filename):
+    return f"{APPROVED_PREFIX}{timestamp}_{filename}.zip"
+
+
+def upload_package(path, key, sha256, client=None, bucket=S3_BUCKET_NAME, config=None):
+    """
+    Diskteki paketi verilen anahtara (normalde pending/ altına) yükler;
+    SHA-256 nesne metadata'sına yazılır. Büyük paketler parçalı ve eş
+    zamanlı yüklenir, parçalar dosyadan okunur. (başarılı, mesaj) döndürür.
+    """
+    client = client or get_client()
+    try:
+        ensure_bucket(client, bucket)
+        # Hata durumunda aktarım yöneticisi yarım kalan parçalı yüklemeyi iptal eder
+        client.upload_file(
+            path, bucket, key,
+            ExtraArgs={"ContentType": "application/zip", "Metadata": {CHECKSUM_METADATA_KEY: sha256}},
+            Config=config or transfer_config()
+        )
+        return True, f"Paket S3'e yüklendi: {key}"
+    except S3_ERRORS as e:
+        return False, f"Paket S3'e yüklenemedi: {_error_message(e)}"
+
+
+def _multipart_copy(client, bucket, source_key, target_key, size, metadata):
+    upload_id = client.create_multipart_upload(
+        Bucket=bucket, Key=target_key, ContentType="application/zip", Metadata=metadata
+    )["UploadId"]
+    try:
+        parts = []
+        for number, start in enumerate(range(0, size, COPY_PART_BYTES), start=1):
+            end = min(start + COPY_PART_BYTES, size) - 1
+            result = client.upload_part_copy(
+                Bucket=bucket, Key=target_key, UploadId=upload_id, PartNumber=number,
+                CopySource={"Bucket": bucket, "Key": source_key},
+                CopySourceRange=f"bytes={start}-{end}"
+            )
+            parts.append({"PartNumber": number, "ETag": result["CopyPartResult"]["ETag"]})
+        client.complete_multipart_upload(
+            Bucket=bucket, Key=target_key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+        )
+    except BaseException:
+        client.abort_multipart_upload(Bucket=bucket, Key=target_key, UploadId=upload_id)
+        raise
+
+
+def approve_package(source_key, target_key, sha256=None, client=None, bucket=S3_BUCKET_NAME):
+    """
+    pending/ altındaki paketi sunucu tarafında approved/ altına kopyalar ve
+    kaynağı siler. sha256 verilirse nesne metadata'sıyla karşılaştırılır.
+    (başarılı, mesaj) döndürür.
+    """
+    client = client or get_client()
+    try:
+        head = client.head_object(Bucket=bucket, Key=source_key)
+        metadata = head.get("Metadata", {})
+        if sha256 and metadata.get(CHECKSUM_METADATA_KEY) not in (None, sha256):
+            return False, "S3'teki paketin SHA-256 özeti gönderilen paketle tutmuyor"
+        size = head["ContentLength"]
+        if size <= COPY_OBJECT_LIMIT:
+            client.copy_object(
+                Bucket=bucket, Key=target_key,
+                CopySource={"Bucket": bucket, "Key": source_key},
+                MetadataDirective="COPY"
+            )
+        else:
+            _multipart_copy(client, bucket, source_key, target_key, size, metadata)
+        client.delete_object(Bucket=bucket, Key=source_key)
+        return True, f"Dosya onaylandı ve S3'e taşındı - {target_key}"
+    except S3_ERRORS as e:
+        return False, f"S3 kopyalama hatası: {_error_message(e)}"
+
+
+def reject_package(key, client=None, bucket=S3_BUCKET_NAME, action=None):
+    """Reddedilen paketi siler veya status=rejected ile etiketler; (başarılı, mesaj) döndürür"""
+    client = client or get_client()
+    action = action or S3_REJECT_ACTION
+    try:
+        if action == "tag":
+            client.put_object_tagging(
+                Bucket=bucket, Key=key, Tagging={"TagSet": [{"Key": "status", "Value": "rejected"}]}
+            )
+            return True, f"Paket reddedildi olarak etiketlendi: {key}"
+        client.delete_object(Bucket=bucket, Key=key)
+        return True, f"Paket S3'ten silindi: {key}"
+    except S3_ERRORS as e:
+        return False, f"S3'teki paket kaldırılamadı: {_error_message(e)}"
+
+
+def download_url(key, filename, client=None, bucket=S3_BUCKET_NAME):
+    """Paketi sunucudan geçirmeden indirmek için süreli bağlantı; oluşturulamazsa None"""
+    client = client or get_client()
+    try:
+        return client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": bucket, "Key": key,
+                "ResponseContentDisposition": f"attachment; filename*=UTF-8''{quote(filename)}.zip"
+            },
+            ExpiresIn=S3_DOWNLOAD_URL_TTL
+        )
+    except S3_ERRORS:
+        return None
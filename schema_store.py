@@ -0,0 +1,327 @@
+# Kolon açıklamaları ve kalite kurallarının şema parmak iziyle saklanması
+#
+# Onaya gönderilen her dosyanın kolon açıklamaları ve kuralları yerel bir SQLite
+# veritabanına yazılır. Aynı düzende (sıralı kolon adları + tipleri) bir dosya
+# tekrar yüklendiğinde kayıt parmak izi anahtarıyla tek aramada bulunur. Şema
+# tam eşleşmezse (kolon eklenmiş/çıkarılmış, tip değişmiş) kolonların ad + tip
+# olarak en çok örtüştüğü önceki şema aranır; örtüşme SCHEMA_MATCH_MIN_OVERLAP
+# oranının altındaysa hiçbir şey doldurulmaz. Böylece sadece "id" veya "tarih"
+# gibi ortak bir kolonu olan ilgisiz bir dosyaya eski açıklamalar taşınmaz.
+#
+# Ayrıca açıklama ve kuralların CSV/JSON olarak toplu içe/dışa aktarımı.
+
+import contextlib
+import csv
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from data_ingest import detect_encoding, detect_separator
+from data_quality import NO_RULE, validate_params
+
+load_dotenv()
+
+SCHEMA_STORE_PATH = os.getenv("SCHEMA_STORE_PATH", "schema_store.db")
+# Kısmi eşleşme için önceki bir şemayla ad + tip olarak örtüşmesi gereken kolon
+# oranı (iki şemadan büyük olanın kolon sayısına göre)
+SCHEMA_MATCH_MIN_OVERLAP = float(os.getenv("SCHEMA_MATCH_MIN_OVERLAP", "0.5"))
+
+MATCH_EXACT = "exact"
+MATCH_PARTIAL = "partial"
+
+# Dışa aktarılan CSV'nin başlığı
+EXPORT_FIELDS = ("kolon", "aciklama", "kural", "parametreler")
+# SQLite'ın tek sorguda kabul ettiği parametre sayısı sınırının altında
+_LOOKUP_BATCH = 500
+
+
+def schema_columns(profile):
+    """FileProfile'dan sıralı (kolon adı, tip) listesi"""
+    return [(name, column.dtype) for name, column in profile.columns.items()]
+
+
+def schema_fingerprint(columns):
+    """Sıralı (ad, tip) listesinin SHA-256 özeti"""
+    payload = json.dumps([[name, dtype] for name, dtype in columns], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _applied_rules(rules):
+    return {column: info for column, info in (rules or {}).items() if info.get("rule") and info["rule"] != NO_RULE}
+
+
+def _clean_rule(info):
+    """Geçerli kuralı {"rule", "params"} olarak döndürür; geçersizse ValueError"""
+    if not isinstance(info, dict) or not isinstance(info.get("rule"), str):
+        raise ValueError("Geçersiz kural kaydı")
+    return {"rule": info["rule"], "params": validate_params(info["rule"], info.get("params") or {})}
+
+
+def _clean_recalled(metadata, rules):
+    """Depodan okunan (eski sürümlerin yazmış olabileceği) kayıtlardan geçersizleri atar"""
+    metadata = {column: text for column, text in metadata.items() if isinstance(text, str)}
+    clean_rules = {}
+    for column, info in rules.items():
+        try:
+            clean_rules[column] = _clean_rule(info)
+        except ValueError:
+            pass
+    return metadata, clean_rules
+
+
+class SchemaStore:
+    """
+    schemas: parmak izi -> o şemayla en son gönderilen açıklama ve kurallar
+    columns: (kolon adı, tip) -> bu kolon için en son girilen açıklama ve kural
+    """
+
+    def __init__(self, path=SCHEMA_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS schemas (
+                    fingerprint TEXT PRIMARY KEY,
+                    columns_json TEXT NOT NULL,
+                    metadata_json TEXT NOT NULL,
+                    rules_json TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS columns (
+                    name TEXT NOT NULL,
+                    dtype TEXT NOT NULL,
+                    description TEXT NOT NULL DEFAULT '',
+                    rule_json TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (name, dtype)
+                );
+            """)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, columns, metadata, rules):
+        """Gönderilen dosyanın açıklama ve kurallarını şema ve kolon bazında kaydeder"""
+        metadata = {column: text for column, text in (metadata or {}).items() if text and text.strip()}
+        rules = _applied_rules(rules)
+        now = time.time()
+        dtypes = dict(columns)
+        column_rows = [
+            (name, dtypes[name], metadata.get(name, ""),
+             json.dumps(rules[name], ensure_ascii=False, default=str) if name in rules else None, now)
+            for name in dtypes if name in metadata or name in rules
+        ]
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO schemas VALUES (?, ?, ?, ?, ?)",
+                (schema_fingerprint(columns), json.dumps(columns, ensure_ascii=False),
+                 json.dumps(metadata, ensure_ascii=False), json.dumps(rules, ensure_ascii=False, default=str), now)
+            )
+            # Boş açıklama veya kural, kolonun daha önce girilmiş değerini silmez
+            conn.executemany("""
+                INSERT INTO columns VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (name, dtype) DO UPDATE SET
+                    description = CASE WHEN excluded.description != '' THEN excluded.description ELSE description END,
+                    rule_json = COALESCE(excluded.rule_json, rule_json),
+                    updated_at = excluded.updated_at
+            """, column_rows)
+
+    def lookup(self, columns, min_overlap=None):
+        """
+        (eşleşme, açıklamalar, kurallar) döndürür. eşleşme MATCH_EXACT,
+        MATCH_PARTIAL veya yeterince örtüşen şema bulunamadıysa None'dır.
+        Kısmi eşleşmede sadece ad ve tipi tutan kolonlar doldurulur; değer en
+        çok örtüşen şemadan, orada boşsa kolonun en son girilen değerinden gelir.
+        """
+        min_overlap = SCHEMA_MATCH_MIN_OVERLAP if min_overlap is None else min_overlap
+        current = {(name, dtype) for name, dtype in columns}
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT metadata_json, rules_json FROM schemas WHERE fingerprint = ?",
+                (schema_fingerprint(columns),)
+            ).fetchone()
+            if row is not None:
+                return MATCH_EXACT, json.loads(row[0]), json.loads(row[1])
+
+            best = None
+            for columns_json, metadata_json, rules_json, updated_at in conn.execute(
+                "SELECT columns_json, metadata_json, rules_json, updated_at FROM schemas"
+            ):
+                previous = {(name, dtype) for name, dtype in json.loads(columns_json)}
+                shared = current & previous
+                overlap = len(shared) / max(len(current), len(previous), 1)
+                # Eşit örtüşmede en son gönderilen şema
+                if overlap >= min_overlap and (best is None or (overlap, updated_at) > best[:2]):
+                    best = (overlap, updated_at, shared, metadata_json, rules_json)
+            if best is None:
+                return None, {}, {}
+            _, _, shared, metadata_json, rules_json = best
+
+            column_rows = []
+            names = sorted(name for name, _ in shared)
+            for start in range(0, len(names), _LOOKUP_BATCH):
+                batch = names[start:start + _LOOKUP_BATCH]
+                column_rows += conn.execute(
+                    f"SELECT name, dtype, description, rule_json FROM columns "
+                    f"WHERE name IN ({', '.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+
+        names = {name for name, _ in shared}
+        metadata = {name: text for name, text in json.loads(metadata_json).items() if name in names}
+        rules = {name: info for name, info in json.loads(rules_json).items() if name in names}
+        for name, dtype, description, rule_json in column_rows:
+            if (name, dtype) not in shared:
+                continue
+            if description and name not in metadata:
+                metadata[name] = description
+            if rule_json and name not in rules:
+                rules[name] = json.loads(rule_json)
+        if not metadata and not rules:
+            return None, {}, {}
+        return MATCH_PARTIAL, metadata, rules
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Varsayılan (SCHEMA_STORE_PATH) deposu; ilk kullanımda oluşturulur"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SchemaStore()
+        return _store
+
+
+def remember_schema(columns, metadata, rules):
+    """Depoya kaydeder; (başarılı, mesaj) döndürür (depo hatası gönderimi engellemez)"""
+    try:
+        get_store().save(columns, metadata, rules)
+        return True, "Açıklama ve kurallar sonraki yüklemeler için kaydedildi"
+    except sqlite3.Error as e:
+        return False, f"Şema deposuna yazılamadı: {e}"
+
+
+def recall_schema(columns):
+    """
+    Depodan (eşleşme, açıklamalar, kurallar); depo okunamazsa (None, {}, {}).
+    Parametreleri geçersiz kurallar atlanır.
+    """
+    try:
+        match, metadata, rules = get_store().lookup(columns)
+    except (sqlite3.Error, ValueError):
+        return None, {}, {}
+    metadata, rules = _clean_recalled(metadata, rules)
+    if match is not None and not metadata and not rules:
+        return None, {}, {}
+    return match, metadata, rules
+
+
+# --- Toplu içe/dışa aktarma ---
+
+def export_csv(columns, metadata, rules):
+    """Kolon sırasıyla ; ayırıcılı CSV (Excel'in Türkçe karakterleri tanıması için BOM'lu)"""
+    rules = _applied_rules(rules)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    writer.writerow(EXPORT_FIELDS)
+    for name in columns:
+        rule = rules.get(name, {})
+        writer.writerow([
+            name,
+            (metadata or {}).get(name, ""),
+            rule.get("rule", ""),
+            json.dumps(rule.get("params") or {}, ensure_ascii=False, default=str) if rule else ""
+        ])
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+def export_json(columns, metadata, rules):
+    rules = _applied_rules(rules)
+    payload = {
+        "columns": {
+            name: {
+                "description": (metadata or {}).get(name, ""),
+                "rule": rules.get(name, {}).get("rule"),
+                "params": rules.get(name, {}).get("params") or {}
+            }
+            for name in columns
+        }
+    }
+    return json.dumps(payload, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _import_rows(filename, data):
+    """Dosyadaki (kolon, açıklama, kural, parametreler) kayıtları"""
+    encoding = detect_encoding([data])
+    text = data.decode(encoding)
+    if filename.lower().endswith(".json"):
+        payload = json.loads(text)
+        return [
+            (name, item.get("description") or "", item.get("rule") or "", item.get("params") or {})
+            for name, item in payload.get("columns", {}).items()
+        ]
+    lines = text.splitlines()
+    reader = csv.DictReader(lines, delimiter=detect_separator(lines[:50]))
+    missing = [name for name in ("kolon", "aciklama") if name not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV başlığında eksik alan: {', '.join(missing)}")
+    rows = []
+    for record in reader:
+        params = (record.get("parametreler") or "").strip()
+        try:
+            params = json.loads(params) if params else {}
+        except ValueError:
+            # Bozuk parametre sadece o kolonu geçersiz kılar (import_metadata'da raporlanır)
+            pass
+        rows.append((record["kolon"], record.get("aciklama") or "", record.get("kural") or "", params))
+    return rows
+
+
+def import_metadata(filename, data, columns):
+    """
+    CSV/JSON dosyasından açıklama ve kuralları okur.
+    (başarılı, mesaj, açıklamalar, kurallar) döndürür; dosyada olmayan kolonlar atlanır.
+    """
+    try:
+        rows = _import_rows(filename, data)
+    except (ValueError, UnicodeDecodeError, AttributeError) as e:
+        return False, f"Dosya okunamadı: {e}", {}, {}
+
+    known = set(columns)
+    metadata, rules, skipped, invalid = {}, {}, 0, []
+    for name, description, rule, params in rows:
+        if name not in known:
+            skipped += 1
+            continue
+        if not isinstance(description, str):
+            invalid.append(name)
+            continue
+        if description.strip():
+            metadata[name] = description.strip()
+        if rule and rule != NO_RULE:
+            try:
+                rules[name] = _clean_rule({"rule": rule, "params": params})
+            except ValueError:
+                invalid.append(name)
+
+    message = f"{len(metadata)} açıklama ve {len(rules)} kural içe aktarıldı."
+    if skipped:
+        message += f" Dosyada bulunmayan {skipped} kolon atlandı."
+    if invalid:
+        message += f" Geçersiz açıklama veya kural: {', '.join(invalid[:5])}"
+    return True, message, metadata, rules